@@ -0,0 +1,131 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from flask import jsonify
+
+# Latency of /api/url_example under load with its debug output written
+# through print() (the old code) versus the queued, sampled JSON request
+# log, while stdout is a pipe drained by a slow reader, as when a log
+# collector falls behind.
+# Run it with: python bench_logging.py
+
+# Client threads sending requests through the Flask test client
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "8"))
+# Seconds each variant is measured for
+DURATION_SECONDS = float(os.getenv("BENCH_DURATION", "3"))
+# Bytes per second the stdout reader accepts
+STDOUT_BYTES_PER_SECOND = int(os.getenv("BENCH_STDOUT_RATE", "5000"))
+
+# Reads stdin in small chunks with a pause in between, i.e. a slow consumer
+SLOW_READER = (
+    "import sys, time\n"
+    "while sys.stdin.buffer.read1(1024):\n"
+    f"    time.sleep(1024 / {STDOUT_BYTES_PER_SECOND})\n"
+)
+
+
+def point_stdout_at_slow_reader():
+    """
+    Replace file descriptor 1 with a pipe to a slow reader process.
+
+    Returns:
+        tuple: (the reader process, a file object for the original stdout)
+    """
+    reader = subprocess.Popen([sys.executable, "-c", SLOW_READER], stdin=subprocess.PIPE)
+    original = os.fdopen(os.dup(1), "w", buffering=1)
+    os.dup2(reader.stdin.fileno(), 1)
+    # Every line is written straight away, as with PYTHONUNBUFFERED=1 in a container
+    sys.stdout.reconfigure(line_buffering=True)
+    return reader, original
+
+
+def run_load(client_factory, path):
+    """
+    Send GET `path` from CONCURRENCY threads for DURATION_SECONDS.
+
+    Parameters:
+        client_factory (callable): Returns a Flask test client.
+        path (str): Path to request.
+
+    Returns:
+        tuple: (requests per second, mean ms, p50 ms, p99 ms)
+    """
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + DURATION_SECONDS
+
+    def worker():
+        client = client_factory()
+        local = []
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            client.get(path)
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(CONCURRENCY)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    mean = sum(latencies) / len(latencies)
+    return len(latencies) / elapsed, mean * 1000, p50 * 1000, p99 * 1000
+
+
+def main():
+    reader, report = point_stdout_at_slow_reader()
+
+    # Imported after the swap so the request log's writer also targets the slow pipe
+    import main as routes
+
+    app = routes.app
+    view = routes.url_example.__wrapped__  # The view without the response cache
+
+    @app.route('/bench/print/<name>/<int:age>')
+    def print_url_example(name, age):
+        print("name", type(name), "age", type(age))  # The old debug output
+        return jsonify({"message": f"Hello, {name}! You are {age} years old."})
+
+    app.add_url_rule('/bench/log/<name>/<int:age>', 'log_url_example', view)
+
+    variants = {
+        "print()": ("/bench/print/Sameer/30", None),
+        "no logging": ("/bench/log/Sameer/30", 0.0),
+        "request log, 10%": ("/bench/log/Sameer/30", 0.1),
+        "request log, 100%": ("/bench/log/Sameer/30", 1.0),
+    }
+    results = {}
+    for name, (path, rate) in variants.items():
+        if rate is not None:
+            routes.request_log.sampler.rates['url_example'] = rate
+        results[name] = run_load(app.test_client, path)
+        if name == "print()":
+            # Let the slow reader catch up so the next variant starts with an empty pipe
+            sys.stdout.flush()
+            time.sleep(1)
+
+    print(f"\n{CONCURRENCY} threads, {DURATION_SECONDS:g}s per variant, stdout drained at "
+          f"{STDOUT_BYTES_PER_SECOND} bytes/s\n", file=report)
+    header = f"{'variant':<20} | {'req/s':>8} | {'mean':>9} | {'p50':>9} | {'p99':>9}"
+    print(header, file=report)
+    print("-" * len(header), file=report)
+    for name, (rps, mean, p50, p99) in results.items():
+        print(f"{name:<20} | {rps:>8.0f} | {mean:>7.2f}ms | {p50:>7.2f}ms | {p99:>7.2f}ms", file=report)
+    print(f"\nrequest log: {routes.request_log.stats()}", file=report)
+
+    reader.kill()
+    os._exit(0)  # Skip draining the queued lines into the dead pipe at exit
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+import http.client
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+# Benchmark of every /api/* route: requests/sec and p99 latency with the
+# original setup (debug dev server, stdlib JSON provider) against
+# serve.py (gunicorn workers, orjson provider).
+# Run it with: python bench_routes.py
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+PORT = 8191
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+# Concurrent keep-alive connections per route, and the processes sending on them
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "16"))
+CLIENT_PROCESSES = int(os.getenv("BENCH_CLIENT_PROCESSES", str(max(1, (os.cpu_count() or 2) // 2))))
+# Seconds each route is measured for
+DURATION_SECONDS = float(os.getenv("BENCH_DURATION", "3"))
+
+PAYLOAD = {"name": "Sameer", "age": 30}
+
+# (method, path, json body) for every route under /api/
+ROUTES = [
+    ("GET", "/api/get_example", None),
+    ("GET", "/api/query_example?name=Sameer", None),
+    ("GET", "/api/multi_query_example?name=Sameer&age=30", None),
+    ("GET", "/api/default_query_example", None),
+    ("GET", "/api/url_example/Sameer/30", None),
+    ("GET", "/api/other_url_example/1/92.5", None),
+    ("POST", "/api/post_example", PAYLOAD),
+    ("PUT", "/api/put_example", PAYLOAD),
+    ("DELETE", "/api/delete_example", PAYLOAD),
+    ("PATCH", "/api/patch_example", PAYLOAD),
+    ("GET", "/api/dynamic_example/1", None),
+    ("POST", "/api/dynamic_example/1", PAYLOAD),
+]
+
+# Each variant is a command that serves the app on PORT
+DEV_SERVER = (
+    "from flask.json.provider import DefaultJSONProvider\n"
+    "from main import app\n"
+    "app.json = DefaultJSONProvider(app)\n"
+    f"app.run(host='127.0.0.1', port={PORT}, debug=True, use_reloader=False)\n"
+)
+VARIANTS = {
+    "before": ([sys.executable, "-c", DEV_SERVER], {}),
+    "after": ([sys.executable, "serve.py"], {"FLASK_BIND": f"127.0.0.1:{PORT}"}),
+}
+
+
+def wait_until_up(timeout=15):
+    """
+    Poll the home route until the server answers.
+
+    Parameters:
+        timeout (float): Seconds to wait before giving up.
+    """
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            requests.get(f"{BASE_URL}/", timeout=1)
+            return
+        except requests.exceptions.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def client_process(method, path, body, threads, deadline):
+    """
+    Send requests from `threads` threads until `deadline`, each thread
+    over its own keep-alive connection. http.client is used instead of
+    requests so the client costs as little CPU as possible.
+
+    Parameters:
+        method (str): HTTP method.
+        path (str): Path with query string.
+        body (dict or None): JSON body to send.
+        threads (int): Client threads in this process.
+        deadline (float): time.time() at which to stop.
+
+    Returns:
+        tuple: (latencies in seconds, errors)
+    """
+    payload = json.dumps(body).encode() if body is not None else None
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def worker():
+        connection = http.client.HTTPConnection("127.0.0.1", PORT, timeout=10)
+        local = []
+        failed = 0
+        while time.time() < deadline:
+            started = time.perf_counter()
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                ok = False
+            local.append(time.perf_counter() - started)
+            failed += not ok
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return latencies, errors[0]
+
+
+def bench_route(method, path, body):
+    """
+    Hammer one route with CONCURRENCY connections, spread over
+    CLIENT_PROCESSES processes, for DURATION_SECONDS.
+
+    Parameters:
+        method (str): HTTP method.
+        path (str): Path with query string.
+        body (dict or None): JSON body to send.
+
+    Returns:
+        tuple: (requests per second, p99 latency in ms, errors)
+    """
+    threads = max(1, CONCURRENCY // CLIENT_PROCESSES)
+    deadline = time.time() + DURATION_SECONDS
+    with multiprocessing.Pool(CLIENT_PROCESSES) as pool:
+        started = time.perf_counter()
+        results = pool.starmap(client_process, [(method, path, body, threads, deadline)] * CLIENT_PROCESSES)
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for process_latencies, _ in results for latency in process_latencies)
+    errors = sum(process_errors for _, process_errors in results)
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)] if latencies else 0.0
+    return len(latencies) / elapsed, p99 * 1000, errors
+
+
+def bench_variant(command, env):
+    """
+    Start a server variant, measure every route against it, then stop it.
+
+    Parameters:
+        command (list): Command line that serves the app on PORT.
+        env (dict): Extra environment variables for the server.
+
+    Returns:
+        dict: "METHOD path" -> (requests per second, p99 ms, errors)
+    """
+    server = subprocess.Popen(
+        command, cwd=APP_DIR, env=dict(os.environ, **env),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_up()
+        return {f"{method} {path}": bench_route(method, path, body) for method, path, body in ROUTES}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    results = {name: bench_variant(command, env) for name, (command, env) in VARIANTS.items()}
+
+    print(f"\n{CONCURRENCY} connections from {CLIENT_PROCESSES} client processes, {DURATION_SECONDS:g}s per route\n")
+    header = f"{'route':<52}" + "".join(f" | {name + ' req/s':>13} | {name + ' p99':>11}" for name in results)
+    print(header)
+    print("-" * len(header))
+    for route in results["before"]:
+        cells = []
+        for name in results:
+            rps, p99, errors = results[name][route]
+            cells.append(f" | {rps:>13.0f} | {p99:>9.1f}ms" + (f" ({errors} errors)" if errors else ""))
+        print(f"{route:<52}" + "".join(cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,8 @@
 import requests
 
+# One keep-alive session shared by every helper, so calls reuse their TCP connection
+session = requests.Session()
+
 
 def get_home_message(base_url):
     """
@@ -11,7 +14,7 @@ def get_home_message(base_url):
     """
     url = f"{base_url}/"
     try:
-        response = requests.get(url)
+        response = session.get(url)
         if response.status_code == 200:
             # Since the Flask home route returns plain text, use response.text
             print(f"GET Home: Response from '{response.url}': {response.text}")
@@ -31,7 +34,7 @@ def get_example_message(base_url):
     """
     url = f"{base_url}/api/get_example"
     try:
-        response = requests.get(url)
+        response = session.get(url)
         if response.status_code == 200:
             print(f"GET Example: Response from '{response.url}': {response.json()}")
         else:
@@ -53,7 +56,7 @@ def get_query_example_message(base_url, name="Guest"):
     params = {'name': name}
 
     try:
-        response = requests.get(url, params=params)
+        response = session.get(url, params=params)
         if response.status_code == 200:
             print(f"GET Query: Response from '{response.url}': {response.json()}")
         else:
@@ -76,7 +79,7 @@ def get_multi_query_example(base_url, name="Guest", age="unknown"):
     params = {'name': name, 'age': age}
 
     try:
-        response = requests.get(url, params=params)
+        response = session.get(url, params=params)
         if response.status_code == 200:
             print(f"GET Multi Query: Response from '{response.url}': {response.json()}")
         else:
@@ -103,7 +106,7 @@ def get_default_query_example(base_url, name=None, age=None):
         params['age'] = age
 
     try:
-        response = requests.get(url, params=params)
+        response = session.get(url, params=params)
         if response.status_code == 200:
             print(f"GET Default Query: Response from '{response.url}': {response.json()}")
         else:
@@ -125,7 +128,7 @@ def get_url_example_message(base_url, name, age):
     url = f"{base_url}/api/url_example/{name}/{age}"
 
     try:
-        response = requests.get(url)
+        response = session.get(url)
         if response.status_code == 200:
             print(f"GET URL Example: Response from '{response.url}': {response.json()}")
         else:
@@ -147,7 +150,7 @@ def get_other_url_example(base_url, ids, score):
     url = f"{base_url}/api/other_url_example/{ids}/{score}"
 
     try:
-        response = requests.get(url)
+        response = session.get(url)
         if response.status_code == 200:
             print(f"GET Other URL Example: Response from '{response.url}': {response.json()}")
         else:
@@ -170,7 +173,7 @@ def post_example(base_url, name="Guest", age="unknown"):
     payload = {"name": name, "age": age}
 
     try:
-        response = requests.post(url, json=payload)
+        response = session.post(url, json=payload)
         if response.status_code == 200:
             print(f"POST Example: Response from '{response.url}': {response.json()}")
         else:
@@ -193,7 +196,7 @@ def put_example(base_url, name="Guest", age="unknown"):
     payload = {"name": name, "age": age}
 
     try:
-        response = requests.put(url, json=payload)
+        response = session.put(url, json=payload)
         if response.status_code == 200:
             print(f"PUT Example: Response from '{response.url}': {response.json()}")
         else:
@@ -216,7 +219,7 @@ def delete_example(base_url, name="Guest", age="unknown"):
     payload = {"name": name, "age": age}
 
     try:
-        response = requests.delete(url, json=payload)
+        response = session.delete(url, json=payload)
         if response.status_code == 200:
             print(f"DELETE Example: Response from '{response.url}': {response.json()}")
         else:
@@ -239,7 +242,7 @@ def patch_example(base_url, name="Guest", age="unknown"):
     payload = {"name": name, "age": age}
 
     try:
-        response = requests.patch(url, json=payload)
+        response = session.patch(url, json=payload)
         if response.status_code == 200:
             print(f"PATCH Example: Response from '{response.url}': {response.json()}")
         else:
@@ -259,7 +262,7 @@ def dynamic_get(base_url, ids):
     """
     url = f"{base_url}/api/dynamic_example/{ids}"
     try:
-        response = requests.get(url)
+        response = session.get(url)
         if response.status_code == 200:
             print(f"GET Dynamic: Response from '{response.url}': {response.json()}")
         else:
@@ -280,7 +283,7 @@ def dynamic_post(base_url, ids, data):
     """
     url = f"{base_url}/api/dynamic_example/{ids}"
     try:
-        response = requests.post(url, json=data)
+        response = session.post(url, json=data)
         if response.status_code == 200:
             print(f"POST Dynamic: Response from '{response.url}': {response.json()}")
         else:
@@ -301,7 +304,7 @@ def dynamic_put(base_url, ids, data):
     """
     url = f"{base_url}/api/dynamic_example/{ids}"
     try:
-        response = requests.put(url, json=data)
+        response = session.put(url, json=data)
         if response.status_code == 200:
             print(f"PUT Dynamic: Response from '{response.url}': {response.json()}")
         else:
@@ -321,7 +324,7 @@ def dynamic_delete(base_url, ids):
     """
     url = f"{base_url}/api/dynamic_example/{ids}"
     try:
-        response = requests.delete(url)
+        response = session.delete(url)
         if response.status_code == 200:
             print(f"DELETE Dynamic: Response from '{response.url}': {response.json()}")
         else:
@@ -342,7 +345,7 @@ def dynamic_patch(base_url, ids, data):
     """
     url = f"{base_url}/api/dynamic_example/{ids}"
     try:
-        response = requests.patch(url, json=data)
+        response = session.patch(url, json=data)
         if response.status_code == 200:
             print(f"PATCH Dynamic: Response from '{response.url}': {response.json()}")
         else:
@@ -351,6 +354,30 @@ def dynamic_patch(base_url, ids, data):
         print(f"PATCH Dynamic Error: {e}")
 
 
+def batch_example(base_url, subrequests, parallel=False):
+    """
+    Sends several API calls in one POST request to the '/api/batch' endpoint,
+    and prints each sub-response or an error message.
+
+    Parameters:
+        base_url (str): The base URL of the Flask app, e.g., "http://127.0.0.1:8181".
+        subrequests (list): Dicts with 'method', 'path', and optional 'query' and 'json'.
+        parallel (bool): Let the server run the sub-requests concurrently. Default is False.
+    """
+    url = f"{base_url}/api/batch"
+    payload = {"parallel": parallel, "requests": subrequests}
+
+    try:
+        response = session.post(url, json=payload)
+        if response.status_code == 200:
+            for sub, result in zip(subrequests, response.json()["responses"]):
+                print(f"BATCH {sub['method']} {sub['path']}: {result['status']} {result['body']}")
+        else:
+            print(f"BATCH Failed: Status code: {response.status_code}")
+    except requests.exceptions.RequestException as e:
+        print(f"BATCH Error: {e}")
+
+
 def requests_caller():
     """
     Calls each of the endpoint functions defined above in sequence
@@ -397,6 +424,13 @@ def requests_caller():
     # == DYNAMIC PATCH ==
     dynamic_patch(base_url, ids, payload)
 
+    # == BATCH (several calls, one round trip) ==
+    batch_example(base_url, [
+        {"method": "GET", "path": "/api/query_example", "query": {"name": name}},
+        {"method": "GET", "path": f"/api/dynamic_example/{ids}"},
+        {"method": "POST", "path": "/api/post_example", "json": payload},
+    ], parallel=True)
+
 
 if __name__ == '__main__':
     requests_caller()
@@ -419,4 +453,7 @@ POST Dynamic: Response from 'http://127.0.0.1:8181/api/dynamic_example/1': {'mes
 PUT Dynamic: Response from 'http://127.0.0.1:8181/api/dynamic_example/1': {'message': "PUT request for ID: 1, Data: {'name': 'Sameer', 'age': 30}"}
 DELETE Dynamic: Response from 'http://127.0.0.1:8181/api/dynamic_example/1': {'message': 'DELETE request for ID: 1'}
 PATCH Dynamic: Response from 'http://127.0.0.1:8181/api/dynamic_example/1': {'message': "PATCH request for ID: 1, Data: {'name': 'Sameer', 'age': 30}"}
+BATCH GET /api/query_example: 200 {'message': 'Hello, Sameer!'}
+BATCH GET /api/dynamic_example/1: 200 {'message': 'GET request for ID: 1'}
+BATCH POST /api/post_example: 200 {'message': 'Hello, Sameer! You are 30 years old.'}
 """
@@ -0,0 +1,75 @@
+import json
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Keep Flask's RFC 822 dates (via `default`) and allow non-string dict keys like json.dumps
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson, used by `jsonify` and `request.get_json()`.
+
+    Responses are always compact UTF-8 with keys in insertion order (no
+    sorting, no ASCII escaping), and are built as bytes without the
+    str round trip of the default provider. Types orjson does not know
+    go through Flask's usual `default` hook. Without orjson installed it
+    behaves like the default provider with the same compact output.
+    """
+
+    ensure_ascii = False
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs) -> str:
+        """
+        Serialize data as a JSON string.
+
+        Parameters:
+            obj: The data to serialize.
+            kwargs: json.dumps arguments; if any are given the stdlib encoder is used.
+
+        Returns:
+            str: The JSON document.
+        """
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        """
+        Deserialize a JSON string or UTF-8 bytes.
+
+        Parameters:
+            s (str or bytes): The JSON document.
+            kwargs: json.loads arguments; if any are given the stdlib decoder is used.
+
+        Returns:
+            The decoded data.
+        """
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        """
+        Build a JSON response, as `jsonify` does.
+
+        Parameters:
+            args: A single value, or several values serialized as a list.
+            kwargs: Values serialized as a dict.
+
+        Returns:
+            Response: An application/json response.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        if orjson is not None:
+            body = orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)
+        else:
+            body = json.dumps(obj, default=self.default, ensure_ascii=False, separators=(",", ":")).encode()
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,182 @@
+import argparse
+import contextlib
+import os
+import random
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+
+import caller
+
+# Load generator built from the helpers in caller.py: many threads call
+# them at random (weighted by the mix) over the shared keep-alive session
+# for a fixed time, then throughput and latency percentiles are reported
+# per route.
+# Run it with: python loadgen.py --concurrency 32 --duration 10 --mix get_home_message=3,post_example=1
+
+NAME = "Sameer"
+AGE = 30
+IDS = 1
+SCORE = 92.5
+PAYLOAD = {"name": NAME, "age": AGE}
+
+# Every helper with the arguments requests_caller() uses
+CALLS = {
+    "get_home_message": lambda base_url: caller.get_home_message(base_url),
+    "get_example_message": lambda base_url: caller.get_example_message(base_url),
+    "get_query_example_message": lambda base_url: caller.get_query_example_message(base_url, NAME),
+    "get_multi_query_example": lambda base_url: caller.get_multi_query_example(base_url, NAME, AGE),
+    "get_default_query_example": lambda base_url: caller.get_default_query_example(base_url),
+    "get_url_example_message": lambda base_url: caller.get_url_example_message(base_url, NAME, AGE),
+    "get_other_url_example": lambda base_url: caller.get_other_url_example(base_url, IDS, SCORE),
+    "post_example": lambda base_url: caller.post_example(base_url, NAME, AGE),
+    "put_example": lambda base_url: caller.put_example(base_url, NAME, AGE),
+    "delete_example": lambda base_url: caller.delete_example(base_url, NAME, AGE),
+    "patch_example": lambda base_url: caller.patch_example(base_url, NAME, AGE),
+    "dynamic_get": lambda base_url: caller.dynamic_get(base_url, IDS),
+    "dynamic_post": lambda base_url: caller.dynamic_post(base_url, IDS, PAYLOAD),
+    "dynamic_put": lambda base_url: caller.dynamic_put(base_url, IDS, PAYLOAD),
+    "dynamic_delete": lambda base_url: caller.dynamic_delete(base_url, IDS),
+    "dynamic_patch": lambda base_url: caller.dynamic_patch(base_url, IDS, PAYLOAD),
+}
+
+# Status code of the last response received by each thread
+last_status = threading.local()
+
+
+def record_status(response, *args, **kwargs):
+    """
+    Session response hook that remembers the status code for the calling thread.
+
+    Parameters:
+        response (requests.Response): The response just received.
+    """
+    last_status.value = response.status_code
+
+
+def parse_mix(text):
+    """
+    Parse a request mix such as "get_home_message=3,post_example=1".
+
+    Parameters:
+        text (str or None): Comma-separated helper=weight pairs; None means every helper, equally.
+
+    Returns:
+        dict: Helper name -> weight.
+    """
+    if not text:
+        return {name: 1 for name in CALLS}
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in CALLS:
+            raise SystemExit(f"Unknown helper in mix: {name!r} (choose from {', '.join(CALLS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Parameters:
+        sorted_values (list): Values in ascending order.
+        fraction (float): Percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        float: The percentile, or 0.0 for an empty list.
+    """
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, int(len(sorted_values) * fraction + 0.5) - 1)]
+
+
+def run_load(base_url, concurrency, duration, mix):
+    """
+    Call the helpers from `concurrency` threads for `duration` seconds.
+
+    Parameters:
+        base_url (str): The base URL of the Flask app, e.g., "http://127.0.0.1:8181".
+        concurrency (int): Number of threads sending requests.
+        duration (float): Seconds to run for.
+        mix (dict): Helper name -> weight.
+
+    Returns:
+        tuple: (elapsed seconds, {helper: [latencies]}, {helper: errors})
+    """
+    # Keep one pooled connection per thread alive for the whole run
+    caller.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=concurrency, pool_block=True))
+    caller.session.hooks["response"].append(record_status)
+
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(seed):
+        rng = random.Random(seed)
+        local_latencies = {name: [] for name in names}
+        local_errors = {name: 0 for name in names}
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            last_status.value = None
+            started = time.perf_counter()
+            CALLS[name](base_url)
+            local_latencies[name].append(time.perf_counter() - started)
+            if last_status.value != 200:
+                local_errors[name] += 1
+        with lock:
+            for name in names:
+                latencies[name].extend(local_latencies[name])
+                errors[name] += local_errors[name]
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(concurrency)]
+    started = time.perf_counter()
+    # The helpers print every response; keep that out of the measurement
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return time.perf_counter() - started, latencies, errors
+
+
+def print_report(elapsed, latencies, errors):
+    """
+    Print throughput and latency percentiles per helper and in total.
+
+    Parameters:
+        elapsed (float): Seconds the run took.
+        latencies (dict): Helper name -> latencies in seconds.
+        errors (dict): Helper name -> calls without a 200 response.
+    """
+    header = f"{'route':<28} | {'requests':>8} | {'req/s':>8} | {'errors':>6} | {'p50':>8} | {'p90':>8} | {'p99':>8} | {'max':>8}"
+    print(header)
+    print("-" * len(header))
+    rows = list(latencies.items()) + [("TOTAL", [value for values in latencies.values() for value in values])]
+    for name, values in rows:
+        values = sorted(values)
+        failed = sum(errors.values()) if name == "TOTAL" else errors[name]
+        cells = [f"{percentile(values, fraction) * 1000:>6.1f}ms" for fraction in (0.5, 0.9, 0.99, 1.0)]
+        print(f"{name:<28} | {len(values):>8} | {len(values) / elapsed:>8.0f} | {failed:>6} | " + " | ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the Flask routes app")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8181", help="Base URL of the Flask app")
+    parser.add_argument("--concurrency", type=int, default=16, help="Threads sending requests")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run for")
+    parser.add_argument("--mix", help="Weighted helpers, e.g. get_home_message=3,post_example=1 (default: all, equal)")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    print(f"{args.concurrency} threads for {args.duration:g}s against {args.base_url}\n")
+    elapsed, latencies, errors = run_load(args.base_url, args.concurrency, args.duration, mix)
+    print_report(elapsed, latencies, errors)
+
+
+if __name__ == '__main__':
+    main()
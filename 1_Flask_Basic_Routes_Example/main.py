@@ -1,11 +1,44 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from flask import Flask, jsonify, request
+from werkzeug.exceptions import HTTPException, InternalServerError
+from werkzeug.test import EnvironBuilder
+
+from fast_json import FastJSONProvider
+from request_log import RequestLog
+from response_cache import ResponseCache
 
 app = Flask(__name__)
+# jsonify() and request.get_json() go through orjson instead of the stdlib json module
+app.json = FastJSONProvider(app)
+
+# Limits of POST /api/batch
+MAX_BATCH_SIZE = 50
+BATCH_METHODS = {'GET', 'POST', 'PUT', 'DELETE', 'PATCH'}
+# Threads shared by all batches sent with "parallel": true; `batch_worker.active`
+# is set in each of them
+batch_worker = threading.local()
+batch_executor = ThreadPoolExecutor(
+    max_workers=8,
+    thread_name_prefix="batch",
+    initializer=lambda: setattr(batch_worker, 'active', True),
+)
+
+# JSON request log written to stdout by a background thread. Rates are the
+# fraction of requests logged per route (view name); unlisted routes log all.
+LOG_SAMPLE_RATES = {'url_example': 0.1, 'other_url_example': 0.1}
+request_log = RequestLog('routes', rates=LOG_SAMPLE_RATES, queue_size=10_000)
+
+# Encoded responses of the GET routes that only depend on their path and query string
+response_cache = ResponseCache(max_size=1024, max_age=60)
 
 
 # Basic route to return a welcome message.
 # Access the route by visiting: http://127.0.0.1:8181/
 @app.route('/')
+@response_cache.cached
 def home():
     """
     Home route to provide a basic welcome message.
@@ -18,6 +51,7 @@ def home():
 # Simple API route (GET request).
 # Access the route by visiting: http://127.0.0.1:8181/api/get_example
 @app.route('/api/get_example', methods=['GET'])
+@response_cache.cached
 def get_example():
     """
     A simple GET API endpoint returning a basic message.
@@ -30,6 +64,7 @@ def get_example():
 # Simple API route (GET request) with a single query parameter.
 # Access the route by visiting: http://127.0.0.1:8181/api/query_example?name=Sameer
 @app.route('/api/query_example', methods=['GET'])
+@response_cache.cached
 def query_example():
     """
     A GET endpoint that accepts a 'name' query parameter and responds with a message.
@@ -47,6 +82,7 @@ def query_example():
 # Simple API route (GET request) with multiple query parameters.
 # Access the route by visiting: http://127.0.0.1:8181/api/multi_query_example?name=Sameer&age=30
 @app.route('/api/multi_query_example', methods=['GET'])
+@response_cache.cached
 def multi_query_example():
     """
     A GET endpoint that accepts multiple query parameters ('name' and 'age') and returns a message.
@@ -66,6 +102,7 @@ def multi_query_example():
 # Simple API route (GET request) with default query parameters.
 # Access the route by visiting: http://127.0.0.1:8181/api/default_query_example
 @app.route('/api/default_query_example', methods=['GET'])
+@response_cache.cached
 def default_query_example():
     """
     A GET endpoint that returns a message with the default query parameters (name and age).
@@ -86,6 +123,7 @@ def default_query_example():
 # Simple API route (GET request) with URL parameters.
 # Access the route by visiting: http://127.0.0.1:8181/api/url_example/Sameer/30
 @app.route('/api/url_example/<name>/<int:age>', methods=['GET'])
+@response_cache.cached
 def url_example(name, age):
     """
     A GET endpoint that takes 'name' and 'age' as URL parameters and returns a personalized message.
@@ -97,14 +135,15 @@ def url_example(name, age):
     Returns:
         json: A JSON response with a personalized message containing the name and age.
     """
-    # Debugging to check types (optional)
-    print("name", type(name), "age", type(age))  # For debugging purpose
+    # Debugging to check types (sampled, written off the request path)
+    request_log.info('url_example', "url params", name_type=type(name).__name__, age_type=type(age).__name__)
     return jsonify({"message": f"Hello, {name}! You are {age} years old."})
 
 
 # Simple API route (GET request) with other types of URL parameters.
 # Access the route by visiting: http://127.0.0.1:8181/api/other_url_example/1/2.5
 @app.route('/api/other_url_example/<int:ids>/<float:score>', methods=['GET'])
+@response_cache.cached
 def other_url_example(ids, score):
     """
     A GET endpoint that accepts two types of URL parameters: an integer 'ids' and a float 'score'.
@@ -116,8 +155,8 @@ def other_url_example(ids, score):
     Returns:
         json: A JSON response with the provided 'ids' and 'score'.
     """
-    # Debugging to check types (optional)
-    print(type(ids), type(score))  # For debugging purpose
+    # Debugging to check types (sampled, written off the request path)
+    request_log.info('other_url_example', "url params", ids_type=type(ids).__name__, score_type=type(score).__name__)
     return jsonify({"message": f"ID: {ids}, Score: {score}"})
 
 
@@ -244,7 +283,143 @@ def dynamic_example(ids):
         return jsonify({"error": "Method not allowed"}), 405
 
 
-# Start the Flask app
+# Response cache metrics (hit ratio and memory held).
+# Access the route by visiting: http://127.0.0.1:8181/api/cache_stats
+@app.route('/api/cache_stats', methods=['GET'])
+def cache_stats():
+    """
+    A GET endpoint reporting the response cache counters.
+
+    Returns:
+        json: Size, bytes held, hits, misses, hit ratio, 304s and evictions.
+    """
+    return jsonify(response_cache.stats())
+
+
+# Request log metrics (lines queued, dropped under back-pressure, sampled out).
+# Access the route by visiting: http://127.0.0.1:8181/api/log_stats
+@app.route('/api/log_stats', methods=['GET'])
+def log_stats():
+    """
+    A GET endpoint reporting the request log counters.
+
+    Returns:
+        json: Lines queued, dropped, sampled out, and waiting to be written.
+    """
+    return jsonify(request_log.stats())
+
+
+def subrequest_environ(sub):
+    """
+    Build the WSGI environ of one sub-request of a batch.
+
+    Parameters:
+        sub (dict): The sub-request: method, path, and optional query and json.
+
+    Returns:
+        dict: The environ, with the path decoded the way a real request's is.
+    """
+    builder = EnvironBuilder(
+        path=sub['path'],
+        method=sub['method'].upper(),
+        query_string=sub.get('query'),
+        json=sub.get('json'),
+    )
+    try:
+        return builder.get_environ()
+    finally:
+        builder.close()
+
+
+def subrequest_endpoint(environ):
+    """
+    The endpoint the app's URL map routes a sub-request to.
+
+    Parameters:
+        environ (dict): The sub-request's environ.
+
+    Returns:
+        str: The endpoint name, or None if no route matches.
+    """
+    try:
+        rule, _ = app.url_map.bind_to_environ(environ).match(return_rule=True)
+    except HTTPException:
+        return None
+    return rule.endpoint
+
+
+def dispatch_subrequest(environ):
+    """
+    Run one sub-request of a batch through the app's URL map and view
+    functions in-process, without any HTTP round trip.
+
+    Parameters:
+        environ (dict): The sub-request's environ, from subrequest_environ.
+
+    Returns:
+        dict: The sub-response: status and body (parsed JSON, or text); 500
+        if the view raised.
+    """
+    with app.request_context(environ):
+        try:
+            response = app.full_dispatch_request()
+        except Exception as error:
+            # An unhandled error fails only this sub-request. `handle_exception`
+            # re-raises in debug mode, so the 500 is built here instead.
+            app.log_exception(sys.exc_info())
+            response = app.finalize_request(InternalServerError(original_exception=error), from_error_handler=True)
+    body = app.json.loads(response.get_data()) if response.is_json else response.get_data(as_text=True)
+    return {"status": response.status_code, "body": body}
+
+
+# Batch route to send many API calls in one round trip.
+@app.route('/api/batch', methods=['POST'])
+def batch_example():
+    """
+    A POST endpoint that runs a list of sub-requests and returns all their responses at once.
+
+    Request Body (JSON):
+        {
+            "parallel": false,
+            "requests": [
+                {"method": "GET", "path": "/api/query_example", "query": {"name": "Sameer"}},
+                {"method": "POST", "path": "/api/post_example", "json": {"name": "Sameer", "age": 30}}
+            ]
+        }
+
+    Sub-requests run in order unless "parallel" is true, in which case they run
+    concurrently and must not depend on each other. At most MAX_BATCH_SIZE are allowed.
+
+    Returns:
+        json: {"responses": [{"status": int, "body": ...}, ...]} in request order.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('requests'), list):
+        return jsonify({"error": "Expected a JSON object with a 'requests' list"}), 400
+    subrequests = data['requests']
+    if len(subrequests) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} requests per batch"}), 413
+    environs = []
+    for sub in subrequests:
+        if (not isinstance(sub, dict) or str(sub.get('method', '')).upper() not in BATCH_METHODS
+                or not isinstance(sub.get('path'), str) or not sub['path'].startswith('/')
+                or not isinstance(sub.get('query', {}), (dict, str))):
+            return jsonify({"error": f"Invalid sub-request: {sub!r}"}), 400
+        environ = subrequest_environ(sub)
+        # Matched like a real request, so encoded paths such as /api/%62atch are caught too
+        if subrequest_endpoint(environ) == 'batch_example':
+            return jsonify({"error": "Batches cannot be nested"}), 400
+        environs.append(environ)
+
+    # A pool thread must never wait on the pool itself, or a full pool deadlocks
+    if data.get('parallel') and not getattr(batch_worker, 'active', False):
+        responses = list(batch_executor.map(dispatch_subrequest, environs))
+    else:
+        responses = [dispatch_subrequest(environ) for environ in environs]
+    return jsonify({"responses": responses})
+
+
+# Start the Flask app (development server; use `python serve.py` in production)
 if __name__ == '__main__':
     # Run the app with the specified host and port, enabling debug mode for development
     app.run(host="0.0.0.0", port=8181, debug=True)
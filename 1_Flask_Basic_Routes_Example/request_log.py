@@ -0,0 +1,181 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+RECORD_ATTRIBUTES = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON line: time, level, logger and message,
+    plus every field passed with `extra=`.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class RouteSampler(logging.Filter):
+    """
+    Keeps a fraction of the records of each route (the record's `route`
+    field): `rates` maps route names to a rate between 0 and 1, and
+    routes not listed use `default_rate`. Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates=None, default_rate=1.0):
+        """
+        Parameters:
+            rates (dict): Route name -> fraction of records kept.
+            default_rate (float): Fraction kept for routes not in `rates`.
+        """
+        super().__init__()
+        self.rates = dict(rates or {})
+        self.default_rate = default_rate
+        self.sampled_out = 0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(getattr(record, "route", None), self.default_rate)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hands records to a bounded queue without ever waiting: when the queue
+    is full (the writer thread is stuck on a slow stdout) the record is
+    dropped and counted instead of blocking the request.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.queued = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record):
+        # Formatting happens on the writer thread, not in the request
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+        else:
+            with self._lock:
+                self.queued += 1
+
+
+class RequestLog:
+    """
+    Structured request logging that stays off the request path.
+
+    Requests only run the sampling filter and a non-blocking queue put;
+    a background thread formats the records as JSON lines and writes
+    them to `stream` (stdout by default).
+
+    The writer thread is started by the first record logged in each
+    process, so workers forked from a preloaded app get their own.
+    """
+
+    def __init__(self, name, rates=None, default_rate=1.0, queue_size=10_000, stream=None):
+        """
+        Parameters:
+            name (str): Logger name.
+            rates (dict): Route name -> fraction of records kept.
+            default_rate (float): Fraction kept for routes not in `rates`.
+            queue_size (int): Records buffered before new ones are dropped.
+            stream (file): Where the JSON lines go. Default is sys.stdout.
+        """
+        self.queue_size = queue_size
+        self.sampler = RouteSampler(rates, default_rate)
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        self.handler.addFilter(self.sampler)
+
+        self.writer = logging.StreamHandler(stream or sys.stdout)
+        self.writer.setFormatter(JSONFormatter())
+        self.listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+
+    def _start(self):
+        """
+        Start this process's writer thread on a fresh queue; it is
+        stopped (after draining) at exit.
+        """
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.handler.queue = queue.Queue(maxsize=self.queue_size)
+            self.listener = QueueListener(self.handler.queue, self.writer)
+            self.listener.start()
+            self._pid = os.getpid()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """
+        Write out what is queued and stop the writer thread.
+        """
+        with self._lock:
+            if self.listener is not None and self._pid == os.getpid():
+                try:
+                    self.listener.stop()
+                except queue.Full:
+                    pass  # No room for the stop marker; the daemon thread ends with the process
+            self.listener = None
+            self._pid = None
+
+    def info(self, route, msg, **fields):
+        """
+        Log one request event.
+
+        Parameters:
+            route (str): Route name, used for sampling.
+            msg (str): Event message.
+            fields: Extra JSON fields.
+        """
+        if self._pid != os.getpid():
+            self._start()
+        self.logger.info(msg, extra=dict(fields, route=route))
+
+    def stats(self):
+        """
+        Logging counters.
+
+        Returns:
+            dict: Records queued, dropped on a full queue, removed by sampling, and the queue backlog.
+        """
+        return {
+            "queued": self.handler.queued,
+            "dropped": self.handler.dropped,
+            "sampled_out": self.sampler.sampled_out,
+            "backlog": self.handler.queue.qsize(),
+        }
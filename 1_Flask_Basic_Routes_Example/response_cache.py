@@ -0,0 +1,148 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from flask import current_app, request
+
+
+class ResponseCache:
+    """
+    Bounded LRU of encoded responses for GET routes that are pure functions
+    of their path and query string.
+
+    The key is the request path plus its query arguments sorted by name, so
+    `?b=2&a=1` and `?a=1&b=2` share an entry. Entries hold the response
+    bytes exactly as first produced, so a hit skips both the view and JSON
+    encoding. Every cached response carries an `ETag` and `Cache-Control`,
+    and a matching `If-None-Match` gets an empty 304.
+
+    The cache lives in one process; each gunicorn worker has its own.
+    """
+
+    def __init__(self, max_size=1024, max_age=60):
+        """
+        Parameters:
+            max_size (int): Maximum number of cached responses.
+            max_age (int): Seconds clients may reuse a response (Cache-Control max-age).
+        """
+        self.max_size = max_size
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def cached(self, view):
+        """
+        Decorator that serves a view from the cache. Put it below `@app.route`.
+
+        Parameters:
+            view (callable): The Flask view function.
+
+        Returns:
+            callable: The wrapped view.
+        """
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+
+            key = self.make_key()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                else:
+                    self.misses += 1
+
+            if entry is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.direct_passthrough:
+                    return response
+                body = response.get_data()
+                entry = (body, response.mimetype, '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest())
+                self._store(key, entry)
+
+            body, mimetype, etag = entry
+            response = current_app.response_class(body, mimetype=mimetype)
+            response.headers['ETag'] = etag
+            response.headers['Cache-Control'] = f"public, max-age={self.max_age}"
+            response.make_conditional(request)
+            if response.status_code == 304:
+                with self._lock:
+                    self.not_modified += 1
+            return response
+
+        return wrapper
+
+    @staticmethod
+    def make_key():
+        """
+        Normalized cache key of the current request.
+
+        Returns:
+            str: The path, plus the query arguments sorted by name. The sort
+            is stable, so repeated arguments keep their order: views read
+            the first value, so `?a=1&a=2` and `?a=2&a=1` differ.
+        """
+        args = sorted(request.args.items(multi=True), key=lambda item: item[0])
+        return f"{request.path}?{urlencode(args)}" if args else request.path
+
+    def _store(self, key, entry):
+        """
+        Add an entry and evict the least recently used ones over `max_size`.
+        """
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= self._entry_size(key, old)
+            self._entries[key] = entry
+            self._bytes += self._entry_size(key, entry)
+            while len(self._entries) > self.max_size:
+                old_key, old_entry = self._entries.popitem(last=False)
+                self._bytes -= self._entry_size(old_key, old_entry)
+                self.evictions += 1
+
+    @staticmethod
+    def _entry_size(key, entry):
+        """
+        Approximate memory held by an entry: key, body and ETag lengths.
+        """
+        body, mimetype, etag = entry
+        return len(key) + len(body) + len(mimetype) + len(etag)
+
+    def clear(self):
+        """
+        Drop every cached response.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Cache counters.
+
+        Returns:
+            dict: Size, approximate bytes held, hits, misses, hit ratio, 304s and evictions.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "not_modified": self.not_modified,
+                "evictions": self.evictions,
+            }
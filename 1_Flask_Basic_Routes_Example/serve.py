@@ -0,0 +1,66 @@
+import os
+
+from gunicorn.app.base import BaseApplication
+
+# Production entry point: the same app as `python main.py`, but served by
+# gunicorn worker processes instead of Flask's debug server.
+# Run it with: python serve.py
+
+# Every setting can be overridden with an environment variable
+BIND = os.getenv("FLASK_BIND", "0.0.0.0:8181")
+
+# Worker processes; each one runs a copy of the app
+WORKERS = int(os.getenv("FLASK_WORKERS", str(os.cpu_count() or 1)))
+
+# Threads per worker; with more than one, workers use gunicorn's threaded
+# (gthread) worker, otherwise the plain process-per-request sync worker
+THREADS = int(os.getenv("FLASK_THREADS", "4"))
+
+# Pending connections the kernel queues before refusing new ones
+BACKLOG = int(os.getenv("FLASK_BACKLOG", "2048"))
+
+# Seconds an idle keep-alive connection stays open (gthread workers only)
+KEEPALIVE_SECONDS = int(os.getenv("FLASK_KEEPALIVE", "5"))
+
+# Seconds a worker gets to finish in-flight requests on restart/shutdown
+GRACEFUL_TIMEOUT_SECONDS = int(os.getenv("FLASK_GRACEFUL_TIMEOUT", "30"))
+
+
+class RoutesServer(BaseApplication):
+    """
+    Gunicorn master running the Flask routes app.
+
+    Send SIGHUP to the master for a graceful restart of all workers,
+    SIGTTIN/SIGTTOU to add/remove a worker, and SIGTERM to shut down
+    after in-flight requests finish.
+    """
+
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from main import app
+        return app
+
+
+def main():
+    RoutesServer({
+        "bind": BIND,
+        "workers": WORKERS,
+        "threads": THREADS,
+        "worker_class": "gthread" if THREADS > 1 else "sync",
+        "backlog": BACKLOG,
+        "keepalive": KEEPALIVE_SECONDS,
+        "graceful_timeout": GRACEFUL_TIMEOUT_SECONDS,
+        # Import the app once in the master and fork the workers from it
+        "preload_app": True,
+    }).run()
+
+
+if __name__ == '__main__':
+    main()
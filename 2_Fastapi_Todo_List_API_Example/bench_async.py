@@ -0,0 +1,157 @@
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy.orm import Session
+
+from database import DATABASE_PATH, SessionLocal, TodoDB, migrate
+from main import TodoCreate
+
+# ==========================================
+# 🔧 Step 1: Benchmark Settings
+# ==========================================
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CONCURRENCY_LEVELS = [1, 64, 512]
+DURATION_SECONDS = 5
+SEED_TODOS = 1000
+
+VARIANTS = {
+    "sync": ("bench_async:sync_app", 8191),
+    "async": ("main:app", 8192),
+}
+
+
+# ==========================================
+# 🐢 Step 2: Sync Baseline App
+# ==========================================
+
+# The previous blocking implementation, kept here so both variants can be
+# served side by side against the same schema.
+@asynccontextmanager
+async def sync_lifespan(app: FastAPI):
+    """
+    Create the schema before serving, as the async app does per shard.
+    """
+    migrate(DATABASE_PATH)
+    yield
+
+
+sync_app = FastAPI(title="Todo API (Sync Baseline)", lifespan=sync_lifespan)
+
+
+def get_sync_db():
+    """
+    FastAPI dependency that provides a blocking database session.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@sync_app.post("/todos")
+def sync_create_todo(task: TodoCreate, db: Session = Depends(get_sync_db)):
+    new_todo = TodoDB(task=task.task)
+    db.add(new_todo)
+    db.commit()
+    db.refresh(new_todo)
+    return new_todo
+
+
+@sync_app.get("/todos/{tid}")
+def sync_get_todo(tid: int, db: Session = Depends(get_sync_db)):
+    todo = db.query(TodoDB).filter(TodoDB.tid == tid).first()
+    if not todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    return todo
+
+
+# ==========================================
+# 🏁 Step 3: Load Generator
+# ==========================================
+
+async def wait_until_ready(client: httpx.AsyncClient, base_url: str):
+    """
+    Poll the server until it accepts connections.
+    """
+    for _ in range(100):
+        try:
+            await client.post(f"{base_url}/todos", json={"task": "warmup"})
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+async def run_level(client: httpx.AsyncClient, base_url: str, concurrency: int) -> float:
+    """
+    Hammer GET /todos/{tid} with `concurrency` clients for DURATION_SECONDS.
+
+    Returns:
+        float: Completed requests per second
+    """
+    completed = 0
+    deadline = time.perf_counter() + DURATION_SECONDS
+
+    async def worker():
+        nonlocal completed
+        while time.perf_counter() < deadline:
+            response = await client.get(f"{base_url}/todos/{random.randint(1, SEED_TODOS)}")
+            response.raise_for_status()
+            completed += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return completed / (time.perf_counter() - started)
+
+
+async def bench_variant(port: int) -> dict:
+    """
+    Seed the database and measure every concurrency level against one server.
+    """
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=max(CONCURRENCY_LEVELS))
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        await wait_until_ready(client, base_url)
+        for i in range(SEED_TODOS):
+            await client.post(f"{base_url}/todos", json={"task": f"Task {i}"})
+        return {level: await run_level(client, base_url, level) for level in CONCURRENCY_LEVELS}
+
+
+def main():
+    results = {}
+    for name, (target, port) in VARIANTS.items():
+        # Each variant gets its own empty todo.db in a scratch directory
+        with tempfile.TemporaryDirectory() as workdir:
+            server = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", target, "--app-dir", APP_DIR,
+                 "--port", str(port), "--log-level", "warning"],
+                cwd=workdir,
+            )
+            try:
+                results[name] = asyncio.run(bench_variant(port))
+            finally:
+                server.terminate()
+                server.wait()
+
+    print(f"\n{'clients':>8} | {'sync req/s':>12} | {'async req/s':>12}")
+    print("-" * 38)
+    for level in CONCURRENCY_LEVELS:
+        print(f"{level:>8} | {results['sync'][level]:>12.1f} | {results['async'][level]:>12.1f}")
+
+
+# ==========================================
+# ▶️ Entry Point
+# ==========================================
+
+if __name__ == "__main__":
+    main()
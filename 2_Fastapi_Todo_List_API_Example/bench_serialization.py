@@ -0,0 +1,91 @@
+import os
+import tempfile
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from database import Base, TodoDB, TODO_COLUMNS, todos_table
+from fast_json import encode_json
+
+# ==========================================
+# 🔧 Step 1: Benchmark Settings
+# ==========================================
+
+ROW_COUNTS = [10, 10_000, 1_000_000]
+INSERT_CHUNK_SIZE = 50_000
+
+
+# ==========================================
+# 🐢 Step 2: Serialization Paths
+# ==========================================
+
+def orm_path(db: Session) -> bytes:
+    """
+    Previous path: hydrate TodoDB objects, run them through
+    jsonable_encoder, then let JSONResponse encode the result.
+    """
+    todos = db.scalars(select(TodoDB).order_by(TodoDB.tid)).all()
+    return JSONResponse(jsonable_encoder(todos)).body
+
+
+def tuple_path(db: Session) -> bytes:
+    """
+    New path: select (tid, task, status) tuples and encode them directly.
+    """
+    rows = db.execute(select(*TODO_COLUMNS).order_by(todos_table.c.tid))
+    return encode_json([{"tid": tid, "task": task, "status": status} for tid, task, status in rows])
+
+
+# ==========================================
+# 🏁 Step 3: Runner
+# ==========================================
+
+def seed(db: Session, count: int):
+    """
+    Fill the todos table with `count` rows.
+    """
+    for start in range(0, count, INSERT_CHUNK_SIZE):
+        stop = min(count, start + INSERT_CHUNK_SIZE)
+        db.execute(insert(todos_table), [{"task": f"Task {i}", "status": i % 2 == 0} for i in range(start, stop)])
+    db.commit()
+
+
+def best_of(fn, db: Session, repeat: int) -> float:
+    """
+    Best wall time of `repeat` runs, in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        db.expunge_all()
+        started = time.perf_counter()
+        fn(db)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    print(f"\n{'rows':>10} | {'ORM + jsonable_encoder':>22} | {'tuples + fast encoder':>21} | {'speedup':>7}")
+    print("-" * 72)
+    for count in ROW_COUNTS:
+        with tempfile.TemporaryDirectory() as workdir:
+            engine = create_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+            Base.metadata.create_all(bind=engine)
+            with Session(engine) as db:
+                seed(db, count)
+                assert orm_path(db).count(b'"tid"') == tuple_path(db).count(b'"tid"') == count
+                repeat = 1 if count >= 1_000_000 else 5
+                before = best_of(orm_path, db, repeat)
+                after = best_of(tuple_path, db, repeat)
+            engine.dispose()
+        print(f"{count:>10} | {before:>20.2f}ms | {after:>19.2f}ms | {before / after:>6.1f}x")
+
+
+# ==========================================
+# ▶️ Entry Point
+# ==========================================
+
+if __name__ == "__main__":
+    main()
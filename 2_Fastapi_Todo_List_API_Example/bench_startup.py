@@ -0,0 +1,124 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from database import migrate
+
+# ==========================================
+# 🔧 Step 1: Benchmark Settings
+# ==========================================
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+PORT = 8193
+WORKER_COUNT = 4
+POLLERS = 32
+TIMEOUT_SECONDS = 30
+
+VARIANTS = {
+    "preload": "1",
+    "no preload": "0",
+}
+
+
+# ==========================================
+# 🏁 Step 2: Startup Probe
+# ==========================================
+
+async def first_request_times(started: float) -> dict:
+    """
+    Poll GET /metrics over fresh connections until every worker answered.
+
+    Every request opens a new connection so the kernel hands it to
+    whichever worker accepts first, and each worker is seen early.
+
+    Returns:
+        dict: worker PID -> seconds from launch to its first response
+    """
+    first_seen = {}
+    deadline = started + TIMEOUT_SECONDS
+    limits = httpx.Limits(max_keepalive_connections=0)
+
+    async with httpx.AsyncClient(limits=limits, timeout=5) as client:
+        async def poller():
+            while len(first_seen) < WORKER_COUNT and time.perf_counter() < deadline:
+                try:
+                    response = await client.get(f"http://127.0.0.1:{PORT}/metrics")
+                except httpx.TransportError:
+                    await asyncio.sleep(0.01)
+                    continue
+                first_seen.setdefault(response.json()["worker"], time.perf_counter() - started)
+
+        await asyncio.gather(*(poller() for _ in range(POLLERS)))
+    return first_seen
+
+
+def bench_variant(preload: str) -> list:
+    """
+    Launch serve.py against an empty scratch directory and time each
+    worker's first request.
+
+    Returns:
+        list: Seconds to first request, one entry per worker, fastest first
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(
+            os.environ,
+            TODO_BIND=f"127.0.0.1:{PORT}",
+            TODO_WORKERS=str(WORKER_COUNT),
+            TODO_CHANGE_FEED="0",  # Required for more than one worker
+            TODO_PRELOAD=preload,
+        )
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(APP_DIR, "serve.py")],
+            cwd=workdir, env=env, stderr=subprocess.DEVNULL,
+        )
+        try:
+            return sorted(asyncio.run(first_request_times(started)).values())
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def schema_setup_times() -> tuple:
+    """
+    Time the schema step on a new database and again once it is current,
+    which is all a worker or a lazily opened shard pays now.
+
+    Returns:
+        tuple: (fresh ms, up-to-date ms)
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "todo.db")
+        timings = []
+        for _ in range(2):
+            started = time.perf_counter()
+            migrate(path)
+            timings.append((time.perf_counter() - started) * 1000)
+    return tuple(timings)
+
+
+def main():
+    fresh, current = schema_setup_times()
+    print(f"\nschema setup: {fresh:.1f}ms on a new database, {current:.1f}ms once up to date")
+
+    results = {name: bench_variant(preload) for name, preload in VARIANTS.items()}
+
+    print(f"\n{'worker':>8} | " + " | ".join(f"{name:>12}" for name in results))
+    print("-" * (11 + 15 * len(results)))
+    for i in range(WORKER_COUNT):
+        cells = [f"{times[i] * 1000:>10.0f}ms" if i < len(times) else f"{'-':>12}" for times in results.values()]
+        print(f"{i + 1:>8} | " + " | ".join(cells))
+
+
+# ==========================================
+# ▶️ Entry Point
+# ==========================================
+
+if __name__ == "__main__":
+    main()
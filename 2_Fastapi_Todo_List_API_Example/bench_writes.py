@@ -0,0 +1,159 @@
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database import Base, TodoDB, set_sqlite_pragmas
+from main import insert_todo_row, update_todo_row, delete_todo_row
+
+# ==========================================
+# 🔧 Step 1: Benchmark Settings
+# ==========================================
+
+OPERATIONS_PER_KIND = 2000
+
+
+# ==========================================
+# 🐢 Step 2: ORM Write Path (Before)
+# ==========================================
+
+# The previous implementation: SELECT via get_todo_or_404, ORM flush,
+# commit, then a refresh SELECT to reload the row.
+
+async def orm_create(db: AsyncSession, task: str):
+    todo = TodoDB(task=task)
+    db.add(todo)
+    await db.commit()
+    await db.refresh(todo)
+
+
+async def orm_update(db: AsyncSession, tid: int, task: str):
+    todo = await db.get(TodoDB, tid)
+    todo.task = task
+    todo.status = False
+    await db.commit()
+    await db.refresh(todo)
+
+
+async def orm_patch(db: AsyncSession, tid: int, is_done: bool):
+    todo = await db.get(TodoDB, tid)
+    todo.status = is_done
+    await db.commit()
+    await db.refresh(todo)
+
+
+async def orm_delete(db: AsyncSession, tid: int):
+    todo = await db.get(TodoDB, tid)
+    await db.delete(todo)
+    await db.commit()
+
+
+# ==========================================
+# ⚡ Step 3: RETURNING Write Path (After)
+# ==========================================
+
+async def core_create(db: AsyncSession, task: str):
+    await insert_todo_row(db, task)
+    await db.commit()
+
+
+async def core_update(db: AsyncSession, tid: int, task: str):
+    await update_todo_row(db, tid, task=task, status=False)
+    await db.commit()
+
+
+async def core_patch(db: AsyncSession, tid: int, is_done: bool):
+    await update_todo_row(db, tid, status=is_done)
+    await db.commit()
+
+
+async def core_delete(db: AsyncSession, tid: int):
+    await delete_todo_row(db, tid)
+    await db.commit()
+
+
+PATHS = {
+    "orm": {"create": orm_create, "update": orm_update, "patch": orm_patch, "delete": orm_delete},
+    "returning": {"create": core_create, "update": core_update, "patch": core_patch, "delete": core_delete},
+}
+
+
+# ==========================================
+# 🏁 Step 4: Runner
+# ==========================================
+
+def p99(samples: list) -> float:
+    """
+    99th percentile of a list of seconds, in milliseconds.
+    """
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))] * 1000
+
+
+async def bench_path(name: str, workdir: str) -> dict:
+    """
+    Run every operation kind against a fresh database, one request per
+    transaction, counting SQL statements and timing each request.
+
+    Returns:
+        dict: kind -> (statements per request, p99 latency in ms)
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(workdir, name)}.db")
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    statements = 0
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*args):
+        nonlocal statements
+        statements += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    ops = PATHS[name]
+    tids = range(1, OPERATIONS_PER_KIND + 1)
+    workloads = {
+        "create": [(f"Task {i}",) for i in tids],
+        "update": [(tid, f"Task {tid} (edited)") for tid in tids],
+        "patch": [(tid, True) for tid in tids],
+        "delete": [(tid,) for tid in tids],
+    }
+
+    results = {}
+    for kind, args_list in workloads.items():
+        statements = 0
+        latencies = []
+        for args in args_list:
+            async with session_factory() as db:
+                started = time.perf_counter()
+                await ops[kind](db, *args)
+                latencies.append(time.perf_counter() - started)
+        results[kind] = (statements / len(args_list), p99(latencies))
+
+    await engine.dispose()
+    return results
+
+
+def main():
+    with tempfile.TemporaryDirectory() as workdir:
+        before = asyncio.run(bench_path("orm", workdir))
+        after = asyncio.run(bench_path("returning", workdir))
+
+    print(f"\n{'operation':>10} | {'stmts before':>12} | {'stmts after':>11} | {'p99 before':>10} | {'p99 after':>9}")
+    print("-" * 65)
+    for kind in before:
+        b_stmts, b_p99 = before[kind]
+        a_stmts, a_p99 = after[kind]
+        print(f"{kind:>10} | {b_stmts:>12.1f} | {a_stmts:>11.1f} | {b_p99:>8.2f}ms | {a_p99:>7.2f}ms")
+
+
+# ==========================================
+# ▶️ Entry Point
+# ==========================================
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import json
+
 import requests
 
 # ==========================================
@@ -38,16 +40,56 @@ def create_todo(task: str):
     return response.json()
 
 
-def get_all_todos():
+def bulk_create_todos(tasks: list[str]):
     """
-    Retrieves all todos from the API.
+    Creates many todo items in a single request.
+
+    Args:
+        tasks (list[str]): Task descriptions
 
     Returns:
-        list[dict]: List of todos
+        list[int]: IDs of the created todos, in the same order
     """
-    response = requests.get(f"{BASE_URL}/todos")
+    response = requests.post(f"{BASE_URL}/todos/bulk", json=[{"task": task} for task in tasks])
     response.raise_for_status()
-    return response.json()
+    return response.json()["ids"]
+
+
+def get_all_todos(page_size: int = 100):
+    """
+    Retrieves all todos from the API, following the pagination cursor
+    until the last page.
+
+    Args:
+        page_size (int): Number of todos requested per page
+
+    Returns:
+        list[dict]: List of todos
+    """
+    todos = []
+    params = {"limit": page_size}
+    while True:
+        response = requests.get(f"{BASE_URL}/todos", params=params)
+        response.raise_for_status()
+        todos.extend(response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            return todos
+        params["after"] = next_cursor
+
+
+def stream_all_todos():
+    """
+    Streams all todos from the API as NDJSON, one todo at a time.
+
+    Yields:
+        dict: Todo item
+    """
+    with requests.get(f"{BASE_URL}/todos", params={"stream": "true"}, stream=True) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line:
+                yield json.loads(line)
 
 
 def get_todo_by_id(tid: int):
@@ -0,0 +1,161 @@
+import asyncio
+import secrets
+from collections import deque
+from typing import Iterable, List, Optional, Set
+
+
+class Subscription:
+    """
+    One change-feed subscriber with a bounded queue of pending events.
+
+    If the subscriber falls more than `queue_size` events behind, it is
+    cut off: its queue is emptied and it receives a single `lagged` event,
+    after which it should reconnect with the ID of the last event it saw.
+    Replayed events are delivered first and do not count against the
+    bound, which would otherwise cut off any client more than
+    `queue_size` events behind on every reconnect.
+    """
+
+    def __init__(self, queue_size: int, replay: Iterable[dict] = ()):
+        """
+        Args:
+            queue_size (int): Live events allowed to be pending
+            replay (Iterable[dict]): Events to deliver before the live ones
+        """
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.replay = deque(replay)
+        self.lagged = False
+
+    def push(self, event: dict) -> bool:
+        """
+        Queue an event without waiting.
+
+        Returns:
+            bool: False if the queue was full and the subscriber was cut off
+        """
+        if self.lagged:
+            return False
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.lagged = True
+            self.replay.clear()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "lagged"})
+            return False
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout (float): Seconds to wait before giving up
+
+        Returns:
+            Optional[dict]: The event, or None if none arrived in time
+        """
+        if self.replay:
+            return self.replay.popleft()
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ChangeFeed:
+    """
+    In-memory feed of committed todo mutations for SSE/WebSocket clients.
+
+    Every event gets an ID of the form `<epoch>-<seq>` and is kept in a
+    ring buffer of the last `history` events. A reconnecting client passes
+    the last ID it saw and is replayed everything after it. If that ID is
+    too old, or from before a restart, it gets a `reset` event instead and
+    should refetch the list.
+    """
+
+    def __init__(self, history: int = 1000, queue_size: int = 256):
+        """
+        Args:
+            history (int): Events kept for replay
+            queue_size (int): Pending events allowed per subscriber
+        """
+        self.queue_size = queue_size
+        self.epoch = secrets.token_hex(4)
+        self._seq = 0
+        self._history = deque(maxlen=history)
+        self._subscribers: Set[Subscription] = set()
+
+        self.published = 0
+        self.lagged = 0
+
+    def publish(self, event_type: str, tids: List[int], todo: Optional[dict] = None) -> dict:
+        """
+        Record an event and push it to every subscriber.
+
+        Args:
+            event_type (str): created, updated, patched, deleted or reset
+            tids (List[int]): IDs of the affected todos
+            todo (Optional[dict]): New state of a single changed todo
+
+        Returns:
+            dict: The published event
+        """
+        self._seq += 1
+        event = {"id": f"{self.epoch}-{self._seq}", "type": event_type, "tids": list(tids)}
+        if todo is not None:
+            event["todo"] = todo
+        self._history.append((self._seq, event))
+        self.published += 1
+        for subscriber in list(self._subscribers):
+            if not subscriber.push(event):
+                self.lagged += 1
+                self._subscribers.discard(subscriber)
+        return event
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Register a subscriber, replaying events after `last_event_id`.
+
+        Args:
+            last_event_id (Optional[str]): ID of the last event the client saw
+
+        Returns:
+            Subscription: Queue of replayed and future events
+        """
+        replay = self._replay(last_event_id) if last_event_id is not None else []
+        subscription = Subscription(self.queue_size, replay)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Remove a subscriber, e.g. after its client disconnected.
+        """
+        self._subscribers.discard(subscription)
+
+    def _replay(self, last_event_id: str) -> list:
+        """
+        Events after `last_event_id`, or a single `reset` event if they
+        are no longer (or were never) in the ring buffer.
+        """
+        epoch, _, seq = last_event_id.partition("-")
+        oldest = self._history[0][0] if self._history else self._seq + 1
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._seq or int(seq) < oldest - 1:
+            return [{"type": "reset"}]
+        return [event for event_seq, event in self._history if event_seq > int(seq)]
+
+    def stats(self) -> dict:
+        """
+        Subscriber and event counters.
+
+        Returns:
+            dict: Current subscribers, events published, subscribers cut off
+        """
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "lagged": self.lagged,
+            "history": len(self._history),
+        }
@@ -0,0 +1,272 @@
+from sqlalchemy import (
+    Column, Integer, String, Boolean, Index,
+    column, create_engine, event, inspect, table, text,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import sessionmaker, declarative_base
+
+# ==========================================
+# 🔧 Step 1: Database Setup
+# ==========================================
+
+# Default SQLite database (used when a request names no tenant)
+DATABASE_PATH = "./todo.db"
+
+# Multi-tenant mode: one SQLite file per tenant in this directory
+TENANT_DIR = "./tenants"
+
+# SQLite DB connection string (sync driver, used for DDL and the sync benchmark)
+DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+
+# Bump whenever init_schema() gains new objects; stored in PRAGMA user_version
+# so opening an up-to-date database skips the DDL entirely
+SCHEMA_VERSION = 5
+
+# SQLAlchemy engine and session maker
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+# Connection pragmas: WAL lets readers run alongside the single writer,
+# and synchronous=NORMAL only fsyncs at WAL checkpoints
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+    "cache_size": -20000,  # ~20 MB page cache per connection
+}
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Apply SQLITE_PRAGMAS to every new connection.
+    """
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+event.listen(engine, "connect", set_sqlite_pragmas)
+
+
+def create_read_engine(path: str, snapshot: bool = False) -> AsyncEngine:
+    """
+    Async (aiosqlite) engine used by the API routes to read a database.
+
+    pysqlite only issues BEGIN before writes, so by default every SELECT
+    of a session reads its own snapshot. With `snapshot=True` sessions
+    start with an explicit BEGIN instead, and all their queries see the
+    database as of the first one.
+
+    Args:
+        path (str): SQLite file path
+        snapshot (bool): Run each session's reads in one transaction
+
+    Returns:
+        AsyncEngine: Engine with SQLITE_PRAGMAS applied
+    """
+    read_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    event.listen(read_engine.sync_engine, "connect", set_sqlite_pragmas)
+
+    if snapshot:
+        @event.listens_for(read_engine.sync_engine, "connect")
+        def disable_driver_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(read_engine.sync_engine, "begin")
+        def begin_deferred(conn):
+            conn.exec_driver_sql("BEGIN")
+
+    return read_engine
+
+
+def create_write_engine(path: str) -> AsyncEngine:
+    """
+    Async engine dedicated to the group-commit writer of a database.
+
+    The driver's own transaction handling is switched off so SAVEPOINTs
+    work, and transactions start with BEGIN IMMEDIATE so the write lock
+    is taken up front instead of being upgraded mid-transaction.
+
+    Args:
+        path (str): SQLite file path
+
+    Returns:
+        AsyncEngine: Engine with SQLITE_PRAGMAS applied
+    """
+    write_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    event.listen(write_engine.sync_engine, "connect", set_sqlite_pragmas)
+
+    @event.listens_for(write_engine.sync_engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(write_engine.sync_engine, "begin")
+    def begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return write_engine
+
+
+# Base class for ORM models
+Base = declarative_base()
+
+
+# ==========================================
+# 🗃️ Step 2: SQLAlchemy Model
+# ==========================================
+
+class TodoDB(Base):
+    """
+    SQLAlchemy ORM model for a Todo item.
+    Represents a row in the 'todos' table.
+    """
+    __tablename__ = "todos"
+    # Serves `status` filtering while keeping rows in keyset (tid) order
+    __table_args__ = (Index("ix_todos_status_tid", "status", "tid"),)
+
+    tid = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    task = Column(String, nullable=False)
+    status = Column(Boolean, default=False)
+
+
+# Core table behind TodoDB, used by the single-statement write path
+todos_table = TodoDB.__table__
+TODO_COLUMNS = (todos_table.c.tid, todos_table.c.task, todos_table.c.status)
+
+# FTS5 index over `task`, stored as an external-content table on top of
+# `todos` (rowid = tid) and kept in sync by triggers, so every write path
+# (single, bulk, reset) updates it in the same transaction
+todos_fts = table("todos_fts", column("rowid"), column("todos_fts"))
+
+# Single-row change counter of `todos`, bumped by triggers on every write.
+# Lets several worker processes agree on ETags and notice each other's writes.
+todos_version = table("todos_version", column("epoch"), column("version"))
+
+# Position of the in-memory store's write-behind log (memory_store.py) that
+# has been flushed into `todos`, updated in the same transaction as the rows
+todos_log_state = table("todos_log_state", column("id"), column("lsn"))
+
+# Single-row todo counters, kept exact by triggers in the same transaction
+# as every write, so GET /todos/stats never needs a COUNT(*) scan
+todos_stats = table("todos_stats", column("id"), column("total"), column("done"))
+
+# Idempotency keys of POST /todos with the response they produced, written
+# in the same transaction as the todo (used when keys must outlive a process)
+todos_idempotency = table(
+    "todos_idempotency", column("key"), column("fingerprint"), column("response"), column("created_at"),
+)
+
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts
+       USING fts5(task, content='todos', content_rowid='tid')""",
+    """CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos BEGIN
+           INSERT INTO todos_fts(rowid, task) VALUES (new.tid, new.task);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos BEGIN
+           INSERT INTO todos_fts(todos_fts, rowid, task) VALUES ('delete', old.tid, old.task);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS todos_fts_update AFTER UPDATE OF task ON todos BEGIN
+           INSERT INTO todos_fts(todos_fts, rowid, task) VALUES ('delete', old.tid, old.task);
+           INSERT INTO todos_fts(rowid, task) VALUES (new.tid, new.task);
+       END""",
+]
+
+VERSION_DDL = [
+    """CREATE TABLE IF NOT EXISTS todos_version (
+           id INTEGER PRIMARY KEY CHECK (id = 1),
+           epoch TEXT NOT NULL,
+           version INTEGER NOT NULL
+       )""",
+    "INSERT OR IGNORE INTO todos_version VALUES (1, lower(hex(randomblob(4))), 0)",
+    *(
+        f"""CREATE TRIGGER IF NOT EXISTS todos_version_{action.lower()} AFTER {action} ON todos BEGIN
+                UPDATE todos_version SET version = version + 1 WHERE id = 1;
+            END"""
+        for action in ("INSERT", "UPDATE", "DELETE")
+    ),
+]
+
+LOG_STATE_DDL = [
+    """CREATE TABLE IF NOT EXISTS todos_log_state (
+           id INTEGER PRIMARY KEY CHECK (id = 1),
+           lsn INTEGER NOT NULL
+       )""",
+]
+
+STATS_DDL = [
+    """CREATE TABLE IF NOT EXISTS todos_stats (
+           id INTEGER PRIMARY KEY CHECK (id = 1),
+           total INTEGER NOT NULL,
+           done INTEGER NOT NULL
+       )""",
+    # Backfills the counters of databases created before this table existed
+    "INSERT OR IGNORE INTO todos_stats SELECT 1, COUNT(*), COALESCE(SUM(status), 0) FROM todos",
+    """CREATE TRIGGER IF NOT EXISTS todos_stats_insert AFTER INSERT ON todos BEGIN
+           UPDATE todos_stats SET total = total + 1, done = done + COALESCE(new.status, 0) WHERE id = 1;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS todos_stats_delete AFTER DELETE ON todos BEGIN
+           UPDATE todos_stats SET total = total - 1, done = done - COALESCE(old.status, 0) WHERE id = 1;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS todos_stats_update AFTER UPDATE OF status ON todos BEGIN
+           UPDATE todos_stats SET done = done + COALESCE(new.status, 0) - COALESCE(old.status, 0) WHERE id = 1;
+       END""",
+]
+
+IDEMPOTENCY_DDL = [
+    """CREATE TABLE IF NOT EXISTS todos_idempotency (
+           key TEXT PRIMARY KEY,
+           fingerprint TEXT NOT NULL,
+           response TEXT NOT NULL,
+           created_at REAL NOT NULL
+       )""",
+    "CREATE INDEX IF NOT EXISTS ix_todos_idempotency_created_at ON todos_idempotency (created_at)",
+]
+
+
+def init_schema(conn):
+    """
+    Create the tables, indexes, full-text search, version, counter and
+    idempotency objects if missing.
+
+    Databases already at SCHEMA_VERSION are left alone after a single
+    PRAGMA read. Otherwise indexes are created explicitly so databases
+    made before they were added get them too, and the FTS index is
+    rebuilt from `todos` the first time it is created.
+
+    Args:
+        conn: SQLAlchemy connection, inside a transaction
+    """
+    if conn.exec_driver_sql("PRAGMA user_version").scalar() >= SCHEMA_VERSION:
+        return
+    Base.metadata.create_all(bind=conn)
+    for index in todos_table.indexes:
+        index.create(conn, checkfirst=True)
+    fts_exists = inspect(conn).has_table("todos_fts")
+    for statement in FTS_DDL:
+        conn.execute(text(statement))
+    if not fts_exists:
+        conn.execute(text("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')"))
+    for statement in VERSION_DDL + LOG_STATE_DDL + STATS_DDL + IDEMPOTENCY_DDL:
+        conn.execute(text(statement))
+    conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def migrate(path: str = DATABASE_PATH):
+    """
+    Bring one database file up to SCHEMA_VERSION.
+
+    Run once before starting the server (serve.py does this for every
+    shard) instead of on every import, so workers start without DDL.
+
+    Args:
+        path (str): SQLite file path
+    """
+    migrate_engine = create_engine(f"sqlite:///{path}")
+    event.listen(migrate_engine, "connect", set_sqlite_pragmas)
+    try:
+        with migrate_engine.begin() as conn:
+            init_schema(conn)
+    finally:
+        migrate_engine.dispose()
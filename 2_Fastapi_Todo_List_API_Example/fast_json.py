@@ -0,0 +1,39 @@
+import json
+from typing import Any
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+def encode_json(payload: Any) -> bytes:
+    """
+    Encode plain Python data (dicts, lists, str, int, bool, None) to JSON bytes.
+
+    Uses orjson when installed, otherwise the standard library with
+    compact separators.
+
+    Args:
+        payload (Any): Data to encode
+
+    Returns:
+        bytes: UTF-8 JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response that encodes its content with `encode_json` directly,
+    skipping FastAPI's `jsonable_encoder` pass. Content must already be
+    plain Python data.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
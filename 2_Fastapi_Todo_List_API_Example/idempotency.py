@@ -0,0 +1,144 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Tuple
+
+
+class IdempotencyConflict(ValueError):
+    """
+    Raised when an idempotency key is reused for a different request.
+    """
+
+
+class IdempotencyEntry:
+    """
+    One idempotency key: the request it was first used for, the task that
+    produces (or produced) its response, and when it expires.
+    """
+
+    __slots__ = ("fingerprint", "task", "expires_at")
+
+    def __init__(self, fingerprint: str, task: asyncio.Future):
+        self.fingerprint = fingerprint
+        self.task = task
+        # Entries never expire while their request is still running
+        self.expires_at = math.inf
+
+
+class IdempotencyStore:
+    """
+    Bounded, TTL-expiring map from idempotency keys to responses.
+
+    The first request with a key starts the work as its own task and
+    registers it under the key; a retry arriving while it runs awaits the
+    same task, and a retry arriving later gets the stored result. There
+    is no lock: each key has its own task, so requests with different
+    keys never wait on each other. If the work fails, the key is dropped
+    so the client can retry it.
+
+    Completed entries are evicted least recently used first once there
+    are more than `max_size`; running ones are never evicted.
+    """
+
+    def __init__(self, max_size: int = 100_000, ttl: float = 24 * 3600.0):
+        """
+        Args:
+            max_size (int): Maximum number of remembered keys
+            ttl (float): Seconds a completed key is remembered
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, IdempotencyEntry]" = OrderedDict()
+
+        self.hits = 0
+        self.joins = 0
+        self.misses = 0
+        self.conflicts = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def run(self, key: Hashable, fingerprint: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run `fn` once per key and return its result to every request
+        that uses the key.
+
+        Args:
+            key (Hashable): Idempotency key (scoped by the caller)
+            fingerprint (str): Identifies the request body sent with the key
+            fn (Callable[[], Awaitable[Any]]): Does the work on first use
+
+        Returns:
+            Tuple[Any, bool]: Result of `fn`, and True if it was replayed
+
+        Raises:
+            IdempotencyConflict: If the key was first used with another body
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                self.conflicts += 1
+                raise IdempotencyConflict("Idempotency-Key was already used with a different request")
+            self._entries.move_to_end(key)
+            if entry.task.done():
+                self.hits += 1
+            else:
+                self.joins += 1
+            return await asyncio.shield(entry.task), True
+
+        self.misses += 1
+        # A separate task, so the work finishes (and is remembered) even if
+        # the request that started it is cancelled
+        task = asyncio.ensure_future(fn())
+        entry = IdempotencyEntry(fingerprint, task)
+        self._entries[key] = entry
+        task.add_done_callback(lambda done: self._finish(key, entry))
+        return await asyncio.shield(task), False
+
+    def _finish(self, key: Hashable, entry: IdempotencyEntry):
+        """
+        Keep a successful result for `ttl` seconds; forget failed ones.
+        """
+        if entry.task.cancelled() or entry.task.exception() is not None:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            return
+        entry.expires_at = time.monotonic() + self.ttl
+        self._evict()
+
+    def _evict(self):
+        """
+        Drop the least recently used completed entries over `max_size`.
+        """
+        while len(self._entries) > self.max_size:
+            for key, entry in self._entries.items():
+                if entry.task.done():
+                    break
+            else:
+                return
+            del self._entries[key]
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        Key store counters.
+
+        Returns:
+            dict: Current size, replays of finished and running requests,
+            first uses, conflicts, evictions and expirations
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "joins": self.joins,
+            "misses": self.misses,
+            "conflicts": self.conflicts,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
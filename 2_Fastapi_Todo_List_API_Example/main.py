@@ -1,46 +1,99 @@
+import asyncio
+import base64
+import json
+import os
+import secrets
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
 import uvicorn
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import Column, Integer, String, Boolean, create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy import Row, func, select, insert, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from change_feed import Subscription
+from database import (
+    DATABASE_PATH, TENANT_DIR, TodoDB, TODO_COLUMNS, todos_table, todos_fts, todos_stats, todos_idempotency,
+)
+from fast_json import FastJSONResponse, encode_json
+from idempotency import IdempotencyConflict, IdempotencyStore
+from memory_store import MemoryStore
+from request_log import RequestLog
+from shards import Shard, ShardRouter, TenantPathMiddleware
 
 # ==========================================
-# 🔧 Step 1: Database Setup
+# 🔧 Step 1: Settings
 # ==========================================
 
-# SQLite DB connection string
-DATABASE_URL = "sqlite:///./todo.db"
+# Database setup and the SQLAlchemy model live in database.py
 
-# SQLAlchemy engine and session maker
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# Keyset pagination limits for GET /todos
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
 
-# Base class for ORM models
-Base = declarative_base()
+# Rows fetched per round trip when streaming NDJSON
+STREAM_CHUNK_SIZE = 500
 
+# Read-through cache for GET /todos/{tid} (one per shard)
+TODO_CACHE_SIZE = 10_000
+TODO_CACHE_TTL_SECONDS = 30.0
 
-# ==========================================
-# 🗃️ Step 2: SQLAlchemy Model
-# ==========================================
+# Bulk endpoints: items accepted per request, and IDs bound per IN (...) clause
+MAX_BULK_ITEMS = 50_000
+BULK_ID_CHUNK_SIZE = 500
 
-class TodoDB(Base):
-    """
-    SQLAlchemy ORM model for a Todo item.
-    Represents a row in the 'todos' table.
-    """
-    __tablename__ = "todos"
+# Multi-tenant mode: at most this many tenant SQLite files open at once
+MAX_OPEN_TENANTS = 64
+
+# Worker processes serving the same database files (set by serve.py).
+# With more than one, ETags and cache invalidation follow the database's
+# change counter instead of per-process state.
+WORKERS = int(os.getenv("TODO_WORKERS", "1"))
+
+# Storage mode: "sql" serves todos from SQLite through SQLAlchemy, "memory"
+# serves them from an in-process store that writes behind to SQLite
+STORE_MODE = os.getenv("TODO_STORE", "sql")
+if STORE_MODE not in ("sql", "memory"):
+    raise RuntimeError(f"TODO_STORE must be 'sql' or 'memory', not {STORE_MODE!r}")
+if STORE_MODE == "memory" and WORKERS > 1:
+    raise RuntimeError("TODO_STORE=memory keeps todos inside one process; run a single worker")
+
+# SSE/WebSocket change feed. Events and their IDs live in the process that
+# made the write, so the feed needs a single worker; set TODO_CHANGE_FEED=0
+# to run several.
+CHANGE_FEED = os.getenv("TODO_CHANGE_FEED", "1") == "1"
+if CHANGE_FEED and WORKERS > 1:
+    raise RuntimeError("The change feed only sees one process's writes; run a single worker or set TODO_CHANGE_FEED=0")
+
+# Idempotency-Key on POST /todos: keys are remembered in each process, and
+# also in SQLite (same transaction as the todo) so other workers and
+# restarts see them. SQLite is used by default with several workers.
+IDEMPOTENCY_CACHE_SIZE = 100_000
+IDEMPOTENCY_TTL_SECONDS = 24 * 3600.0
+IDEMPOTENCY_SQLITE = os.getenv("TODO_IDEMPOTENCY_SQLITE", "1" if WORKERS > 1 else "0") == "1"
+
+# JSON request log, written to stdout by a background thread. Fraction of
+# events kept per route (unlisted routes keep all), and lines buffered
+# before new ones are dropped instead of waiting on a slow stdout.
+LOG_SAMPLE_RATES = {"update_todo": 0.1}
+LOG_QUEUE_SIZE = 10_000
 
-    tid = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    task = Column(String, nullable=False)
-    status = Column(Boolean, default=False)
+# Seconds between checks of the todo counters against the table
+STATS_RECONCILE_INTERVAL_SECONDS = 3600.0
 
+# Token required in the X-Admin-Token header by the /admin routes, which
+# act on every tenant. Without it they are disabled.
+ADMIN_TOKEN = os.getenv("TODO_ADMIN_TOKEN")
 
-# Create the database tables if they don't exist
-Base.metadata.create_all(bind=engine)
+# Change feed: idle SSE/WebSocket connections get a keep-alive this often
+FEED_KEEPALIVE_SECONDS = 15.0
 
 
 # ==========================================
-# 🧾 Step 3: Pydantic Response Model
+# 🧾 Step 2: Pydantic Response Model
 # ==========================================
 
 class Todo(BaseModel):
@@ -79,188 +132,1184 @@ class TodoModify(BaseModel):
     is_done: bool
 
 
+class TodoBulkUpdate(BaseModel):
+    """
+    Pydantic model for one item of a bulk task update.
+    """
+    tid: int
+    task: str
+
+
+class TodoBulkModify(BaseModel):
+    """
+    Pydantic model for one item of a bulk status update.
+    """
+    tid: int
+    is_done: bool
+
+
+class BulkResult(BaseModel):
+    """
+    Pydantic model returned by the bulk endpoints.
+    Lists the affected IDs and any requested IDs that did not exist.
+    """
+    ids: List[int]
+    missing: List[int] = []
+
+
+class TodoStats(BaseModel):
+    """
+    Pydantic model for todo counts.
+    """
+    total: int
+    done: int
+    pending: int
+
+
 # ==========================================
-# 🚀 Step 4: FastAPI App Initialization
+# 🚀 Step 3: FastAPI App Initialization
 # ==========================================
 
-app = FastAPI(title="Todo API (Simple Input)")
+# Routes each request to its tenant's SQLite shard (or the default todo.db)
+shard_router = ShardRouter(
+    default_path=DATABASE_PATH,
+    tenant_dir=TENANT_DIR,
+    max_open=MAX_OPEN_TENANTS,
+    cache_size=TODO_CACHE_SIZE,
+    cache_ttl=TODO_CACHE_TTL_SECONDS,
+    shared=WORKERS > 1,
+    memory=STORE_MODE == "memory",
+)
+
+# Runs of the counter reconciliation, and how many found drifted counters
+reconcile_counters = {"runs": 0, "fixed": 0}
+
+# Idempotency keys of POST /todos, scoped by shard name
+idempotency_keys = IdempotencyStore(max_size=IDEMPOTENCY_CACHE_SIZE, ttl=IDEMPOTENCY_TTL_SECONDS)
+
+# Sampled request events, off the event loop
+request_log = RequestLog("todo_api", rates=LOG_SAMPLE_RATES, queue_size=LOG_QUEUE_SIZE)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the default shard with the app, run the counter reconciliation
+    in the background, and drain and close every shard's group-commit
+    writer on shutdown.
+    """
+    await shard_router.start()
+    reconciler = asyncio.create_task(reconcile_stats_periodically())
+    yield
+    reconciler.cancel()
+    await shard_router.stop()
+
+
+app = FastAPI(title="Todo API (Simple Input)", lifespan=lifespan)
+app.add_middleware(TenantPathMiddleware)
 
 
 # ==========================================
-# 🔗 Step 5: Dependency for DB Session
+# 🔗 Step 4: Dependencies for Shard and DB Session
 # ==========================================
 
-def get_db():
+async def get_shard(x_tenant_id: Optional[str] = Header(None)):
     """
-    FastAPI dependency that provides a database session for each request.
+    FastAPI dependency that provides the shard of the request's tenant.
+
+    The tenant comes from the `X-Tenant-ID` header or a `/tenants/<key>/`
+    path prefix; without one the default database is used.
     """
-    db = SessionLocal()
     try:
-        yield db
+        shard = await shard_router.acquire(x_tenant_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        yield shard
     finally:
-        db.close()
+        shard_router.release(shard)
+
+
+async def get_db(shard: Shard = Depends(get_shard)):
+    """
+    FastAPI dependency that provides an async database session for each request.
+
+    Shared shards first sync their table version, so ETag checks and cache
+    reads see writes from other worker processes.
+    """
+    async with shard.read_sessions() as db:
+        if shard.shared:
+            await shard.sync_version(db)
+        yield db
+
+
+async def require_admin(
+        x_admin_token: Optional[str] = Header(None),
+        x_tenant_id: Optional[str] = Header(None),
+):
+    """
+    FastAPI dependency guarding the /admin routes: they need ADMIN_TOKEN
+    in the `X-Admin-Token` header, and are not reachable through a tenant
+    (header or `/tenants/<key>/` prefix), since they act on every tenant.
+    """
+    if x_tenant_id is not None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not ADMIN_TOKEN or not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
 
 
 # ==========================================
-# ⚙️ Step 6: Helper Function
+# ⚙️ Step 5: Helper Function
 # ==========================================
 
-def get_todo_or_404(tid: int, db: Session) -> TodoDB:
+async def get_todo_or_404(tid: int, db: AsyncSession) -> Row:
     """
     Helper to fetch a Todo by ID or raise 404 if not found.
+    Only the (tid, task, status) columns are selected; no ORM object is built.
 
     Args:
         tid (int): Todo ID
-        db (Session): SQLAlchemy session
+        db (AsyncSession): SQLAlchemy async session
 
     Returns:
-        TodoDB: The found Todo object
+        Row: The found todo's (tid, task, status)
     """
-    todo = db.query(TodoDB).filter(TodoDB.tid == tid).first()
+    todo = (await db.execute(select(*TODO_COLUMNS).where(todos_table.c.tid == tid))).first()
     if not todo:
         raise HTTPException(status_code=404, detail="Todo not found")
     return todo
 
 
+async def insert_todo_row(db: AsyncSession, task: str) -> dict:
+    """
+    Insert a todo with a single INSERT ... RETURNING statement.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async session
+        task (str): Task description
+
+    Returns:
+        dict: The created todo
+    """
+    stmt = insert(todos_table).values(task=task, status=False).returning(*TODO_COLUMNS)
+    result = await db.execute(stmt)
+    return result.one()._asdict()
+
+
+async def update_todo_row(db: AsyncSession, tid: int, **values) -> dict:
+    """
+    Update a todo with a single UPDATE ... RETURNING statement.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async session
+        tid (int): Todo ID
+        **values: Column values to set
+
+    Returns:
+        dict: The updated todo
+
+    Raises:
+        HTTPException: 404 if no todo has this ID
+    """
+    stmt = update(todos_table).where(todos_table.c.tid == tid).values(**values).returning(*TODO_COLUMNS)
+    row = (await db.execute(stmt)).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    return row._asdict()
+
+
+async def delete_todo_row(db: AsyncSession, tid: int):
+    """
+    Delete a todo with a single DELETE ... RETURNING statement.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async session
+        tid (int): Todo ID
+
+    Raises:
+        HTTPException: 404 if no todo has this ID
+    """
+    stmt = delete(todos_table).where(todos_table.c.tid == tid).returning(todos_table.c.tid)
+    if (await db.execute(stmt)).first() is None:
+        raise HTTPException(status_code=404, detail="Todo not found")
+
+
+async def find_idempotent_todo(db: AsyncSession, key: str, fingerprint: str) -> Optional[dict]:
+    """
+    Look up the todo created earlier with an idempotency key.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async session
+        key (str): Idempotency-Key header value
+        fingerprint (str): Task text of the current request
+
+    Returns:
+        Optional[dict]: The stored todo, or None if the key is new or expired
+
+    Raises:
+        IdempotencyConflict: If the key was used with a different task
+    """
+    stored = (await db.execute(
+        select(todos_idempotency.c.fingerprint, todos_idempotency.c.response)
+        .where(todos_idempotency.c.key == key)
+        .where(todos_idempotency.c.created_at > time.time() - IDEMPOTENCY_TTL_SECONDS)
+    )).first()
+    if stored is None:
+        return None
+    if stored.fingerprint != fingerprint:
+        raise IdempotencyConflict("Idempotency-Key was already used with a different request")
+    return json.loads(stored.response)
+
+
+async def create_todo_once(shard: Shard, task: str, idempotency_key: Optional[str]) -> Tuple[dict, bool]:
+    """
+    Create a todo and publish the change. With IDEMPOTENCY_SQLITE and a
+    key, the key is checked and stored in the todo's own transaction, so
+    a key seen by any worker returns the todo created then.
+
+    Args:
+        shard (Shard): Database shard of the request's tenant
+        task (str): Task description
+        idempotency_key (Optional[str]): Idempotency-Key header value
+
+    Returns:
+        Tuple[dict, bool]: The todo, and True if it was created earlier
+    """
+    if shard.store is not None:
+        new_todo = (await shard.store.create([task]))[0]
+    elif idempotency_key is None or not IDEMPOTENCY_SQLITE:
+        async def op(db: AsyncSession) -> dict:
+            return await insert_todo_row(db, task)
+
+        new_todo = await shard.write_queue.submit(op)
+    else:
+        # Replays are answered from a read, without going through the writer
+        async with shard.read_sessions() as db:
+            stored = await find_idempotent_todo(db, idempotency_key, task)
+        if stored is not None:
+            return stored, True
+
+        async def op(db: AsyncSession) -> Tuple[dict, bool]:
+            stored = await find_idempotent_todo(db, idempotency_key, task)
+            if stored is not None:
+                return stored, True
+            created = await insert_todo_row(db, task)
+            now = time.time()
+            await db.execute(delete(todos_idempotency).where(todos_idempotency.c.created_at <= now - IDEMPOTENCY_TTL_SECONDS))
+            await db.execute(insert(todos_idempotency).prefix_with("OR REPLACE").values(
+                key=idempotency_key, fingerprint=task, response=encode_json(created).decode(), created_at=now,
+            ))
+            return created, False
+
+        new_todo, replayed = await shard.write_queue.submit(op)
+        if replayed:
+            return new_todo, True
+    shard.changed("created", new_todo["tid"], todo=new_todo)
+    return new_todo, False
+
+
+async def update_store_todo(store: MemoryStore, tid: int, **values) -> dict:
+    """
+    Memory-mode counterpart of `update_todo_row`.
+
+    Args:
+        store (MemoryStore): Store of the request's shard
+        tid (int): Todo ID
+        **values: Column values to set
+
+    Returns:
+        dict: The updated todo
+
+    Raises:
+        HTTPException: 404 if no todo has this ID
+    """
+    updated = await store.update([(tid, values)])
+    if not updated:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    return updated[0]
+
+
+def bulk_store_result(requested: List[int], changed: List[int]) -> BulkResult:
+    """
+    BulkResult for a memory-mode bulk write.
+
+    Args:
+        requested (List[int]): IDs in the request, in request order
+        changed (List[int]): IDs the store changed
+
+    Returns:
+        BulkResult: Changed IDs and requested IDs that were not found
+    """
+    changed_set = set(changed)
+    return BulkResult(ids=changed, missing=[tid for tid in requested if tid not in changed_set])
+
+
+def chunked(items: list, size: int) -> Iterator[list]:
+    """
+    Split a list into consecutive slices of at most `size` items.
+
+    Args:
+        items (list): Items to split
+        size (int): Maximum slice length
+
+    Yields:
+        list: Next slice of items
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def check_bulk_size(items: list):
+    """
+    Reject empty or oversized bulk payloads.
+
+    Args:
+        items (list): Items of the bulk request
+
+    Raises:
+        HTTPException: 422 if empty, 413 if larger than MAX_BULK_ITEMS
+    """
+    if not items:
+        raise HTTPException(status_code=422, detail="Bulk request must not be empty")
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} items per bulk request")
+
+
+async def find_existing_tids(tids: List[int], db: AsyncSession) -> set:
+    """
+    Return the subset of `tids` that exist, querying in IN (...) chunks.
+
+    Args:
+        tids (List[int]): Todo IDs to look up
+        db (AsyncSession): SQLAlchemy async session
+
+    Returns:
+        set: IDs present in the table
+    """
+    existing = set()
+    for chunk in chunked(list(set(tids)), BULK_ID_CHUNK_SIZE):
+        result = await db.scalars(select(TodoDB.tid).where(TodoDB.tid.in_(chunk)))
+        existing.update(result)
+    return existing
+
+
+def search_words(q: str) -> List[str]:
+    """
+    Split search text into the words every matching todo must contain.
+
+    Args:
+        q (str): Search text
+
+    Returns:
+        List[str]: Words of `q`
+
+    Raises:
+        HTTPException: 422 if `q` contains no words
+    """
+    words = q.split()
+    if not words:
+        raise HTTPException(status_code=422, detail="Search text must not be blank")
+    return words
+
+
+def build_fts_query(q: str) -> str:
+    """
+    Turn free text into an FTS5 query that matches todos containing every
+    word, quoting each word so FTS5 operators in user input are ignored.
+
+    Args:
+        q (str): Search text
+
+    Returns:
+        str: FTS5 MATCH expression
+    """
+    return " ".join('"' + word.replace('"', '""') + '"' for word in search_words(q))
+
+
+def todo_filters(after_tid: int, status: Optional[bool], q: Optional[str]) -> list:
+    """
+    WHERE clauses shared by the paged and streamed listings.
+
+    Args:
+        after_tid (int): Only todos with a greater ID are returned
+        status (Optional[bool]): Only todos with this status, if given
+        q (Optional[str]): Full-text search on `task`, if given
+
+    Returns:
+        list: SQLAlchemy boolean expressions
+    """
+    filters = [todos_table.c.tid > after_tid]
+    if status is not None:
+        filters.append(todos_table.c.status == status)
+    if q is not None:
+        matching = select(todos_fts.c.rowid).where(todos_fts.c.todos_fts.match(build_fts_query(q)))
+        filters.append(todos_table.c.tid.in_(matching))
+    return filters
+
+
+def encode_cursor(tid: int) -> str:
+    """
+    Encode the last seen todo ID as an opaque pagination cursor.
+
+    Args:
+        tid (int): ID of the last todo on the current page
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    raw = json.dumps({"tid": tid}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a pagination cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Cursor token sent by the client
+
+    Returns:
+        int: ID after which the next page starts
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        tid = json.loads(base64.urlsafe_b64decode(padded.encode()))["tid"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if type(tid) is not int:  # bool is an int subclass; {"tid": true} is not a cursor
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return tid
+
+
+async def stream_todos_ndjson(
+        sessions: async_sessionmaker,
+        filters: list,
+        limit: Optional[int],
+) -> AsyncIterator[bytes]:
+    """
+    Yield todos as NDJSON lines straight off the database cursor.
+
+    Uses its own session so the connection stays open for the whole
+    response, and fetches rows in chunks so memory stays flat.
+
+    Args:
+        sessions (async_sessionmaker): Session factory of the shard to read
+        filters (list): WHERE clauses built by `todo_filters`
+        limit (Optional[int]): Maximum number of rows, or None for all
+
+    Yields:
+        bytes: One JSON-encoded todo per line
+    """
+    stmt = (
+        select(*TODO_COLUMNS)
+        .where(*filters)
+        .order_by(todos_table.c.tid)
+        .limit(limit)
+        .execution_options(yield_per=STREAM_CHUNK_SIZE)
+    )
+    async with sessions() as db:
+        result = await db.stream(stmt)
+        async for tid, task, status in result:
+            yield encode_json({"tid": tid, "task": task, "status": status}) + b"\n"
+
+
+async def stream_store_ndjson(
+        store: MemoryStore,
+        after_tid: int,
+        status: Optional[bool],
+        words: Optional[List[str]],
+        limit: Optional[int],
+) -> AsyncIterator[bytes]:
+    """
+    Yield todos of a memory store as NDJSON lines, STREAM_CHUNK_SIZE rows
+    at a time, resuming after the last sent ID so concurrent writes are
+    never skipped or repeated.
+
+    Args:
+        store (MemoryStore): Store of the shard to read
+        after_tid (int): Only todos with a greater ID are returned
+        status (Optional[bool]): Only todos with this status, if given
+        words (Optional[List[str]]): Only todos containing all these words
+        limit (Optional[int]): Maximum number of rows, or None for all
+
+    Yields:
+        bytes: One JSON-encoded todo per line
+    """
+    while limit is None or limit > 0:
+        chunk = STREAM_CHUNK_SIZE if limit is None else min(limit, STREAM_CHUNK_SIZE)
+        rows = store.rows(after_tid, status, words, chunk)
+        if not rows:
+            break
+        yield b"".join(encode_json({"tid": tid, "task": task, "status": done}) + b"\n" for tid, task, done in rows)
+        after_tid = rows[-1][0]
+        if limit is not None:
+            limit -= len(rows)
+
+
+async def stream_events_sse(shard: Shard, subscription: Subscription) -> AsyncIterator[bytes]:
+    """
+    Yield change-feed events as Server-Sent Event frames, with a comment
+    line as keep-alive when nothing happened for a while.
+
+    The stream ends after a `lagged` event; the client reconnects with
+    the last event ID it saw.
+
+    Args:
+        shard (Shard): Shard whose feed the subscription belongs to
+        subscription (Subscription): Subscriber queue
+
+    Returns:
+        AsyncIterator[bytes]: SSE frames
+    """
+    try:
+        while True:
+            event = await subscription.get(FEED_KEEPALIVE_SECONDS)
+            if event is None:
+                yield b": keep-alive\n\n"
+                continue
+            frame = b"event: " + event["type"].encode() + b"\ndata: " + encode_json(event) + b"\n\n"
+            if "id" in event:
+                frame = b"id: " + event["id"].encode() + b"\n" + frame
+            yield frame
+            if event["type"] == "lagged":
+                break
+    finally:
+        shard.feed.unsubscribe(subscription)
+
+
+async def reconcile_stats(shard: Shard) -> dict:
+    """
+    Check one shard's todo counters against a real count of the table and
+    correct them if they drifted.
+
+    Runs as a single write-queue operation, so the count and the counters
+    are read in the same transaction as writers see them.
+
+    Args:
+        shard (Shard): Shard to check
+
+    Returns:
+        dict: Counted and stored totals, and whether they were corrected
+    """
+    async def op(db: AsyncSession) -> dict:
+        total, done = (await db.execute(
+            select(func.count(), func.count().filter(todos_table.c.status.is_(True)))
+        )).one()
+        stored_total, stored_done = (await db.execute(select(todos_stats.c.total, todos_stats.c.done))).one()
+        fixed = (total, done) != (stored_total, stored_done)
+        if fixed:
+            await db.execute(update(todos_stats).where(todos_stats.c.id == 1).values(total=total, done=done))
+        return {
+            "total": total,
+            "done": done,
+            "stored_total": stored_total,
+            "stored_done": stored_done,
+            "fixed": fixed,
+        }
+
+    result = await shard.write_queue.submit(op)
+    reconcile_counters["runs"] += 1
+    reconcile_counters["fixed"] += result["fixed"]
+    return result
+
+
+async def reconcile_stats_periodically():
+    """
+    Reconcile the counters of the default shard and every open tenant
+    shard every STATS_RECONCILE_INTERVAL_SECONDS. Closed tenants, also
+    those evicted while the job runs, are left alone so the job never
+    opens shards; use POST /admin/reconcile/stats for a full run.
+    """
+    while True:
+        await asyncio.sleep(STATS_RECONCILE_INTERVAL_SECONDS)
+        for tenant in [None, *shard_router.open_tenants()]:
+            shard = shard_router.acquire_if_open(tenant)
+            if shard is None:
+                continue
+            try:
+                await reconcile_stats(shard)
+            except Exception:
+                # A failed check is retried on the next run
+                pass
+            finally:
+                shard_router.release(shard)
+
+
+async def reset_shard(shard: Shard):
+    """
+    Delete every todo of one shard through its writer.
+
+    Args:
+        shard (Shard): Shard to reset
+    """
+    if shard.store is not None:
+        await shard.store.reset()
+    else:
+        async def op(db: AsyncSession):
+            await db.execute(delete(todos_table))
+
+        await shard.write_queue.submit(op)
+    shard.changed("reset")
+
+
 # ==========================================
-# 📡 Step 7: API Routes
+# 📡 Step 6: API Routes
 # ==========================================
 
 @app.get("/", tags=["Root"])
-def root():
+async def root():
     """
     Root endpoint to verify API is running.
     """
     return {"message": "Welcome to the simple Todo API"}
 
 
-@app.post("/todos", tags=["Todos"])
-def create_todo(task: TodoCreate, db: Session = Depends(get_db)):
+@app.post("/todos", tags=["Todos"], response_model=Todo)
+async def create_todo(
+        task: TodoCreate,
+        response: Response,
+        idempotency_key: Optional[str] = Header(None, max_length=255),
+        shard: Shard = Depends(get_shard),
+):
     """
     Create a new todo item.
 
+    With an `Idempotency-Key` header, retries of the same request return
+    the todo created the first time (with `Idempotent-Replayed: true`)
+    instead of creating another one; concurrent retries wait for the
+    first request. Reusing a key with a different task is a 422.
+
     Args:
         task (str): Task description
-        db (Session): Database session
+        response (Response): Outgoing response, for the replay header
+        idempotency_key (Optional[str]): Client-chosen key for safe retries
+        shard (Shard): Database shard of the request's tenant
 
     Returns:
-        TodoDB: Created todo object
+        dict: Created todo
     """
-    new_todo = TodoDB(task=task.task)
-    db.add(new_todo)
-    db.commit()
-    db.refresh(new_todo)
+    if idempotency_key is None:
+        new_todo, _ = await create_todo_once(shard, task.task, None)
+        return new_todo
+
+    try:
+        (new_todo, stored), replayed = await idempotency_keys.run(
+            (shard.name, idempotency_key),
+            task.task,
+            lambda: create_todo_once(shard, task.task, idempotency_key),
+        )
+    except IdempotencyConflict as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if replayed or stored:
+        response.headers["Idempotent-Replayed"] = "true"
     return new_todo
 
 
-@app.get("/todos", tags=["Todos"])
-def get_all_todos(db: Session = Depends(get_db)):
+@app.get("/todos", tags=["Todos"], response_model=List[Todo])
+async def get_all_todos(
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        after: Optional[str] = None,
+        status: Optional[bool] = None,
+        q: Optional[str] = Query(None, max_length=200),
+        stream: bool = False,
+        if_none_match: Optional[str] = Header(None),
+        shard: Shard = Depends(get_shard),
+        db: AsyncSession = Depends(get_db),
+):
     """
-    Retrieve all todo items.
+    Retrieve todo items one page at a time, ordered by ID.
+
+    Rows are selected as plain (tid, task, status) tuples and encoded
+    straight to JSON bytes, without building ORM objects. `status`
+    filters through an index and `q` searches `task` through the FTS5
+    index; both combine with the cursor and with each other.
+
+    The next page is fetched by passing the `X-Next-Cursor` response
+    header back as `after`; the header is absent on the last page.
+    With `stream=true` the todos are sent as NDJSON instead, and
+    `limit` is only applied when given. If the client's `If-None-Match`
+    still matches the table version, a 304 is returned without querying.
+    In memory mode the rows come from the shard's store instead of SQLite.
 
     Args:
-        db (Session): Database session
+        limit (Optional[int]): Page size (defaults to DEFAULT_PAGE_SIZE)
+        after (Optional[str]): Cursor returned by the previous page
+        status (Optional[bool]): Only return done (true) or pending (false) todos
+        q (Optional[str]): Only return todos whose task contains all these words
+        stream (bool): Stream all remaining todos as NDJSON
+        if_none_match (Optional[str]): ETag of the client's cached copy
+        shard (Shard): Database shard of the request's tenant
+        db (AsyncSession): Database session
 
     Returns:
-        List[TodoDB]: All todos
+        List[Todo]: One page of todos
     """
-    return db.query(TodoDB).all()
+    if shard.version.matches(if_none_match):
+        return shard.version.not_modified()
+    # Taken before reading, so the ETag is never newer than the rows
+    validators = shard.version.headers()
+    after_tid = decode_cursor(after) if after else 0
+
+    if shard.store is not None:
+        words = search_words(q) if q is not None else None
+        if stream:
+            return StreamingResponse(
+                stream_store_ndjson(shard.store, after_tid, status, words, limit),
+                media_type="application/x-ndjson",
+                headers=validators,
+            )
+        limit = limit or DEFAULT_PAGE_SIZE
+        rows = shard.store.rows(after_tid, status, words, limit + 1)
+        if len(rows) > limit:
+            rows = rows[:limit]
+            validators["X-Next-Cursor"] = encode_cursor(rows[-1][0])
+        todos = [{"tid": tid, "task": task, "status": done} for tid, task, done in rows]
+        return FastJSONResponse(todos, headers=validators)
+
+    filters = todo_filters(after_tid, status, q)
+    if stream:
+        return StreamingResponse(
+            stream_todos_ndjson(shard.read_sessions, filters, limit),
+            media_type="application/x-ndjson",
+            headers=validators,
+        )
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    result = await db.execute(
+        select(*TODO_COLUMNS)
+        .where(*filters)
+        .order_by(todos_table.c.tid)
+        .limit(limit + 1)
+    )
+    rows = result.all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        validators["X-Next-Cursor"] = encode_cursor(rows[-1].tid)
+    todos = [{"tid": tid, "task": task, "status": status} for tid, task, status in rows]
+    return FastJSONResponse(todos, headers=validators)
+
+
+@app.get("/todos/stats", tags=["Todos"], response_model=TodoStats)
+async def get_todo_stats(
+        if_none_match: Optional[str] = Header(None),
+        shard: Shard = Depends(get_shard),
+        db: AsyncSession = Depends(get_db),
+):
+    """
+    Count all, done and pending todos.
+
+    The counts come from counters that every write keeps up to date in
+    its own transaction, so no COUNT(*) scan is run. Answers 304 if the
+    client's `If-None-Match` matches the table version.
 
+    Args:
+        if_none_match (Optional[str]): ETag of the client's cached copy
+        shard (Shard): Database shard of the request's tenant
+        db (AsyncSession): Database session
 
-@app.get("/todos/{tid}", tags=["Todos"])
-def get_todo(tid: int, db: Session = Depends(get_db)):
+    Returns:
+        TodoStats: Total, done and pending counts
     """
-    Retrieve a specific todo by ID.
+    if shard.version.matches(if_none_match):
+        return shard.version.not_modified()
+    validators = shard.version.headers()
+
+    if shard.store is not None:
+        total, done = shard.store.counts()
+    else:
+        total, done = (await db.execute(select(todos_stats.c.total, todos_stats.c.done))).one()
+    return FastJSONResponse({"total": total, "done": done, "pending": total - done}, headers=validators)
+
+
+@app.post("/todos/bulk", tags=["Bulk"], response_model=BulkResult)
+async def bulk_create_todos(tasks: List[TodoCreate], shard: Shard = Depends(get_shard)):
+    """
+    Create many todo items in a single transaction.
+
+    Rows are inserted with one executemany-style INSERT ... RETURNING,
+    so no per-row refresh is needed to learn the new IDs.
 
     Args:
-        tid (int): Todo ID
-        db (Session): Database session
+        tasks (List[TodoCreate]): Task descriptions
+        shard (Shard): Database shard of the request's tenant
+
+    Returns:
+        BulkResult: IDs of the created todos, in request order
+    """
+    check_bulk_size(tasks)
+
+    if shard.store is not None:
+        created = await shard.store.create([task.task for task in tasks])
+        result = BulkResult(ids=[todo["tid"] for todo in created])
+    else:
+        async def op(db: AsyncSession) -> BulkResult:
+            result = await db.execute(
+                insert(TodoDB).returning(TodoDB.tid, sort_by_parameter_order=True),
+                [{"task": task.task, "status": False} for task in tasks],
+            )
+            return BulkResult(ids=list(result.scalars()))
+
+        result = await shard.write_queue.submit(op)
+    shard.changed("created", *result.ids)
+    return result
+
+
+@app.put("/todos/bulk", tags=["Bulk"], response_model=BulkResult)
+async def bulk_update_todos(items: List[TodoBulkUpdate], shard: Shard = Depends(get_shard)):
+    """
+    Update the task text of many todos in a single transaction.
+    Like `update_todo`, each updated todo has its status reset to False.
+
+    Args:
+        items (List[TodoBulkUpdate]): Todo IDs and their new task text
+        shard (Shard): Database shard of the request's tenant
+
+    Returns:
+        BulkResult: Updated IDs and IDs that were not found
+    """
+    check_bulk_size(items)
+
+    if shard.store is not None:
+        updated = await shard.store.update([(item.tid, {"task": item.task, "status": False}) for item in items])
+        result = bulk_store_result([item.tid for item in items], [todo["tid"] for todo in updated])
+    else:
+        async def op(db: AsyncSession) -> BulkResult:
+            existing = await find_existing_tids([item.tid for item in items], db)
+            rows = [{"tid": item.tid, "task": item.task, "status": False} for item in items if item.tid in existing]
+            if rows:
+                await db.execute(update(TodoDB), rows)
+            return BulkResult(
+                ids=[row["tid"] for row in rows],
+                missing=[item.tid for item in items if item.tid not in existing],
+            )
+
+        result = await shard.write_queue.submit(op)
+    shard.changed("updated", *result.ids)
+    return result
+
+
+@app.patch("/todos/bulk", tags=["Bulk"], response_model=BulkResult)
+async def bulk_patch_status(items: List[TodoBulkModify], shard: Shard = Depends(get_shard)):
+    """
+    Update the status of many todos in a single transaction.
+
+    Args:
+        items (List[TodoBulkModify]): Todo IDs and their new status
+        shard (Shard): Database shard of the request's tenant
+
+    Returns:
+        BulkResult: Updated IDs and IDs that were not found
+    """
+    check_bulk_size(items)
+
+    if shard.store is not None:
+        updated = await shard.store.update([(item.tid, {"status": item.is_done}) for item in items])
+        result = bulk_store_result([item.tid for item in items], [todo["tid"] for todo in updated])
+    else:
+        async def op(db: AsyncSession) -> BulkResult:
+            existing = await find_existing_tids([item.tid for item in items], db)
+            rows = [{"tid": item.tid, "status": item.is_done} for item in items if item.tid in existing]
+            if rows:
+                await db.execute(update(TodoDB), rows)
+            return BulkResult(
+                ids=[row["tid"] for row in rows],
+                missing=[item.tid for item in items if item.tid not in existing],
+            )
+
+        result = await shard.write_queue.submit(op)
+    shard.changed("patched", *result.ids)
+    return result
+
+
+@app.delete("/todos/bulk", tags=["Bulk"], response_model=BulkResult)
+async def bulk_delete_todos(tids: List[int], shard: Shard = Depends(get_shard)):
+    """
+    Delete many todos in a single transaction.
+
+    Args:
+        tids (List[int]): IDs of the todos to delete
+        shard (Shard): Database shard of the request's tenant
+
+    Returns:
+        BulkResult: Deleted IDs and IDs that were not found
+    """
+    check_bulk_size(tids)
+
+    if shard.store is not None:
+        deleted = await shard.store.delete(tids)
+        result = bulk_store_result(tids, sorted(deleted))
+    else:
+        async def op(db: AsyncSession) -> BulkResult:
+            deleted = []
+            for chunk in chunked(list(set(tids)), BULK_ID_CHUNK_SIZE):
+                result = await db.execute(delete(TodoDB).where(TodoDB.tid.in_(chunk)).returning(TodoDB.tid))
+                deleted.extend(result.scalars())
+            deleted_set = set(deleted)
+            return BulkResult(ids=sorted(deleted), missing=[tid for tid in tids if tid not in deleted_set])
+
+        result = await shard.write_queue.submit(op)
+    shard.changed("deleted", *result.ids)
+    return result
+
+
+@app.get("/todos/events", tags=["Change Feed"])
+async def todo_events(
+        after: Optional[str] = Query(None, description="ID of the last event seen"),
+        last_event_id: Optional[str] = Header(None),
+        shard: Shard = Depends(get_shard),
+):
+    """
+    Stream committed todo mutations as Server-Sent Events.
+
+    Reconnecting clients are replayed every event after the one named by
+    the `Last-Event-ID` header (sent automatically by EventSource) or the
+    `after` query parameter.
+
+    Args:
+        after (Optional[str]): ID of the last event seen
+        last_event_id (Optional[str]): Same, as sent by EventSource
+        shard (Shard): Database shard of the request's tenant
 
     Returns:
-        TodoDB: Retrieved todo object
+        StreamingResponse: text/event-stream of change events
     """
-    return get_todo_or_404(tid, db)
+    if not CHANGE_FEED:
+        raise HTTPException(status_code=404, detail="Change feed is disabled")
+    subscription = shard.feed.subscribe(last_event_id or after)
+    return StreamingResponse(
+        stream_events_sse(shard, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.websocket("/todos/ws")
+async def todo_events_ws(
+        websocket: WebSocket,
+        after: Optional[str] = Query(None, description="ID of the last event seen"),
+        shard: Shard = Depends(get_shard),
+):
+    """
+    Push committed todo mutations to a WebSocket client as JSON messages.
+
+    Args:
+        websocket (WebSocket): Client connection
+        after (Optional[str]): ID of the last event seen, to resume from
+        shard (Shard): Database shard of the request's tenant
+    """
+    if not CHANGE_FEED:
+        await websocket.close(code=1008)  # Policy violation: the feed is disabled
+        return
+    await websocket.accept()
+    subscription = shard.feed.subscribe(after)
+    try:
+        while True:
+            event = await subscription.get(FEED_KEEPALIVE_SECONDS)
+            if event is None:
+                await websocket.send_text(encode_json({"type": "ping"}).decode())
+                continue
+            await websocket.send_text(encode_json(event).decode())
+            if event["type"] == "lagged":
+                await websocket.close()
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        shard.feed.unsubscribe(subscription)
+
+
+@app.get("/todos/{tid}", tags=["Todos"], response_model=Todo)
+async def get_todo(
+        tid: int,
+        if_none_match: Optional[str] = Header(None),
+        shard: Shard = Depends(get_shard),
+        db: AsyncSession = Depends(get_db),
+):
+    """
+    Retrieve a specific todo by ID.
+    Answers 304 if the client's `If-None-Match` matches the table version.
 
+    Args:
+        tid (int): Todo ID
+        if_none_match (Optional[str]): ETag of the client's cached copy
+        shard (Shard): Database shard of the request's tenant
+        db (AsyncSession): Database session
 
-@app.put("/todos/{tid}", tags=["Todos"])
-def update_todo(tid: int, task: TodoUpdate, db: Session = Depends(get_db)):
+    Returns:
+        Todo: Retrieved todo
+    """
+    # The todo may not exist, so `*` is only honoured after the lookup
+    if shard.version.matches(if_none_match, exists=False):
+        return shard.version.not_modified()
+    validators = shard.version.headers()
+
+    if shard.store is not None:
+        todo = shard.store.get(tid)
+        if todo is None:
+            raise HTTPException(status_code=404, detail="Todo not found")
+        if shard.version.matches(if_none_match):
+            return shard.version.not_modified()
+        return FastJSONResponse(todo, headers=validators)
+
+    cached = shard.cache.get(tid)
+    if cached is None:
+        token = shard.cache.token()
+        todo = await get_todo_or_404(tid, db)
+        cached = (todo.task, todo.status)
+        shard.cache.put(tid, cached, token)
+    if shard.version.matches(if_none_match):
+        return shard.version.not_modified()
+    task, status = cached
+    return FastJSONResponse({"tid": tid, "task": task, "status": status}, headers=validators)
+
+
+@app.put("/todos/{tid}", tags=["Todos"], response_model=Todo)
+async def update_todo(tid: int, task: TodoUpdate, shard: Shard = Depends(get_shard)):
     """
     Update task text of an existing todo. Resets status to False.
 
     Args:
         tid (int): Todo ID
         task (str): New task text
-        db (Session): Database session
+        shard (Shard): Database shard of the request's tenant
 
     Returns:
-        TodoDB: Updated todo object
-    """
-    todo = get_todo_or_404(tid, db)
-    print(task.task)
-    todo.task = task.task
-    todo.status = False
-    db.commit()
-    db.refresh(todo)
+        dict: Updated todo
+    """
+    if shard.store is not None:
+        todo = await update_store_todo(shard.store, tid, task=task.task, status=False)
+    else:
+        async def op(db: AsyncSession) -> dict:
+            return await update_todo_row(db, tid, task=task.task, status=False)
+
+        todo = await shard.write_queue.submit(op)
+    request_log.info("update_todo", "todo updated", shard=shard.name, tid=tid, task=task.task)
+    shard.changed("updated", tid, todo=todo)
     return todo
 
 
-@app.patch("/todos/{tid}", tags=["Todos"])
-def patch_status(tid: int, is_done: TodoModify, db: Session = Depends(get_db)):
+@app.patch("/todos/{tid}", tags=["Todos"], response_model=Todo)
+async def patch_status(tid: int, is_done: TodoModify, shard: Shard = Depends(get_shard)):
     """
     Update only the status of a todo (done or pending).
 
     Args:
         tid (int): Todo ID
         is_done (bool): True if done, False if pending
-        db (Session): Database session
+        shard (Shard): Database shard of the request's tenant
 
     Returns:
-        TodoDB: Updated todo object
+        dict: Updated todo
     """
-    todo = get_todo_or_404(tid, db)
-    todo.status = is_done.is_done
-    db.commit()
-    db.refresh(todo)
+    if shard.store is not None:
+        todo = await update_store_todo(shard.store, tid, status=is_done.is_done)
+    else:
+        async def op(db: AsyncSession) -> dict:
+            return await update_todo_row(db, tid, status=is_done.is_done)
+
+        todo = await shard.write_queue.submit(op)
+    shard.changed("patched", tid, todo=todo)
     return todo
 
 
 @app.delete("/todos/{tid}", tags=["Todos"])
-def delete_todo(tid: int, db: Session = Depends(get_db)):
+async def delete_todo(tid: int, shard: Shard = Depends(get_shard)):
     """
     Delete a specific todo by ID.
 
     Args:
         tid (int): Todo ID
-        db (Session): Database session
+        shard (Shard): Database shard of the request's tenant
 
     Returns:
         dict: Success message
     """
-    todo = get_todo_or_404(tid, db)
-    db.delete(todo)
-    db.commit()
+    if shard.store is not None:
+        if not await shard.store.delete([tid]):
+            raise HTTPException(status_code=404, detail="Todo not found")
+    else:
+        async def op(db: AsyncSession):
+            await delete_todo_row(db, tid)
+
+        await shard.write_queue.submit(op)
+    shard.changed("deleted", tid)
     return {"message": "Todo deleted successfully"}
 
 
 @app.delete("/reset/todos", tags=["Todos"])
-def reset_todos(db: Session = Depends(get_db)):
+async def reset_todos(shard: Shard = Depends(get_shard)):
     """
     Delete all todos in the database.
 
     Args:
-        db (Session): Database session
+        shard (Shard): Database shard of the request's tenant
 
     Returns:
         dict: Success message
     """
-    db.query(TodoDB).delete()
-    db.commit()
+    await reset_shard(shard)
     return {"message": "All todos have been deleted"}
 
 
+@app.delete("/admin/reset/todos", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def reset_all_shards():
+    """
+    Delete all todos of every tenant and of the default database,
+    resetting the shards in parallel.
+
+    Returns:
+        dict: Success message and the names of the reset shards
+    """
+    results = await shard_router.fan_out(reset_shard)
+    return {"message": "All todos have been deleted in every shard", "shards": sorted(results)}
+
+
+@app.post("/admin/reconcile/stats", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def reconcile_all_stats():
+    """
+    Check the todo counters of every shard against the table, correcting
+    any that drifted.
+
+    Returns:
+        dict: Shard name -> counted and stored totals
+    """
+    return await shard_router.fan_out(reconcile_stats)
+
+
+@app.get("/metrics", tags=["Metrics"])
+async def metrics(shard: Shard = Depends(get_shard)):
+    """
+    Runtime metrics of the serving worker process: the request's shard
+    (group-commit writer, todo cache, memory store and change feed) and the shard LRU.
+
+    Args:
+        shard (Shard): Database shard of the request's tenant
+
+    Returns:
+        dict: Batch size and commit latency figures, cache, feed and shard counters
+    """
+    return {
+        "worker": os.getpid(),
+        "shard": shard.name,
+        "write_queue": shard.write_queue.stats(),
+        "todo_cache": shard.cache.stats(),
+        "memory_store": shard.store.stats() if shard.store is not None else None,
+        "change_feed": shard.feed.stats(),
+        "stats_reconcile": reconcile_counters,
+        "idempotency": idempotency_keys.stats(),
+        "request_log": request_log.stats(),
+        "shards": shard_router.stats(),
+    }
+
+
 # ==========================================
-# 🚦 Step 8: Run with Uvicorn (Dev Mode)
+# 🚦 Step 7: Run with Uvicorn (Dev Mode)
 # ==========================================
 
+# For production (several workers, no reload) use serve.py instead
+
 if __name__ == '__main__':
     uvicorn.run("main:app", host="0.0.0.0", port=8181, reload=True)
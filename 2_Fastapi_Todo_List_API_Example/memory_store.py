@@ -0,0 +1,534 @@
+import asyncio
+import glob
+import json
+import os
+import re
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from database import TODO_COLUMNS, todos_log_state, todos_table
+from write_queue import WriteQueue
+
+# IDs bound per DELETE ... IN (...) when flushing deletes
+DELETE_CHUNK_SIZE = 500
+
+# Same word split as the FTS5 unicode61 tokenizer, close enough for search
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def task_words(task: str) -> set:
+    """
+    Lower-cased words of a task, for matching search terms.
+    """
+    return set(WORD_PATTERN.findall(task.lower()))
+
+
+class MemoryStore:
+    """
+    Write-behind, in-memory copy of one shard's todos.
+
+    Tasks live in a dict keyed by `tid`, alongside a sorted list of IDs
+    for keyset paging and a bitmap with one status bit per ID. Reads are
+    answered from memory without touching SQLite.
+
+    Every mutation is applied in memory, appended to an append-only log
+    and acknowledged once the log write is fsynced; concurrent mutations
+    share one fsync. A background task flushes logged records into the
+    `todos` table in batches through the shard's writer, together with
+    the log position (LSN) they reach, and then deletes the log segments
+    that are fully in SQLite. On startup the store loads `todos` and
+    replays every logged record past the stored LSN.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            write_queue: WriteQueue,
+            flush_interval: float = 0.5,
+            fsync: bool = True,
+    ):
+        """
+        Args:
+            path (str): SQLite file path; log segments are `<path>.log.<n>`
+            write_queue (WriteQueue): Shard writer used to flush into SQLite
+            flush_interval (float): Seconds between flushes into SQLite
+            fsync (bool): fsync the log before acknowledging a mutation
+        """
+        self.log_prefix = f"{path}.log."
+        self.write_queue = write_queue
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+
+        self._tasks: Dict[int, str] = {}
+        self._tids: List[int] = []
+        self._done = bytearray()
+        self._done_count = 0
+        self._next_tid = 1
+
+        self._lsn = 0
+        self._flushed_lsn = 0
+        self._pending: List[dict] = []
+        self._waiters: List[asyncio.Future] = []
+        self._unflushed: List[dict] = []
+        self._segments: List[str] = []
+        self._log = None
+        self._failed: Optional[BaseException] = None
+
+        self._log_lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+        self.log_writes = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.records_flushed = 0
+        self.flush_ms_last = 0.0
+
+    async def open(self, read_sessions: async_sessionmaker):
+        """
+        Load the todos from SQLite, replay the log on top and start the
+        log writer and flusher tasks.
+
+        Args:
+            read_sessions (async_sessionmaker): Session factory to load with
+        """
+        async with read_sessions() as db:
+            self._flushed_lsn = (await db.execute(select(todos_log_state.c.lsn))).scalar() or 0
+            result = await db.stream(select(*TODO_COLUMNS).order_by(todos_table.c.tid).execution_options(yield_per=10_000))
+            async for tid, task, status in result:
+                self._insert(tid, task, status)
+        self._lsn = self._flushed_lsn
+
+        for segment in self._existing_segments():
+            for record in self._read_segment(segment):
+                if record["lsn"] > self._flushed_lsn:
+                    self._apply(record)
+                    self._unflushed.append(record)
+                    self._lsn = max(self._lsn, record["lsn"])
+            self._segments.append(segment)
+
+        self._log_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._open_segment()
+        self._writer = asyncio.create_task(self._write_loop())
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """
+        Write out pending records, flush everything into SQLite and stop.
+        """
+        if self._writer is None:
+            return
+        self._pending.append(None)
+        self._wakeup.set()
+        await self._writer
+        self._stopping.set()
+        await self._flusher
+        self._log.close()
+        if not self._unflushed:
+            # Everything is in SQLite, so no segment is needed on restart
+            for path in self._segments:
+                os.remove(path)
+            self._segments = []
+        self._writer = self._flusher = None
+
+    def get(self, tid: int) -> Optional[dict]:
+        """
+        Look up one todo.
+
+        Returns:
+            Optional[dict]: The todo, or None if there is none with this ID
+        """
+        task = self._tasks.get(tid)
+        if task is None:
+            return None
+        return {"tid": tid, "task": task, "status": self._is_done(tid)}
+
+    def counts(self) -> Tuple[int, int]:
+        """
+        Number of todos and of done todos, kept up to date by every write.
+
+        Returns:
+            Tuple[int, int]: (total, done)
+        """
+        return len(self._tasks), self._done_count
+
+    def rows(
+            self,
+            after_tid: int,
+            status: Optional[bool],
+            words: Optional[List[str]],
+            limit: Optional[int],
+    ) -> List[Tuple[int, str, bool]]:
+        """
+        Todos after `after_tid` in ID order, with the same filters as the
+        SQL listing.
+
+        Args:
+            after_tid (int): Only todos with a greater ID are returned
+            status (Optional[bool]): Only todos with this status, if given
+            words (Optional[List[str]]): Only todos containing all these words
+            limit (Optional[int]): Maximum number of rows, or None for all
+
+        Returns:
+            List[Tuple[int, str, bool]]: (tid, task, status) tuples
+        """
+        wanted = task_words(" ".join(words)) if words else None
+        rows = []
+        for i in range(bisect_right(self._tids, after_tid), len(self._tids)):
+            if limit is not None and len(rows) >= limit:
+                break
+            tid = self._tids[i]
+            done = self._is_done(tid)
+            if status is not None and done != status:
+                continue
+            task = self._tasks[tid]
+            if wanted and not wanted <= task_words(task):
+                continue
+            rows.append((tid, task, done))
+        return rows
+
+    async def create(self, tasks: List[str]) -> List[dict]:
+        """
+        Create todos and wait until they are logged.
+
+        Args:
+            tasks (List[str]): Task descriptions
+
+        Returns:
+            List[dict]: The created todos, in order
+        """
+        self._check_writable()
+        todos, records = [], []
+        for task in tasks:
+            tid = self._next_tid
+            self._insert(tid, task, False)
+            todos.append({"tid": tid, "task": task, "status": False})
+            records.append(self._record("create", tid=tid, task=task))
+        await self._append(records)
+        return todos
+
+    async def update(self, changes: List[Tuple[int, dict]]) -> List[dict]:
+        """
+        Set `task` and/or `status` of existing todos and wait until logged.
+        Changes for IDs that do not exist are skipped.
+
+        Args:
+            changes (List[Tuple[int, dict]]): (tid, {column: value}) pairs
+
+        Returns:
+            List[dict]: The updated todos, one per applied change
+        """
+        self._check_writable()
+        todos, records = [], []
+        for tid, values in changes:
+            if tid not in self._tasks:
+                continue
+            record = self._record("update", tid=tid, **values)
+            self._apply(record)
+            todos.append(self.get(tid))
+            records.append(record)
+        await self._append(records)
+        return todos
+
+    async def delete(self, tids: List[int]) -> List[int]:
+        """
+        Delete todos and wait until logged. Unknown IDs are skipped.
+
+        Args:
+            tids (List[int]): IDs of the todos to delete
+
+        Returns:
+            List[int]: IDs that were deleted, each once
+        """
+        self._check_writable()
+        deleted, records = [], []
+        for tid in dict.fromkeys(tids):
+            if tid not in self._tasks:
+                continue
+            self._remove(tid)
+            deleted.append(tid)
+            records.append(self._record("delete", tid=tid))
+        await self._append(records)
+        return deleted
+
+    async def reset(self):
+        """
+        Delete every todo and wait until logged.
+        """
+        self._check_writable()
+        record = self._record("reset")
+        self._apply(record)
+        await self._append([record])
+
+    def _is_done(self, tid: int) -> bool:
+        """
+        Read the status bit of a todo.
+        """
+        byte = tid >> 3
+        return byte < len(self._done) and bool(self._done[byte] & (1 << (tid & 7)))
+
+    def _set_done(self, tid: int, done: bool):
+        """
+        Write the status bit of a todo, growing the bitmap as needed.
+        """
+        if done == self._is_done(tid):
+            return
+        byte = tid >> 3
+        if byte >= len(self._done):
+            self._done.extend(bytes(byte + 1 - len(self._done)))
+        self._done[byte] ^= 1 << (tid & 7)
+        self._done_count += 1 if done else -1
+
+    def _insert(self, tid: int, task: str, done: bool):
+        """
+        Add or replace a todo; new IDs are almost always the largest yet.
+        """
+        if tid not in self._tasks:
+            if not self._tids or tid > self._tids[-1]:
+                self._tids.append(tid)
+            else:
+                insort(self._tids, tid)
+        self._tasks[tid] = task
+        self._set_done(tid, done)
+        self._next_tid = max(self._next_tid, tid + 1)
+
+    def _remove(self, tid: int):
+        """
+        Drop a todo from the dict, the ID list and the bitmap.
+        """
+        del self._tasks[tid]
+        del self._tids[bisect_left(self._tids, tid)]
+        self._set_done(tid, False)
+
+    def _apply(self, record: dict):
+        """
+        Apply one log record to memory; also used when replaying the log.
+        """
+        op, tid = record["op"], record.get("tid")
+        if op == "create":
+            self._insert(tid, record["task"], False)
+        elif op == "update" and tid in self._tasks:
+            if "task" in record:
+                self._tasks[tid] = record["task"]
+            if "status" in record:
+                self._set_done(tid, record["status"])
+        elif op == "delete" and tid in self._tasks:
+            self._remove(tid)
+        elif op == "reset":
+            self._tasks.clear()
+            self._tids.clear()
+            self._done = bytearray()
+            self._done_count = 0
+            self._next_tid = 1
+
+    def _check_writable(self):
+        """
+        Refuse mutations after a failed log write.
+        """
+        if self._failed is not None:
+            raise RuntimeError("Memory store log failed; restart to recover") from self._failed
+
+    def _record(self, op: str, **fields) -> dict:
+        """
+        Build a log record with the next LSN.
+        """
+        self._lsn += 1
+        return {"lsn": self._lsn, "op": op, **fields}
+
+    def _append(self, records: List[dict]) -> asyncio.Future:
+        """
+        Queue records for the log writer; the returned future resolves
+        once they are durable.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        if not records:
+            waiter.set_result(None)
+            return waiter
+        self._pending.extend(records)
+        self._waiters.append(waiter)
+        self._wakeup.set()
+        return waiter
+
+    async def _write_loop(self):
+        """
+        Write queued records to the current segment, one fsync per group.
+        A None record (queued by `close`) stops the loop.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            records, waiters = self._pending, self._waiters
+            self._pending, self._waiters = [], []
+            stopping = None in records
+            records = [record for record in records if record is not None]
+
+            if records:
+                data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records).encode()
+                try:
+                    async with self._log_lock:
+                        await loop.run_in_executor(None, self._write, data)
+                        self._unflushed.extend(records)
+                    self.log_writes += 1
+                except Exception as exc:
+                    # Memory is now ahead of the log; refuse further writes
+                    self._failed = exc
+                    for waiter in waiters:
+                        waiter.set_exception(exc)
+                    waiters = []
+                for waiter in waiters:
+                    waiter.set_result(None)
+            if stopping:
+                break
+
+    def _write(self, data: bytes):
+        """
+        Append to the current segment; runs in a worker thread.
+        """
+        self._log.write(data)
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+
+    def _existing_segments(self) -> List[str]:
+        """
+        Log segments left on disk, oldest first.
+        """
+        segments = glob.glob(glob.escape(self.log_prefix) + "*")
+        return sorted((path for path in segments if path[len(self.log_prefix):].isdigit()),
+                      key=lambda path: int(path[len(self.log_prefix):]))
+
+    def _open_segment(self):
+        """
+        Start a new log segment; later writes go there.
+        """
+        number = int(self._segments[-1][len(self.log_prefix):]) + 1 if self._segments else 1
+        if self._log is not None:
+            self._log.close()
+        path = f"{self.log_prefix}{number:08d}"
+        self._log = open(path, "ab")
+        self._segments.append(path)
+
+    @staticmethod
+    def _read_segment(path: str) -> List[dict]:
+        """
+        Records of one segment, stopping at a torn last line.
+        """
+        records = []
+        with open(path, "rb") as segment:
+            for line in segment:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+        return records
+
+    async def _flush_loop(self):
+        """
+        Flush every `flush_interval` seconds, and a last time on close.
+        """
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception:
+                # Records stay queued (and in the log) and are retried next time
+                pass
+
+    async def flush(self):
+        """
+        Write every logged record into SQLite in one transaction, then
+        delete the log segments it covered.
+        """
+        async with self._log_lock:
+            if not self._unflushed:
+                return
+            records, self._unflushed = self._unflushed, []
+            covered = self._segments[:]
+            self._open_segment()
+
+        started = time.perf_counter()
+        try:
+            await self.write_queue.submit(lambda db: self._flush_records(db, records))
+        except Exception:
+            self.failed_flushes += 1
+            self._unflushed[:0] = records
+            raise
+        self.flush_ms_last = (time.perf_counter() - started) * 1000
+        self.flushes += 1
+        self.records_flushed += len(records)
+        self._flushed_lsn = records[-1]["lsn"]
+
+        for path in covered:
+            os.remove(path)
+        self._segments = [path for path in self._segments if path not in covered]
+
+    @staticmethod
+    async def _flush_records(db: AsyncSession, records: List[dict]):
+        """
+        Replay records against `todos`, grouping consecutive records of the
+        same kind into one executemany, and store the LSN reached.
+        """
+        i = 0
+        while i < len(records):
+            op, keys = records[i]["op"], records[i].keys()
+            j = i + 1
+            while j < len(records) and records[j]["op"] == op and records[j].keys() == keys:
+                j += 1
+            group = records[i:j]
+            if op == "create":
+                await db.execute(insert(todos_table), [
+                    {"tid": r["tid"], "task": r["task"], "status": False} for r in group
+                ])
+            elif op == "update":
+                columns = [key for key in ("task", "status") if key in keys]
+                await db.execute(
+                    update(todos_table)
+                    .where(todos_table.c.tid == bindparam("b_tid"))
+                    .values({column: bindparam(f"b_{column}") for column in columns}),
+                    [{"b_tid": r["tid"], **{f"b_{column}": r[column] for column in columns}} for r in group],
+                )
+            elif op == "delete":
+                tids = [r["tid"] for r in group]
+                for start in range(0, len(tids), DELETE_CHUNK_SIZE):
+                    await db.execute(delete(todos_table).where(todos_table.c.tid.in_(tids[start:start + DELETE_CHUNK_SIZE])))
+            elif op == "reset":
+                await db.execute(delete(todos_table))
+            i = j
+        await db.execute(
+            text("INSERT INTO todos_log_state (id, lsn) VALUES (1, :lsn) "
+                 "ON CONFLICT(id) DO UPDATE SET lsn = excluded.lsn"),
+            {"lsn": records[-1]["lsn"]},
+        )
+
+    def stats(self) -> dict:
+        """
+        Store size and write-behind progress.
+
+        Returns:
+            dict: Todo counts, log position, backlog and flush counters
+        """
+        return {
+            "todos": len(self._tasks),
+            "done": self._done_count,
+            "lsn": self._lsn,
+            "flushed_lsn": self._flushed_lsn,
+            "unflushed": len(self._unflushed) + len(self._pending),
+            "log_segments": len(self._segments),
+            "log_writes": self.log_writes,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "records_flushed": self.records_flushed,
+            "flush_ms_last": self.flush_ms_last,
+        }
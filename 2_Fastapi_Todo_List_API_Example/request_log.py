@@ -0,0 +1,181 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, TextIO
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+RECORD_ATTRIBUTES = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message and the
+    record's `extra=` fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class RouteSampler(logging.Filter):
+    """
+    Per-route sampling on the record's `route` field. Warnings and errors
+    always pass.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, default_rate: float = 1.0):
+        """
+        Args:
+            rates (Optional[Dict[str, float]]): Route -> fraction of records kept
+            default_rate (float): Fraction kept for routes without a rate
+        """
+        super().__init__()
+        self.rates = dict(rates or {})
+        self.default_rate = default_rate
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(getattr(record, "route", None), self.default_rate)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that never waits: on a full queue the record is dropped
+    and counted, so a stalled stdout can never stall the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.queued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting is left to the writer thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        else:
+            self.queued += 1
+
+
+class RequestLog:
+    """
+    Sampled JSON request log written by a background thread.
+
+    A route handler only pays for the sampling check and a `put_nowait`;
+    the writer thread formats the records and writes them to `stream`.
+    Each process starts its own writer on first use, so gunicorn workers
+    forked from a preloaded app do not share the master's queue.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            rates: Optional[Dict[str, float]] = None,
+            default_rate: float = 1.0,
+            queue_size: int = 10_000,
+            stream: Optional[TextIO] = None,
+    ):
+        """
+        Args:
+            name (str): Logger name
+            rates (Optional[Dict[str, float]]): Route -> fraction of records kept
+            default_rate (float): Fraction kept for routes without a rate
+            queue_size (int): Records buffered before new ones are dropped
+            stream (Optional[TextIO]): Destination of the JSON lines (default stdout)
+        """
+        self.queue_size = queue_size
+        self.sampler = RouteSampler(rates, default_rate)
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        self.handler.addFilter(self.sampler)
+
+        self.writer = logging.StreamHandler(stream or sys.stdout)
+        self.writer.setFormatter(JSONFormatter())
+        self.listener: Optional[QueueListener] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+
+    def _start(self):
+        """
+        Start the writer thread of the current process on a fresh queue.
+        """
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.handler.queue = queue.Queue(maxsize=self.queue_size)
+            self.listener = QueueListener(self.handler.queue, self.writer)
+            self.listener.start()
+            self._pid = os.getpid()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """
+        Drain the queue and stop the writer thread.
+        """
+        with self._lock:
+            if self.listener is not None and self._pid == os.getpid():
+                try:
+                    self.listener.stop()
+                except queue.Full:
+                    pass  # No room for the stop marker; the daemon thread ends with the process
+            self.listener = None
+            self._pid = None
+
+    def info(self, route: str, msg: str, **fields):
+        """
+        Log one event of a route.
+
+        Args:
+            route (str): Route name, used for sampling
+            msg (str): Event message
+            **fields: Extra JSON fields
+        """
+        if self._pid != os.getpid():
+            self._start()
+        self.logger.info(msg, extra=dict(fields, route=route))
+
+    def stats(self) -> dict:
+        """
+        Request log counters.
+
+        Returns:
+            dict: Records queued, dropped on a full queue, sampled out, and still waiting
+        """
+        return {
+            "queued": self.handler.queued,
+            "dropped": self.handler.dropped,
+            "sampled_out": self.sampler.sampled_out,
+            "backlog": self.handler.queue.qsize(),
+        }
@@ -0,0 +1,95 @@
+import os
+
+from gunicorn.app.base import BaseApplication
+
+# ==========================================
+# 🔧 Step 1: Server Settings
+# ==========================================
+
+# Every setting can be overridden with an environment variable
+BIND = os.getenv("TODO_BIND", "0.0.0.0:8181")
+# One worker by default: the change feed (and TODO_STORE=memory) live in a
+# single process. More workers need TODO_CHANGE_FEED=0.
+WORKERS = int(os.getenv("TODO_WORKERS", "1"))
+
+# Pending connections the kernel queues before refusing new ones
+BACKLOG = int(os.getenv("TODO_BACKLOG", "2048"))
+
+# Seconds an idle keep-alive connection stays open
+KEEPALIVE_SECONDS = int(os.getenv("TODO_KEEPALIVE", "5"))
+
+# Seconds a worker gets to finish in-flight requests on restart/shutdown
+GRACEFUL_TIMEOUT_SECONDS = int(os.getenv("TODO_GRACEFUL_TIMEOUT", "30"))
+
+# Import the app once in the master and fork workers from it
+PRELOAD = os.getenv("TODO_PRELOAD", "1") == "1"
+
+# main.py reads this to switch shards to cross-process ETags / cache invalidation
+os.environ["TODO_WORKERS"] = str(WORKERS)
+
+
+# ==========================================
+# 🗄️ Step 2: One-Time Schema Migration
+# ==========================================
+
+def migrate_all():
+    """
+    Bring the default database and every tenant database on disk up to
+    date before any worker starts, so workers never run DDL themselves.
+
+    Only database.py and shards.py are imported here, so without
+    preloading the workers still import the app themselves.
+    """
+    from database import DATABASE_PATH, TENANT_DIR, migrate
+    from shards import ShardRouter
+
+    router = ShardRouter(default_path=DATABASE_PATH, tenant_dir=TENANT_DIR)
+    for path in [DATABASE_PATH, *map(router.tenant_path, router.tenants())]:
+        migrate(path)
+
+
+# ==========================================
+# 🚀 Step 3: Gunicorn Application
+# ==========================================
+
+class TodoServer(BaseApplication):
+    """
+    Gunicorn master running the Todo API in uvicorn workers.
+
+    Send SIGHUP to the master for a graceful restart of all workers,
+    SIGTTIN/SIGTTOU to add/remove a worker, and SIGTERM to shut down
+    after in-flight requests finish.
+    """
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from main import app
+        return app
+
+
+def main():
+    migrate_all()
+    TodoServer({
+        "bind": BIND,
+        "workers": WORKERS,
+        "worker_class": "uvicorn_worker.UvicornWorker",
+        "backlog": BACKLOG,
+        "keepalive": KEEPALIVE_SECONDS,
+        "graceful_timeout": GRACEFUL_TIMEOUT_SECONDS,
+        "preload_app": PRELOAD,
+    }).run()
+
+
+# ==========================================
+# ▶️ Entry Point
+# ==========================================
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+import asyncio
+import os
+import re
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from change_feed import ChangeFeed
+from database import create_read_engine, create_write_engine, init_schema, todos_version
+from memory_store import MemoryStore
+from table_version import TableVersion
+from todo_cache import TodoCache
+from write_queue import WriteQueue
+
+# Name of the shard used without a tenant key
+DEFAULT_SHARD_NAME = "default"
+
+# Tenant keys double as file names, so only allow a safe character set.
+# They also name their shard, so the default shard's name is reserved.
+TENANT_KEY_PATTERN = re.compile(rf"^(?!{DEFAULT_SHARD_NAME}$)[A-Za-z0-9_-]{{1,64}}$")
+
+# Header and path prefix that select a tenant
+TENANT_HEADER = "x-tenant-id"
+TENANT_PATH_PREFIX = "/tenants/"
+
+
+async def read_version(db: AsyncSession) -> tuple:
+    """
+    The database's (epoch, version) change counter.
+    """
+    return tuple((await db.execute(select(todos_version.c.epoch, todos_version.c.version))).one())
+
+
+class Shard:
+    """
+    One SQLite database together with everything bound to it: the read
+    and write engines, the group-commit writer, the single-todo cache,
+    the table version behind the ETags and the change feed.
+
+    A `shared` shard is one that other worker processes write to as well.
+    Its table version then follows the database's change counter, and
+    `sync_version()` must run at the start of every read.
+
+    With `memory=True` the shard also holds a write-behind MemoryStore
+    (`store`) that serves all todo reads and writes; SQLite is then only
+    written by the store's flusher.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            path: str,
+            cache_size: int,
+            cache_ttl: float,
+            shared: bool = False,
+            memory: bool = False,
+    ):
+        """
+        Args:
+            name (str): Tenant key, or DEFAULT_SHARD_NAME
+            path (str): SQLite file path
+            cache_size (int): Maximum todos kept in the cache
+            cache_ttl (float): Seconds a cached todo stays valid
+            shared (bool): True if other processes write to the same file
+            memory (bool): Serve todos from an in-memory write-behind store
+        """
+        self.name = name
+        self.path = path
+        self.shared = shared
+        # Shared shards read the version and the rows in one snapshot
+        self.read_engine = create_read_engine(path, snapshot=shared)
+        self.read_sessions = async_sessionmaker(bind=self.read_engine, autoflush=False, expire_on_commit=False)
+        self.write_engine = create_write_engine(path)
+        self.write_sessions = async_sessionmaker(bind=self.write_engine, autoflush=False, expire_on_commit=False)
+
+        # Every mutation goes through this queue and is committed in groups.
+        # Shared shards read the change counter around every batch to tell
+        # their own writes from other processes'.
+        if shared:
+            self.write_queue = WriteQueue(self.write_sessions, probe=read_version, on_commit=self.committed)
+        else:
+            self.write_queue = WriteQueue(self.write_sessions)
+        # Single-todo lookups are served from here; writers invalidate after commit
+        self.cache = TodoCache(max_size=cache_size, ttl=cache_ttl)
+        # Bumped on every committed mutation; drives ETag / If-None-Match handling
+        self.version = TableVersion()
+        # Committed mutations, pushed to SSE/WebSocket subscribers
+        self.feed = ChangeFeed()
+        # In-memory todos, flushed to SQLite in the background (memory mode only)
+        self.store = MemoryStore(path, self.write_queue) if memory else None
+
+        # Requests currently using this shard; busy shards are never evicted
+        self.users = 0
+
+    async def open(self):
+        """
+        Create the schema if needed and start the writer (and load the
+        memory store).
+        """
+        async with self.write_engine.begin() as conn:
+            await conn.run_sync(init_schema)
+        await self.write_queue.start()
+        if self.store is not None:
+            await self.store.open(self.read_sessions)
+
+    async def close(self):
+        """
+        Commit pending writes, stop the writer and close all connections.
+        """
+        if self.store is not None:
+            await self.store.close()
+        await self.write_queue.stop()
+        await self.read_engine.dispose()
+        await self.write_engine.dispose()
+
+    def changed(self, event_type: str, *tids: int, todo: Optional[dict] = None):
+        """
+        Bookkeeping after a mutation has been committed: invalidate the
+        cached todos, bump the table version so ETags change, and publish
+        the change to feed subscribers.
+
+        Args:
+            event_type (str): created, updated, patched, deleted or reset
+            *tids (int): IDs of the affected todos
+            todo (Optional[dict]): New state of a single changed todo
+        """
+        if event_type == "reset":
+            self.cache.clear()
+        else:
+            self.cache.invalidate(*tids)
+        if not self.shared:
+            self.version.bump()
+        self.feed.publish(event_type, tids, todo)
+
+    def committed(self, before: tuple, after: tuple):
+        """
+        After a batch of this process's writes committed on a shared shard:
+        if the change counter stood where this process last saw it when
+        the batch began (BEGIN IMMEDIATE holds off other writers), every
+        change up to `after` is this process's own, and the callers have
+        already invalidated the todos they changed. Adopt `after` so the
+        next `sync_version` does not drop the whole cache for them.
+
+        Args:
+            before (tuple): (epoch, version) at the start of the batch
+            after (tuple): (epoch, version) just before its commit
+        """
+        if before == (self.version.epoch, self.version.version):
+            self.version.sync(*after)
+
+    async def sync_version(self, db: AsyncSession):
+        """
+        Pick up writes made by other processes: adopt the database's change
+        counter and drop the cache if it moved. Only needed for shared shards;
+        this process's own writes were already adopted by `committed`.
+
+        Shared shards' read sessions begin with an explicit BEGIN (see
+        `create_read_engine`), so the version read here is from the same
+        snapshot as every later query in `db`.
+
+        Args:
+            db (AsyncSession): Session the request reads with
+        """
+        epoch, version = await read_version(db)
+        if self.version.sync(epoch, version):
+            self.cache.clear()
+
+
+class ShardRouter:
+    """
+    Maps tenant keys to their own SQLite shard (`<tenant_dir>/<key>.db`).
+
+    Shards are opened lazily on first use and kept in an LRU. When more
+    than `max_open` tenant shards are open, the least recently used idle
+    ones are closed; shards still serving a request are skipped, so the
+    cap can be exceeded briefly under load, until they are released. Requests without a tenant key
+    use the always-open default shard.
+
+    Shards are only created in `start()`, inside the serving process, so
+    nothing bound to them is inherited by forked workers.
+    """
+
+    def __init__(
+            self,
+            default_path: str,
+            tenant_dir: str,
+            max_open: int = 64,
+            cache_size: int = 10_000,
+            cache_ttl: float = 30.0,
+            shared: bool = False,
+            memory: bool = False,
+    ):
+        """
+        Args:
+            default_path (str): SQLite file used without a tenant key
+            tenant_dir (str): Directory holding one SQLite file per tenant
+            max_open (int): Tenant shards kept open at once
+            cache_size (int): Per-shard cache size
+            cache_ttl (float): Per-shard cache TTL in seconds
+            shared (bool): True if several worker processes serve the same files
+            memory (bool): Give every shard an in-memory write-behind store
+        """
+        self.default_path = default_path
+        self.tenant_dir = tenant_dir
+        self.max_open = max_open
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.shared = shared
+        self.memory = memory
+
+        self.default: Optional[Shard] = None
+        self._open: "OrderedDict[str, Shard]" = OrderedDict()
+        self._opening: Dict[str, asyncio.Task] = {}
+        self._closing: Dict[str, asyncio.Task] = {}
+        self._evicting: Optional[asyncio.Task] = None
+
+        self.opened = 0
+        self.evicted = 0
+
+    async def start(self):
+        """
+        Open the default shard.
+        """
+        self.default = Shard(DEFAULT_SHARD_NAME, self.default_path, self.cache_size, self.cache_ttl, self.shared, self.memory)
+        await self.default.open()
+
+    async def stop(self):
+        """
+        Close every open shard.
+        """
+        shards = [self.default, *self._open.values()]
+        self._open.clear()
+        evicting = [self._evicting] if self._evicting is not None else []
+        await asyncio.gather(*(shard.close() for shard in shards), *self._closing.values(), *evicting)
+
+    async def acquire(self, tenant: Optional[str]) -> Shard:
+        """
+        Return the shard for a tenant, opening it if needed, and mark it busy.
+        Every call must be paired with `release`.
+
+        Args:
+            tenant (Optional[str]): Tenant key, or None for the default shard
+
+        Returns:
+            Shard: The tenant's shard
+
+        Raises:
+            ValueError: If the tenant key is not allowed
+        """
+        if tenant is None:
+            shard = self.default
+        else:
+            if not TENANT_KEY_PATTERN.match(tenant):
+                raise ValueError(f"Invalid tenant key: {tenant!r}")
+            while True:
+                shard = self._open.get(tenant)
+                if shard is not None:
+                    self._open.move_to_end(tenant)
+                    break
+                shard = await self._open_shard(tenant)
+                # Evicted again before this request resumed: open it once more
+                if self._open.get(tenant) is shard:
+                    break
+        shard.users += 1
+        return shard
+
+    def acquire_if_open(self, tenant: Optional[str]) -> Optional[Shard]:
+        """
+        Like `acquire`, but never opens a shard: returns None if the
+        tenant's shard is not open right now.
+        """
+        shard = self.default if tenant is None else self._open.get(tenant)
+        if shard is not None:
+            shard.users += 1
+        return shard
+
+    def release(self, shard: Shard):
+        """
+        Mark a shard returned by `acquire` as no longer used by the caller,
+        and evict in the background if busy shards kept the LRU over its cap.
+        """
+        shard.users -= 1
+        if shard.users == 0 and len(self._open) > self.max_open and self._evicting is None:
+            self._evicting = asyncio.get_running_loop().create_task(self._evict())
+            self._evicting.add_done_callback(self._evicted)
+
+    def _evicted(self, task: asyncio.Task):
+        """
+        Done callback of the eviction started by `release`.
+        """
+        self._evicting = None
+
+    async def _open_shard(self, tenant: str) -> Shard:
+        """
+        Open a tenant shard once, even if many requests ask for it at the same time.
+        """
+        task = self._opening.get(tenant)
+        if task is None:
+            task = asyncio.create_task(self._create_shard(tenant))
+            self._opening[tenant] = task
+            task.add_done_callback(lambda _: self._opening.pop(tenant, None))
+        return await asyncio.shield(task)
+
+    async def _create_shard(self, tenant: str) -> Shard:
+        """
+        Create and open a tenant shard, then evict idle shards over the cap.
+
+        If the tenant's previous shard is still being closed, that close
+        finishes first, so two shards never use the same file at once.
+        """
+        closing = self._closing.get(tenant)
+        if closing is not None:
+            await asyncio.wait([closing])
+        os.makedirs(self.tenant_dir, exist_ok=True)
+        shard = Shard(tenant, self.tenant_path(tenant), self.cache_size, self.cache_ttl, self.shared, self.memory)
+        await shard.open()
+        self._open[tenant] = shard
+        self.opened += 1
+        # Busy while evicting, so the shard just opened is never the one closed
+        shard.users += 1
+        try:
+            await self._evict()
+        finally:
+            shard.users -= 1
+        return shard
+
+    async def _evict(self):
+        """
+        Close least recently used idle tenant shards until under the cap.
+
+        The LRU is rescanned after every close, since requests may have
+        acquired or released shards meanwhile.
+        """
+        while len(self._open) > self.max_open:
+            name = next((name for name, shard in self._open.items() if shard.users == 0), None)
+            if name is None:
+                return
+            shard = self._open.pop(name)
+            self.evicted += 1
+            task = asyncio.create_task(shard.close())
+            self._closing[name] = task
+            task.add_done_callback(lambda _, name=name: self._closing.pop(name, None))
+            await asyncio.shield(task)
+
+    def open_tenants(self) -> List[str]:
+        """
+        Tenants whose shard is currently open, least recently used first.
+        """
+        return list(self._open)
+
+    def tenant_path(self, tenant: str) -> str:
+        """
+        SQLite file path of a tenant shard.
+        """
+        return os.path.join(self.tenant_dir, f"{tenant}.db")
+
+    def tenants(self) -> List[str]:
+        """
+        Every tenant that has a shard on disk, open or not.
+        """
+        if not os.path.isdir(self.tenant_dir):
+            return []
+        names = (entry[:-3] for entry in os.listdir(self.tenant_dir) if entry.endswith(".db"))
+        return sorted(name for name in names if TENANT_KEY_PATTERN.match(name))
+
+    async def fan_out(self, fn: Callable[[Shard], Awaitable], concurrency: int = 8) -> Dict[str, object]:
+        """
+        Run `fn` against the default shard and every tenant shard in parallel.
+
+        At most `concurrency` shards are worked on at once, so fanning out
+        over many tenants does not open all of them together.
+
+        Args:
+            fn (Callable[[Shard], Awaitable]): Coroutine function taking a shard
+            concurrency (int): Maximum shards processed at the same time
+
+        Returns:
+            dict: Shard name -> result of `fn`
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(tenant: Optional[str]):
+            async with semaphore:
+                shard = await self.acquire(tenant)
+                try:
+                    return shard.name, await fn(shard)
+                finally:
+                    self.release(shard)
+
+        results = await asyncio.gather(run(None), *(run(tenant) for tenant in self.tenants()))
+        return dict(results)
+
+    def stats(self) -> dict:
+        """
+        Shard LRU metrics.
+
+        Returns:
+            dict: Open tenant shards, cap, and open/evict counters
+        """
+        return {
+            "shared": self.shared,
+            "memory": self.memory,
+            "open_tenants": len(self._open),
+            "max_open": self.max_open,
+            "opened": self.opened,
+            "evicted": self.evicted,
+        }
+
+
+class TenantPathMiddleware:
+    """
+    ASGI middleware that turns a `/tenants/<key>/...` path prefix into the
+    tenant header, so `/tenants/acme/todos` is routed like `/todos` with
+    `X-Tenant-ID: acme`. A path prefix wins over a header sent as well.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and scope["path"].startswith(TENANT_PATH_PREFIX):
+            tenant, _, rest = scope["path"][len(TENANT_PATH_PREFIX):].partition("/")
+            headers = [(key, value) for key, value in scope["headers"] if key != TENANT_HEADER.encode()]
+            headers.append((TENANT_HEADER.encode(), tenant.encode()))
+            scope = dict(scope, path="/" + rest, headers=headers)
+        await self.app(scope, receive, send)
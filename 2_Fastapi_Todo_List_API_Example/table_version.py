@@ -0,0 +1,102 @@
+import secrets
+import time
+from email.utils import formatdate
+from typing import Optional
+
+from fastapi import Response
+
+
+class TableVersion:
+    """
+    Monotonically increasing version of the todos table, used for ETags.
+
+    Every committed mutation calls `bump()`. Readers compare the client's
+    `If-None-Match` against the current ETag before touching the database,
+    and answer 304 straight away when nothing changed. The ETag includes a
+    random per-process epoch, so a restart (which resets the counter)
+    never makes an old ETag match again.
+
+    With several worker processes, the counter kept in the database
+    (`todos_version`) is the source of truth instead, and each worker
+    copies it with `sync()` so all of them hand out the same ETags.
+    """
+
+    def __init__(self):
+        self.epoch = secrets.token_hex(4)
+        self.version = 0
+        self.modified_at = time.time()
+
+    def bump(self):
+        """
+        Record that the table changed.
+        """
+        self.version += 1
+        self.modified_at = time.time()
+
+    def sync(self, epoch: str, version: int) -> bool:
+        """
+        Adopt the epoch and version stored in the database.
+
+        Args:
+            epoch (str): Database epoch
+            version (int): Database change counter
+
+        Returns:
+            bool: True if the table changed since the last sync
+        """
+        if epoch == self.epoch and version == self.version:
+            return False
+        self.epoch = epoch
+        self.version = version
+        self.modified_at = time.time()
+        return True
+
+    @property
+    def etag(self) -> str:
+        """
+        Weak ETag for the current version.
+        """
+        return f'W/"{self.epoch}-{self.version}"'
+
+    def headers(self) -> dict:
+        """
+        Cache validator headers for the current version.
+
+        Returns:
+            dict: ETag and Last-Modified
+        """
+        return {
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.modified_at, usegmt=True),
+        }
+
+    def matches(self, if_none_match: Optional[str], exists: bool = True) -> bool:
+        """
+        Check an If-None-Match header against the current ETag.
+
+        `*` matches any current representation, so it only counts once the
+        resource is known to exist; pass `exists=False` before that.
+
+        Args:
+            if_none_match (Optional[str]): Raw header value
+            exists (bool): False if the resource may not exist
+
+        Returns:
+            bool: True if the client's copy is still current
+        """
+        if not if_none_match:
+            return False
+        current = self.etag[2:]  # compare without the weak prefix
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if (candidate == "*" and exists) or candidate == current:
+                return True
+        return False
+
+    def not_modified(self) -> Response:
+        """
+        Build an empty 304 response carrying the current validators.
+        """
+        return Response(status_code=304, headers=self.headers())
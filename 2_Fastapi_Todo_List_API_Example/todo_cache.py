@@ -0,0 +1,123 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# Cached payload of one todo: (task, status)
+CachedTodo = Tuple[str, bool]
+
+
+class TodoCache:
+    """
+    Bounded LRU cache with a TTL for single-todo lookups.
+
+    Entries are plain `(task, status)` tuples keyed by `tid`, so the cache
+    never holds on to ORM objects or their sessions. Writers call
+    `invalidate`/`clear` after committing; readers take a `token()` before
+    querying and pass it to `put`, which drops the value if any
+    invalidation happened in between (so a slow reader cannot put back a
+    row that was just changed).
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 30.0):
+        """
+        Args:
+            max_size (int): Maximum number of cached todos
+            ttl (float): Seconds an entry stays valid
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Tuple[str, bool, float]]" = OrderedDict()
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def token(self) -> int:
+        """
+        Return the current invalidation generation, to be passed to `put`.
+        """
+        return self._generation
+
+    def get(self, tid: int) -> Optional[CachedTodo]:
+        """
+        Look up a todo, refreshing its LRU position on a hit.
+
+        Args:
+            tid (int): Todo ID
+
+        Returns:
+            Optional[CachedTodo]: (task, status), or None on a miss
+        """
+        entry = self._entries.get(tid)
+        if entry is None:
+            self.misses += 1
+            return None
+        task, status, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[tid]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(tid)
+        self.hits += 1
+        return task, status
+
+    def put(self, tid: int, value: CachedTodo, token: int):
+        """
+        Store a todo read from the database.
+
+        Args:
+            tid (int): Todo ID
+            value (CachedTodo): (task, status) as read
+            token (int): Result of `token()` taken before the read
+        """
+        if token != self._generation:
+            return
+        task, status = value
+        self._entries[tid] = (task, status, time.monotonic() + self.ttl)
+        self._entries.move_to_end(tid)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *tids: int):
+        """
+        Drop the given todos after they were changed or deleted.
+
+        Args:
+            *tids (int): Todo IDs
+        """
+        self._generation += 1
+        for tid in tids:
+            if self._entries.pop(tid, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        """
+        Drop every entry, e.g. after all todos were deleted.
+        """
+        self._generation += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Hit/miss/eviction counters.
+
+        Returns:
+            dict: Counters since start plus the current size and hit ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,208 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# A write operation receives the shared batch session and returns its result
+WriteOp = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class WriteQueue:
+    """
+    Group-commit queue for database writes.
+
+    Mutations are submitted as coroutines and handed to a single writer
+    task. The writer waits up to `max_delay` seconds for more work (or
+    until `max_batch` operations are queued), runs every operation of the
+    batch inside its own SAVEPOINT on one session, and commits the batch
+    in a single transaction. Each caller then receives its own result or
+    exception, so one failing operation never sinks the rest of the batch.
+    """
+
+    def __init__(
+            self,
+            session_factory: async_sessionmaker,
+            max_batch: int = 256,
+            max_delay: float = 0.002,
+            sample_size: int = 1024,
+            probe: Optional[WriteOp] = None,
+            on_commit: Optional[Callable[[Any, Any], None]] = None,
+    ):
+        """
+        Args:
+            session_factory (async_sessionmaker): Creates the writer's sessions
+            max_batch (int): Maximum operations committed together
+            max_delay (float): Seconds to wait for more operations before committing
+            sample_size (int): Recent batches kept for the latency percentiles
+            probe (Optional[WriteOp]): Read run first and last in every batch transaction
+            on_commit (Optional[Callable[[Any, Any], None]]): Called with the two probe
+                results after a batch committed, once its callers have resumed
+        """
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.probe = probe
+        self.on_commit = on_commit
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self._batches = 0
+        self._operations = 0
+        self._failed_operations = 0
+        self._failed_commits = 0
+        self._max_batch_seen = 0
+        self._batch_sizes = deque(maxlen=sample_size)
+        self._commit_seconds = deque(maxlen=sample_size)
+
+    async def start(self):
+        """
+        Start the background writer task.
+        """
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Commit everything already submitted, then stop the writer task.
+        """
+        if self._worker is not None:
+            await self._queue.put(None)
+            await self._worker
+            self._worker = None
+
+    async def submit(self, op: WriteOp) -> Any:
+        """
+        Queue a write operation and wait until its batch is committed.
+
+        Args:
+            op (WriteOp): Coroutine function run with the batch session
+
+        Returns:
+            Any: Whatever `op` returned
+
+        Raises:
+            Exception: Whatever `op` raised, or the commit error of its batch
+        """
+        if self._worker is None:
+            raise RuntimeError("Write queue is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((op, future))
+        return await future
+
+    async def _run(self):
+        """
+        Writer loop: collect a batch, commit it, resolve its callers.
+        """
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+
+            # Give concurrent writers a short window to join this batch
+            if self._queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.max_delay)
+
+            stopping = False
+            while len(batch) < self.max_batch and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await self._commit_batch(batch)
+            except Exception as exc:
+                # E.g. the session failing to close; the writer must outlive any one batch
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            if stopping:
+                return
+
+    async def _commit_batch(self, batch: list):
+        """
+        Run a batch of operations in one transaction and resolve their futures.
+
+        Args:
+            batch (list): (op, future) pairs
+        """
+        outcomes = []
+        probed = None
+        started = time.perf_counter()
+        async with self.session_factory() as db:
+            try:
+                # The probe opens the transaction, so on a shared database it
+                # is what fails when another process holds the write lock
+                before = await self.probe(db) if self.probe is not None else None
+                for op, future in batch:
+                    try:
+                        async with db.begin_nested():
+                            outcomes.append((future, await op(db), None))
+                    except Exception as exc:
+                        self._failed_operations += 1
+                        outcomes.append((future, None, exc))
+                after = await self.probe(db) if self.probe is not None else None
+
+                await db.commit()
+                probed = (before, after)
+            except Exception as exc:
+                self._failed_commits += 1
+                outcomes = [(future, None, exc) for _, future in batch]
+
+        self._record(len(batch), time.perf_counter() - started)
+        for future, result, exc in outcomes:
+            if future.done():
+                continue  # caller was cancelled
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+        if probed is not None and self.on_commit is not None:
+            # Scheduled behind the callers' wake-ups, so their own
+            # post-commit bookkeeping has run by the time it is called
+            asyncio.get_running_loop().call_soon(self.on_commit, *probed)
+
+    def _record(self, batch_size: int, seconds: float):
+        """
+        Update the batch size and commit latency counters.
+        """
+        self._batches += 1
+        self._operations += batch_size
+        self._max_batch_seen = max(self._max_batch_seen, batch_size)
+        self._batch_sizes.append(batch_size)
+        self._commit_seconds.append(seconds)
+
+    def stats(self) -> dict:
+        """
+        Batch size and commit latency metrics.
+
+        Returns:
+            dict: Totals since start, plus averages and percentiles over
+            the most recent batches
+        """
+        latencies = sorted(self._commit_seconds)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        recent = len(self._batch_sizes)
+        return {
+            "batches": self._batches,
+            "operations": self._operations,
+            "failed_operations": self._failed_operations,
+            "failed_commits": self._failed_commits,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "batch_size_avg": sum(self._batch_sizes) / recent if recent else 0.0,
+            "batch_size_max": self._max_batch_seen,
+            "commit_ms_avg": sum(latencies) / recent * 1000 if recent else 0.0,
+            "commit_ms_p50": percentile(0.50),
+            "commit_ms_p99": percentile(0.99),
+        }
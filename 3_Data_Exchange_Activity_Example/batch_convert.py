@@ -0,0 +1,294 @@
+import argparse
+import glob
+import hashlib
+import heapq
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import xmltodict
+
+from my_xml_2_json import stream_xml_to_json
+from py_json import convert_to_json, read_json_file
+from py_xml import write_xml
+
+# Chunks per worker process: more chunks even out the load, fewer cut the
+# per-chunk overhead
+CHUNKS_PER_WORKER = 4
+
+# Name of the manifest file written next to the outputs
+MANIFEST_NAME = ".convert_manifest.json"
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def convert_flights(source: str, target: str):
+    """
+    Flight feed XML -> `{"flights": [...]}` JSON, streamed (my_xml_2_json.py).
+    """
+    stream_xml_to_json(source, target)
+
+
+def convert_xml_to_json(source: str, target: str):
+    """
+    Any XML document -> indented JSON via xmltodict (py_xml.py / py_json.py).
+    """
+    with open(source, 'rb') as file:
+        data = xmltodict.parse(file)
+    with open(target, 'w', encoding='utf-8') as file:
+        file.write(convert_to_json(data))
+
+
+def convert_json_to_xml(source: str, target: str):
+    """
+    JSON document -> XML under a <root> element, streamed with `write_xml` (py_json.py / py_xml.py).
+    """
+    with open(target, 'wb') as file:
+        write_xml(read_json_file(source), file)
+
+
+# Mode -> (output extension, converter)
+CONVERTERS: Dict[str, Tuple[str, Callable[[str, str], None]]] = {
+    "flights": (".json", convert_flights),
+    "xml2json": (".json", convert_xml_to_json),
+    "json2xml": (".xml", convert_json_to_xml),
+}
+
+
+def file_digest(filename: str) -> str:
+    """
+    SHA-256 of a file's content, read in blocks.
+
+    Args:
+        filename (str): File to hash.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_atomic(target: str, write: Callable[[str], None]):
+    """
+    Let `write` produce a temporary file next to `target`, then move it
+    into place with `os.replace`, so readers see the old file or the
+    complete new one and never a partial write.
+
+    Args:
+        target (str): Final path.
+        write (Callable[[str], None]): Writes the content to the path it is given.
+    """
+    directory = os.path.dirname(target) or "."
+    os.makedirs(directory, exist_ok=True)
+    # Unique per process; created by `write` so the usual umask applies
+    temp_path = os.path.join(directory, f".{os.path.basename(target)}.{os.getpid()}.tmp")
+    try:
+        write(temp_path)
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def convert_chunk(mode: str, tasks: List[tuple]) -> List[tuple]:
+    """
+    Step 3: Convert one chunk of files inside a worker process.
+
+    A file is skipped when its output exists and either its size and
+    modification time or its content hash match the manifest entry.
+
+    Args:
+        mode (str): Key of CONVERTERS.
+        tasks (List[tuple]): (source, target, previous manifest entry or None) triples.
+
+    Returns:
+        List[tuple]: (source, status, manifest entry or error message, bytes read) per file,
+        with status "converted", "skipped" or "failed".
+    """
+    convert = CONVERTERS[mode][1]
+    results = []
+    for source, target, previous in tasks:
+        try:
+            stat = os.stat(source)
+            entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "mode": mode, "output": target}
+            current = previous is not None and previous.get("mode") == mode and os.path.exists(target)
+            if current and previous["size"] == stat.st_size and previous["mtime_ns"] == stat.st_mtime_ns:
+                results.append((source, "skipped", previous, 0))
+                continue
+            entry["sha256"] = file_digest(source)
+            if current and previous.get("sha256") == entry["sha256"]:
+                results.append((source, "skipped", entry, stat.st_size))
+                continue
+            write_atomic(target, lambda temp_path: convert(source, temp_path))
+            results.append((source, "converted", entry, stat.st_size))
+        except Exception as error:
+            results.append((source, "failed", f"{type(error).__name__}: {error}", 0))
+    return results
+
+
+def expand_globs(patterns: List[str]) -> List[str]:
+    """
+    Step 1: Expand the input globs (`**` matches subdirectories) into a sorted list of files.
+
+    Args:
+        patterns (List[str]): Glob patterns or plain paths.
+
+    Returns:
+        List[str]: Absolute paths of the matching files, without duplicates.
+    """
+    files = set()
+    for pattern in patterns:
+        for path in glob.glob(pattern, recursive=True):
+            if os.path.isfile(path):
+                files.add(os.path.abspath(path))
+    return sorted(files)
+
+
+def output_path(source: str, root: str, out_dir: Optional[str], extension: str) -> str:
+    """
+    Output file of `source`: same relative path under `out_dir` (or next
+    to the input) with the extension of the conversion.
+    """
+    stem = os.path.splitext(source)[0]
+    if out_dir is None:
+        return stem + extension
+    return os.path.join(out_dir, os.path.relpath(stem, root) + extension)
+
+
+def balanced_chunks(tasks: List[tuple], sizes: List[int], count: int) -> List[List[tuple]]:
+    """
+    Step 2: Split tasks into `count` chunks of about the same total bytes.
+
+    Largest files first, each to the chunk with the fewest bytes so far,
+    so one big feed does not end up in a chunk with many others.
+
+    Args:
+        tasks (List[tuple]): Tasks to split.
+        sizes (List[int]): Input size of each task in bytes.
+        count (int): Number of chunks.
+
+    Returns:
+        List[List[tuple]]: Non-empty chunks, heaviest first.
+    """
+    heap = [(0, i) for i in range(count)]
+    chunks: List[List[tuple]] = [[] for _ in range(count)]
+    totals = [0] * count
+    for size, task in sorted(zip(sizes, tasks), key=lambda pair: -pair[0]):
+        total, i = heapq.heappop(heap)
+        chunks[i].append(task)
+        totals[i] = total + size
+        heapq.heappush(heap, (totals[i], i))
+    order = sorted(range(count), key=lambda i: -totals[i])
+    return [chunks[i] for i in order if chunks[i]]
+
+
+def load_manifest(filename: str) -> Dict[str, Any]:
+    """
+    Read the manifest of the previous run; a missing or unreadable one is empty.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(filename: str, manifest: Dict[str, Any]):
+    """
+    Write the manifest atomically.
+    """
+    def write(temp_path: str):
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=1, sort_keys=True)
+
+    write_atomic(filename, write)
+
+
+def run(patterns: List[str], mode: str, out_dir: Optional[str], manifest_path: str,
+        workers: int, force: bool = False) -> Dict[str, Any]:
+    """
+    Convert every file matching `patterns` on a process pool.
+
+    Args:
+        patterns (List[str]): Input globs.
+        mode (str): Key of CONVERTERS.
+        out_dir (Optional[str]): Output directory; None writes next to the inputs.
+        manifest_path (str): Manifest file of content hashes.
+        workers (int): Worker processes.
+        force (bool): Convert every file, ignoring the manifest.
+
+    Returns:
+        Dict[str, Any]: Counts per status, failures, bytes converted and elapsed seconds.
+    """
+    started = time.perf_counter()
+    extension = CONVERTERS[mode][0]
+    sources = expand_globs(patterns)
+    root = os.path.commonpath([os.path.dirname(source) for source in sources]) if sources else "."
+    if out_dir is not None:
+        out_dir = os.path.abspath(out_dir)
+
+    manifest = load_manifest(manifest_path)
+    tasks = []
+    sizes = []
+    for source in sources:
+        tasks.append((source, output_path(source, root, out_dir, extension), None if force else manifest.get(source)))
+        sizes.append(os.path.getsize(source))
+
+    summary: Dict[str, Any] = {"converted": 0, "skipped": 0, "failed": 0, "bytes": 0, "errors": {}}
+    chunks = balanced_chunks(tasks, sizes, max(1, workers * CHUNKS_PER_WORKER))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(convert_chunk, mode, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                for source, status, detail, size in future.result():
+                    summary[status] += 1
+                    if status == "failed":
+                        summary["errors"][source] = detail
+                        manifest.pop(source, None)
+                    else:
+                        manifest[source] = detail
+                        if status == "converted":
+                            summary["bytes"] += size
+    finally:
+        # Also on Ctrl-C, so the files finished so far are skipped next time
+        save_manifest(manifest_path, manifest)
+
+    summary["seconds"] = time.perf_counter() - started
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert many XML/JSON files in parallel")
+    parser.add_argument("inputs", nargs="+", help="Input files or globs, e.g. 'feeds/**/*.xml'")
+    parser.add_argument("--mode", choices=sorted(CONVERTERS), default="flights",
+                        help="flights: flight XML -> JSON, xml2json: any XML -> JSON, json2xml: JSON -> XML")
+    parser.add_argument("--out-dir", help="Output directory (default: next to each input)")
+    parser.add_argument("--manifest", help=f"Manifest file (default: {MANIFEST_NAME} in the output directory)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--force", action="store_true", help="Convert unchanged files too")
+    args = parser.parse_args()
+
+    manifest_path = args.manifest or os.path.join(args.out_dir or ".", MANIFEST_NAME)
+    summary = run(args.inputs, args.mode, args.out_dir, manifest_path, args.workers, args.force)
+
+    for source, error in sorted(summary["errors"].items()):
+        print(f"❌ {source}: {error}", file=sys.stderr)
+    seconds = summary["seconds"]
+    megabytes = summary["bytes"] / 1024 / 1024
+    print(f"✅ {summary['converted']} converted, {summary['skipped']} unchanged, {summary['failed']} failed "
+          f"in {seconds:.2f}s")
+    print(f"📈 {summary['converted'] / seconds:.1f} files/s, {megabytes / seconds:.2f} MB/s "
+          f"({megabytes:.1f} MB converted, {args.workers} workers)")
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+from bench_stream import generate_feed
+from flight_columns import FlightColumns
+from my_xml_2_json import stream_xml_to_json, xml_to_columns
+
+
+def average_fare_from_json(filename: str) -> dict:
+    """
+    Step 3a: Average fare per route the dictionary way: load the JSON, loop over flights.
+    """
+    with open(filename, 'r', encoding='utf-8') as file:
+        flights = json.load(file)["flights"]
+    totals = defaultdict(lambda: [0, 0.0])
+    for flight in flights:
+        total = totals[(flight["Origin"], flight["Destination"])]
+        total[0] += 1
+        total[1] += flight["Fare"]
+    return {route: fare / count for route, (count, fare) in totals.items()}
+
+
+def average_fare_from_columns(directory: str) -> dict:
+    """
+    Step 3b: Average fare per route from the memory-mapped columns.
+    """
+    stats = FlightColumns.load(directory).fare_stats()
+    return {(row["Origin"], row["Destination"]): row["mean"] for row in stats}
+
+
+def timed(fn, *args):
+    """
+    Run `fn` once and return (result, seconds).
+    """
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Average fare per route: JSON + dict loop vs memory-mapped columns")
+    parser.add_argument("--flights", type=int, default=1_000_000, help="Flights in the generated feed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        xml_filename = os.path.join(workdir, "feed.xml")
+        json_filename = os.path.join(workdir, "feed.json")
+        columns_directory = os.path.join(workdir, "feed.columns")
+
+        # Step 1: Generate the feed; Step 2: convert it both ways
+        generate_feed(xml_filename, args.flights)
+        _, json_seconds = timed(stream_xml_to_json, xml_filename, json_filename)
+        _, columns_seconds = timed(xml_to_columns, xml_filename, columns_directory)
+        json_mb = os.path.getsize(json_filename) / 1024 / 1024
+        columns_mb = sum(entry.stat().st_size for entry in os.scandir(columns_directory)) / 1024 / 1024
+
+        # Step 3: The same query on each
+        from_json, json_query = timed(average_fare_from_json, json_filename)
+        from_columns, columns_query = timed(average_fare_from_columns, columns_directory)
+        assert from_json.keys() == from_columns.keys(), "❌ Different routes"
+        assert all(abs(from_json[route] - from_columns[route]) < 1e-6 for route in from_json), "❌ Different averages"
+
+        data = FlightColumns.load(columns_directory)
+        _, durations_seconds = timed(data.duration_stats)
+
+    print(f"{args.flights} flights, {len(from_json)} routes\n")
+    print(f"{'format':<10} | {'MB':>8} | {'convert':>8} | {'avg fare per route':>18}")
+    print("-" * 53)
+    print(f"{'JSON':<10} | {json_mb:>8.1f} | {json_seconds:>7.2f}s | {json_query:>17.3f}s")
+    print(f"{'columns':<10} | {columns_mb:>8.1f} | {columns_seconds:>7.2f}s | {columns_query:>17.3f}s")
+    print(f"\nduration stats per route from the mapped columns: {durations_seconds:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
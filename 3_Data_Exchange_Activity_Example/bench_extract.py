@@ -0,0 +1,126 @@
+import argparse
+import time
+import xml.etree.ElementTree as ET
+
+from bench_stream import AIRPORTS
+from my_xml_2_json import FLIGHT_SCHEMA
+from record_schema import Field, RecordSchema
+
+# A wide record for comparison: many children, half of them extracted
+WIDE_CHILDREN = 40
+WIDE_SCHEMA = RecordSchema("Record", [Field(f"Field{i}", coerce=int) for i in range(0, WIDE_CHILDREN, 2)])
+
+
+def build_flights(count: int) -> ET.Element:
+    """
+    Step 1a: Build a <Flights> element with `count` flights in memory.
+
+    Args:
+        count (int): Number of <Flight> elements.
+
+    Returns:
+        ET.Element: The <Flights> element.
+    """
+    flights = ET.Element("Flights")
+    for i in range(count):
+        flight = ET.SubElement(flights, "Flight")
+        ET.SubElement(flight, "FlightNumber").text = f"WN{i}"
+        ET.SubElement(flight, "Origin").text = AIRPORTS[i % len(AIRPORTS)]
+        ET.SubElement(flight, "Destination").text = AIRPORTS[(i * 3 + 1) % len(AIRPORTS)]
+        ET.SubElement(flight, "DepartureTime").text = f"2025-07-20T{i % 20:02d}:00:00"
+        ET.SubElement(flight, "ArrivalTime").text = f"2025-07-20T{i % 20 + 1:02d}:30:00"
+        ET.SubElement(flight, "Fare").text = f"{100 + i % 400}.00"
+    return flights
+
+
+def build_wide_records(count: int) -> ET.Element:
+    """
+    Step 1b: Build `count` <Record> elements with WIDE_CHILDREN children each.
+
+    Args:
+        count (int): Number of <Record> elements.
+
+    Returns:
+        ET.Element: The parent element.
+    """
+    records = ET.Element("Records")
+    for i in range(count):
+        record = ET.SubElement(records, "Record")
+        for j in range(WIDE_CHILDREN):
+            ET.SubElement(record, f"Field{j}").text = str(i + j)
+    return records
+
+
+def flights_with_find(flights: ET.Element) -> list:
+    """
+    Step 2a: The per-field `find` loop `xml_to_json` used before the schema.
+    """
+    return [
+        {
+            "FlightNumber": flight.find('FlightNumber').text,
+            "Origin": flight.find('Origin').text,
+            "Destination": flight.find('Destination').text,
+            "DepartureTime": flight.find('DepartureTime').text,
+            "ArrivalTime": flight.find('ArrivalTime').text,
+            "Fare": float(flight.find('Fare').text)
+        }
+        for flight in flights
+    ]
+
+
+def wide_with_find(records: ET.Element) -> list:
+    """
+    Step 2b: One `find` per field of each wide record.
+    """
+    fields = [(field.key, field.path) for field in WIDE_SCHEMA.fields]
+    return [{key: int(record.find(path).text) for key, path in fields} for record in records]
+
+
+def with_schema(schema: RecordSchema):
+    """
+    Step 2c: The compiled extractor of `schema`, applied to every record.
+    """
+    def run(records: ET.Element) -> list:
+        extract = schema.extract
+        return [extract(record) for record in records]
+    return run
+
+
+def best_of(fn, records: ET.Element, repeat: int) -> float:
+    """
+    Best wall time of `repeat` runs, in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(records)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-field find vs compiled schema extraction")
+    parser.add_argument("--records", type=int, default=200_000, help="Records per shape")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per method (best is reported)")
+    args = parser.parse_args()
+
+    shapes = [
+        ("flight (6 fields)", FLIGHT_SCHEMA, build_flights(args.records), flights_with_find),
+        (f"wide ({WIDE_CHILDREN} children, {len(WIDE_SCHEMA.fields)} fields)", WIDE_SCHEMA,
+         build_wide_records(args.records // 4), wide_with_find),
+    ]
+
+    print(f"best of {args.repeat}\n")
+    print(f"{'record':<32} | {'records':>8} | {'per-field find':>14} | {'compiled schema':>15} | {'plan':<11} | {'speedup':>7}")
+    print("-" * 104)
+    for name, schema, records, with_find in shapes:
+        compiled = with_schema(schema)
+        assert with_find(records) == compiled(records), "❌ Extractors disagree"
+        find_seconds = best_of(with_find, records, args.repeat)
+        schema_seconds = best_of(compiled, records, args.repeat)
+        print(f"{name:<32} | {len(records):>8} | {find_seconds:>13.3f}s | {schema_seconds:>14.3f}s | "
+              f"{schema.strategy:<11} | {find_seconds / schema_seconds:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import contextlib
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from my_xml_2_json import stream_xml_to_json, xml_to_json
+
+# Default feed sizes, in flights. A flight is about 330 bytes of XML, so the
+# largest feed needs about 3.3 GB of free disk space in the temp directory.
+DEFAULT_SIZES = "1000,1000000,10000000"
+
+# Largest feed the in-memory `xml_to_json` is run on (it needs several
+# times the document size in RAM)
+DEFAULT_BASELINE_MAX = 1_000_000
+
+AIRPORTS = ["DAL", "HOU", "AUS", "SAT", "ELP", "LBB", "MAF", "AMA"]
+
+
+def generate_feed(filename: str, flights: int):
+    """
+    Step 1: Write a FlightSearchResponse document with `flights` flights,
+    one at a time so generating a large feed needs no memory either.
+
+    Args:
+        filename (str): Path of the XML file to create.
+        flights (int): Number of <Flight> elements.
+    """
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write("<FlightSearchResponse>\n  <Flights>\n")
+        for i in range(flights):
+            origin = AIRPORTS[i % len(AIRPORTS)]
+            destination = AIRPORTS[(i * 3 + 1) % len(AIRPORTS)]
+            hour = i % 20
+            file.write(
+                "    <Flight>\n"
+                f"      <FlightNumber>WN{i}</FlightNumber>\n"
+                f"      <Origin>{origin}</Origin>\n"
+                f"      <Destination>{destination}</Destination>\n"
+                f"      <DepartureTime>2025-07-20T{hour:02d}:00:00</DepartureTime>\n"
+                f"      <ArrivalTime>2025-07-20T{hour + 1:02d}:30:00</ArrivalTime>\n"
+                f"      <Fare>{100 + i % 400}.00</Fare>\n"
+                "    </Flight>\n"
+            )
+        file.write("  </Flights>\n</FlightSearchResponse>\n")
+
+
+def run_converter(method: str, filename: str):
+    """
+    Step 2: Convert one feed with one method and print "<seconds> <peak RSS KB>".
+
+    Runs in its own process (see `measure`) so every peak is measured from
+    a clean start.
+
+    Args:
+        method (str): "stream" or "in-memory".
+        filename (str): XML feed to convert.
+    """
+    out_filename = filename + ".json"
+    started = time.perf_counter()
+    if method == "stream":
+        stream_xml_to_json(filename, out_filename)
+    else:
+        with open(filename, 'r', encoding='utf-8') as file:
+            xml_data = file.read()
+        # xml_to_json prints its progress and the whole document
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            json_data = xml_to_json(xml_data)
+        with open(out_filename, 'w', encoding='utf-8') as file:
+            file.write(json_data)
+    elapsed = time.perf_counter() - started
+    os.remove(out_filename)
+    print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def measure(method: str, filename: str) -> tuple:
+    """
+    Run `run_converter` in a fresh interpreter.
+
+    Returns:
+        tuple: (seconds, peak RSS in MB)
+    """
+    output = subprocess.run(
+        [sys.executable, __file__, "--convert", method, filename],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    seconds, peak_kb = output.split()
+    return float(seconds), int(peak_kb) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming vs in-memory XML to JSON conversion")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated flight counts")
+    parser.add_argument("--baseline-max", type=int, default=DEFAULT_BASELINE_MAX,
+                        help="Largest feed to also convert with xml_to_json")
+    parser.add_argument("--convert", nargs=2, metavar=("METHOD", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.convert:
+        run_converter(*args.convert)
+        return
+
+    print(f"{'flights':>10} | {'XML MB':>8} | {'method':<10} | {'seconds':>8} | {'flights/s':>10} | {'peak RSS MB':>11}")
+    print("-" * 74)
+    for flights in (int(size) for size in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as workdir:
+            filename = os.path.join(workdir, "feed.xml")
+            generate_feed(filename, flights)
+            size_mb = os.path.getsize(filename) / 1024 / 1024
+
+            methods = ["stream"] + (["in-memory"] if flights <= args.baseline_max else [])
+            for method in methods:
+                seconds, peak_mb = measure(method, filename)
+                print(f"{flights:>10} | {size_mb:>8.1f} | {method:<10} | {seconds:>8.2f} | "
+                      f"{flights / seconds:>10.0f} | {peak_mb:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from dicttoxml import dicttoxml
+
+from database import dummy_data
+from py_xml import dict_to_xml, write_xml
+
+# Default document sizes in MB
+DEFAULT_SIZES = "1,10,100,1000"
+
+# Largest document `dicttoxml` is run on (it manages about 0.5 MB/s, so
+# 100 MB takes several minutes)
+DEFAULT_BASELINE_MAX_MB = 10
+
+# XML bytes of one <item> holding dummy_data
+PERSON_BYTES = len(dict_to_xml([dummy_data])) - len(dict_to_xml([]))
+
+
+def scaled_data(megabytes: float) -> dict:
+    """
+    Step 1: A dictionary whose XML is about `megabytes` MB: dummy_data repeated in a list.
+
+    The list holds references to one dictionary, so building it costs
+    almost nothing and only the serializers are measured.
+    """
+    return {"people": [dummy_data] * max(1, int(megabytes * 1024 * 1024 / PERSON_BYTES))}
+
+
+def run_serializer(method: str, megabytes: float, filename: str):
+    """
+    Step 2: Serialize one document with one method to `filename` and print
+    "<seconds> <peak RSS KB>".
+
+    Runs in its own process (see `measure`) so every peak is measured from
+    a clean start.
+
+    Args:
+        method (str): "write_xml" or "dicttoxml".
+        megabytes (float): Document size.
+        filename (str): Output file.
+    """
+    logging.getLogger("dicttoxml").setLevel(logging.WARNING)
+    data = scaled_data(megabytes)
+    started = time.perf_counter()
+    if method == "write_xml":
+        write_xml(data, filename)
+    else:
+        with open(filename, 'wb') as file:
+            file.write(dicttoxml(data, custom_root='root', attr_type=False))
+    elapsed = time.perf_counter() - started
+    print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def measure(method: str, megabytes: float, filename: str) -> tuple:
+    """
+    Run `run_serializer` in a fresh interpreter.
+
+    Returns:
+        tuple: (seconds, peak RSS in MB)
+    """
+    output = subprocess.run(
+        [sys.executable, __file__, "--serialize", method, str(megabytes), filename],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    seconds, peak_kb = output.split()
+    return float(seconds), int(peak_kb) / 1024
+
+
+def files_equal(first: str, second: str) -> bool:
+    """
+    Compare two files block by block.
+    """
+    with open(first, 'rb') as a, open(second, 'rb') as b:
+        while True:
+            block = a.read(1024 * 1024)
+            if block != b.read(1024 * 1024):
+                return False
+            if not block:
+                return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming write_xml vs dicttoxml")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated document sizes in MB")
+    parser.add_argument("--baseline-max", type=float, default=DEFAULT_BASELINE_MAX_MB,
+                        help="Largest document (MB) to also serialize with dicttoxml")
+    parser.add_argument("--serialize", nargs=3, metavar=("METHOD", "MB", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serialize:
+        method, megabytes, filename = args.serialize
+        run_serializer(method, float(megabytes), filename)
+        return
+
+    print(f"{'MB':>6} | {'method':<10} | {'seconds':>8} | {'MB/s':>7} | {'peak RSS MB':>11} | {'identical':>9}")
+    print("-" * 66)
+    for megabytes in (float(size) for size in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as workdir:
+            outputs = {}
+            methods = ["write_xml"] + (["dicttoxml"] if megabytes <= args.baseline_max else [])
+            for method in methods:
+                outputs[method] = os.path.join(workdir, f"{method}.xml")
+                seconds, peak_mb = measure(method, megabytes, outputs[method])
+                size_mb = os.path.getsize(outputs[method]) / 1024 / 1024
+                identical = ""
+                if method == "dicttoxml":
+                    identical = "✅" if files_equal(outputs["write_xml"], outputs["dicttoxml"]) else "❌"
+                print(f"{size_mb:>6.0f} | {method:<10} | {seconds:>8.2f} | {size_mb / seconds:>7.1f} | "
+                      f"{peak_mb:>11.1f} | {identical:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+import os
+from typing import Any, Dict, Iterable, Sequence
+
+import numpy as np
+
+# Column name -> dtype. Origin and Destination hold codes into the shared
+# `airports` dictionary (-1 = missing), so a route is a pair of small ints.
+COLUMN_DTYPES: Dict[str, Any] = {
+    "FlightNumber": np.str_,
+    "Origin": np.int32,
+    "Destination": np.int32,
+    "DepartureTime": "datetime64[s]",
+    "ArrivalTime": "datetime64[s]",
+    "Fare": np.float64,
+}
+CATEGORICAL_COLUMNS = ("Origin", "Destination")
+
+# Records converted to arrays at a time while building
+DEFAULT_CHUNK_SIZE = 65_536
+
+
+class FlightColumns:
+    """
+    Flights stored column by column in NumPy arrays.
+
+    Every column is one contiguous array, so "average fare per route" is a
+    handful of array operations instead of a loop over dictionaries. On
+    disk it is a directory with one `.npy` file per column plus
+    `airports.npy`, which `load` memory-maps: opening is instant whatever
+    the size, and a query only reads the pages of the columns it uses.
+
+    Example:
+        data = FlightColumns.from_records(iter_flights("flight_search.xml"))
+        data.fare_stats()  # one row per (Origin, Destination)
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], airports: np.ndarray):
+        """
+        Args:
+            columns (Dict[str, np.ndarray]): One array per name in COLUMN_DTYPES, all the same length.
+            airports (np.ndarray): Airport codes; Origin/Destination values index into it.
+        """
+        self.columns = columns
+        self.airports = airports
+
+    def __len__(self) -> int:
+        return len(self.columns["Fare"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> "FlightColumns":
+        """
+        Build the columns from flight dictionaries, e.g. `iter_flights(...)`.
+
+        Records are converted `chunk_size` at a time, so a streamed feed
+        never exists as one big list of dictionaries.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Flights as produced by FLIGHT_SCHEMA.
+            chunk_size (int): Records per conversion batch.
+
+        Returns:
+            FlightColumns: The dataset.
+        """
+        airport_codes: Dict[str, int] = {}
+        chunks: Dict[str, list] = {name: [] for name in COLUMN_DTYPES}
+
+        def flush(batch: list):
+            for name, dtype in COLUMN_DTYPES.items():
+                values = [record[name] for record in batch]
+                if name in CATEGORICAL_COLUMNS:
+                    values = [-1 if value is None else airport_codes.setdefault(value, len(airport_codes))
+                              for value in values]
+                elif name == "FlightNumber":
+                    values = ['' if value is None else value for value in values]
+                chunks[name].append(np.array(values, dtype=dtype))
+
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) == chunk_size:
+                flush(batch)
+                batch = []
+        if batch or not chunks["Fare"]:
+            flush(batch)
+
+        columns = {name: np.concatenate(parts).astype(COLUMN_DTYPES[name], copy=False)
+                   for name, parts in chunks.items()}
+        return cls(columns, np.array(list(airport_codes), dtype=np.str_))
+
+    def save(self, directory: str):
+        """
+        Write every column to `<directory>/<name>.npy`.
+
+        Args:
+            directory (str): Output directory, created if needed.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name, array in self.columns.items():
+            np.save(os.path.join(directory, f"{name}.npy"), array, allow_pickle=False)
+        np.save(os.path.join(directory, "airports.npy"), self.airports, allow_pickle=False)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "FlightColumns":
+        """
+        Open a dataset written by `save`.
+
+        Args:
+            directory (str): Directory of the `.npy` files.
+            mmap (bool): Memory-map the columns (read-only) instead of reading them.
+
+        Returns:
+            FlightColumns: The dataset.
+        """
+        mmap_mode = 'r' if mmap else None
+        columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+                   for name in COLUMN_DTYPES}
+        airports = np.load(os.path.join(directory, "airports.npy"), allow_pickle=False)
+        return cls(columns, airports)
+
+    def decode(self, name: str) -> np.ndarray:
+        """
+        Airport codes of a categorical column as strings ('' where missing).
+
+        Args:
+            name (str): "Origin" or "Destination".
+
+        Returns:
+            np.ndarray: One string per flight.
+        """
+        codes = self.columns[name]
+        names = np.append(self.airports, '')  # Code -1 picks the trailing ''
+        return names[codes]
+
+    def durations(self) -> np.ndarray:
+        """
+        Scheduled duration of every flight (NaT where a time is missing).
+
+        Returns:
+            np.ndarray: timedelta64[s] per flight.
+        """
+        return self.columns["ArrivalTime"] - self.columns["DepartureTime"]
+
+    def duration_minutes(self) -> np.ndarray:
+        """
+        Scheduled duration of every flight in minutes (NaN where a time is missing).
+
+        Returns:
+            np.ndarray: float64 per flight.
+        """
+        return self.durations() / np.timedelta64(1, 'm')
+
+    def group_stats(self, values: np.ndarray, by: Sequence[str] = CATEGORICAL_COLUMNS) -> np.ndarray:
+        """
+        Count, mean, min, max and standard deviation of `values` per group,
+        without a Python loop: the group keys are combined into one integer
+        per flight, sorted once, and reduced with `np.add.reduceat` and
+        friends. Flights whose value is NaN/NaT are left out.
+
+        Args:
+            values (np.ndarray): One number per flight, e.g. `self["Fare"]`.
+            by (Sequence[str]): Categorical columns to group on.
+
+        Returns:
+            np.ndarray: Structured array with one row per group, a string
+            field per `by` column followed by count, mean, min, max and std.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        keep = ~np.isnan(values)
+        values = values[keep]
+
+        # Codes are >= -1, so shifting by one makes each a digit of base `radix`
+        radix = len(self.airports) + 1
+        key = np.zeros(len(values), dtype=np.int64)
+        for name in by:
+            key = key * radix + (self.columns[name][keep] + 1)
+
+        fields = [(name, np.str_, max(1, self.airports.dtype.itemsize // 4)) for name in by]
+        dtype = fields + [
+            ("count", np.int64), ("mean", np.float64), ("min", np.float64), ("max", np.float64), ("std", np.float64),
+        ]
+        if not len(key):
+            return np.zeros(0, dtype=dtype)
+
+        order = np.argsort(key, kind='stable')
+        key = key[order]
+        values = values[order]
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        counts = np.diff(np.r_[starts, len(key)])
+        means = np.add.reduceat(values, starts) / counts
+        deviations = values - np.repeat(means, counts)
+
+        result = np.zeros(len(starts), dtype=dtype)
+        names = np.append(self.airports, '')
+        group_keys = key[starts]
+        for name in reversed(by):
+            result[name] = names[group_keys % radix - 1]
+            group_keys = group_keys // radix
+        result["count"] = counts
+        result["mean"] = means
+        result["min"] = np.minimum.reduceat(values, starts)
+        result["max"] = np.maximum.reduceat(values, starts)
+        result["std"] = np.sqrt(np.add.reduceat(deviations * deviations, starts) / counts)
+        return result
+
+    def fare_stats(self, by: Sequence[str] = CATEGORICAL_COLUMNS) -> np.ndarray:
+        """
+        Fare statistics per group, by default per route (Origin, Destination).
+        """
+        return self.group_stats(self.columns["Fare"], by)
+
+    def duration_stats(self, by: Sequence[str] = CATEGORICAL_COLUMNS) -> np.ndarray:
+        """
+        Duration statistics in minutes per group, by default per route.
+        """
+        return self.group_stats(self.duration_minutes(), by)
+
@@ -1,5 +1,19 @@
 import json
+import sys
 import xml.etree.ElementTree as ET
+from typing import IO, Dict, Iterator, Optional, Union
+
+from record_schema import Field, RecordSchema
+
+# Fields of a <Flight>, compiled once into a specialized extractor
+FLIGHT_SCHEMA = RecordSchema("Flight", [
+    Field("FlightNumber"),
+    Field("Origin"),
+    Field("Destination"),
+    Field("DepartureTime"),
+    Field("ArrivalTime"),
+    Field("Fare", coerce=float),
+])
 
 
 def get_xml_data() -> str:
@@ -52,16 +66,7 @@ def xml_to_json(xml_data: str) -> str:
     print("📥 Step 2: XML parsed successfully.")
 
     # Step 3: Extract data
-    flights = []
-    for flight in root.find('Flights'):
-        flights.append({
-            "FlightNumber": flight.find('FlightNumber').text,
-            "Origin": flight.find('Origin').text,
-            "Destination": flight.find('Destination').text,
-            "DepartureTime": flight.find('DepartureTime').text,
-            "ArrivalTime": flight.find('ArrivalTime').text,
-            "Fare": float(flight.find('Fare').text)
-        })
+    flights = [FLIGHT_SCHEMA.extract(flight) for flight in root.find('Flights')]
     print("🔄 Step 3: XML data converted to Python dictionary.")
 
     # Step 4: Convert to JSON
@@ -72,6 +77,81 @@ def xml_to_json(xml_data: str) -> str:
     return json_data
 
 
+def iter_flights(source: Union[str, IO[bytes]]) -> Iterator[Dict[str, object]]:
+    """
+    Stream flights out of an XML document one at a time.
+
+    Uses `iterparse`, so each <Flight> is turned into a dictionary as soon
+    as its end tag is read, and is then removed from the tree. Memory use
+    stays the same however many flights the document holds.
+
+    Args:
+        source (Union[str, IO[bytes]]): Path or binary file object of the XML document.
+
+    Yields:
+        Dict[str, object]: One flight, extracted with FLIGHT_SCHEMA.
+    """
+    return FLIGHT_SCHEMA.iter_records(source)
+
+
+def stream_xml_to_json(source: Union[str, IO[bytes]], out: Union[str, IO[str]], ndjson: bool = False) -> int:
+    """
+    Convert an XML flight document to JSON without loading it into memory.
+
+    Each flight is written as soon as it is parsed, either inside the same
+    `{"flights": [...]}` object `xml_to_json` produces, or as NDJSON (one
+    flight per line). `out` can be a path or any text stream, such as
+    `sys.stdout` or `socket.makefile('w')`.
+
+    Args:
+        source (Union[str, IO[bytes]]): Path or binary file object of the XML document.
+        out (Union[str, IO[str]]): Output path or text stream.
+        ndjson (bool): Write one JSON object per line instead of one document.
+
+    Returns:
+        int: Number of flights written.
+    """
+    if isinstance(out, str):
+        with open(out, 'w', encoding='utf-8') as file:
+            return stream_xml_to_json(source, file, ndjson)
+
+    count = 0
+    if not ndjson:
+        out.write('{"flights": [')
+    for flight in iter_flights(source):
+        line = json.dumps(flight)
+        if ndjson:
+            out.write(line + "\n")
+        else:
+            out.write((",\n  " if count else "\n  ") + line)
+        count += 1
+    if not ndjson:
+        out.write("\n]}\n" if count else "]}\n")
+    out.flush()
+    return count
+
+
+def xml_to_columns(source: Union[str, IO[bytes]], directory: Optional[str] = None):
+    """
+    Convert an XML flight document to a columnar FlightColumns dataset
+    (NumPy arrays, see flight_columns.py), streaming it like
+    `stream_xml_to_json`.
+
+    Args:
+        source (Union[str, IO[bytes]]): Path or binary file object of the XML document.
+        directory (Optional[str]): Also save the dataset there, memory-mappable with `FlightColumns.load`.
+
+    Returns:
+        FlightColumns: The dataset.
+    """
+    from flight_columns import FlightColumns  # NumPy is only needed for the columnar output
+
+    data = FlightColumns.from_records(iter_flights(source))
+    if directory is not None:
+        data.save(directory)
+    return data
+
+
 def write_to_file(filename: str, content: str, mode: str = 'w') -> str:
     """
     Common function to write content to a file.
@@ -118,3 +198,21 @@ if __name__ == '__main__':
     print("💾 Writing JSON to file...")
     print(write_to_file(json_filename, json_result))
     separator()
+
+    # Step 5: Stream the XML file as NDJSON, one flight at a time
+    print("🌊 Step 5: Streaming XML file to NDJSON...")
+    flight_count = stream_xml_to_json(xml_filename, sys.stdout, ndjson=True)
+    print(f"✅ {flight_count} flights streamed.")
+    separator()
+
+    # Step 6: Columnar dataset with vectorized fare and duration statistics per route
+    print("📊 Step 6: Fare and duration statistics per route from the columnar dataset...")
+    columns = xml_to_columns(xml_filename)
+    # Routes whose flights all lack a time have no duration row, so match rows by route
+    durations = {(row['Origin'], row['Destination']): row['mean'] for row in columns.duration_stats()}
+    for route in columns.fare_stats():
+        duration = durations.get((route['Origin'], route['Destination']))
+        duration_text = "n/a" if duration is None else f"{duration:.0f} min"
+        print(f"{route['Origin']} → {route['Destination']}: {route['count']} flights, "
+              f"average fare ${route['mean']:.2f}, average duration {duration_text}")
+    separator()
@@ -1,16 +1,165 @@
-from typing import Any, Dict
+import io
+import numbers
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import IO, Any, Dict, Tuple, Union
+from xml.dom.minidom import parseString
 
 import xmltodict
-from dicttoxml import dicttoxml
 
 from database import dummy_data as data  # Assuming this is the same dictionary used before
 
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" ?>'
+
+# Pieces of text collected before they are encoded and written out
+WRITE_BATCH = 8192
+
+
+def escape_text(text: str) -> str:
+    """
+    Escape the five XML special characters, as `dicttoxml` does.
+    """
+    return (text.replace('&', '&amp;').replace('"', '&quot;').replace("'", '&apos;')
+            .replace('<', '&lt;').replace('>', '&gt;'))
+
+
+@lru_cache(maxsize=4096, typed=True)
+def element_tags(key: Any) -> Tuple[str, str]:
+    """
+    Opening and closing tag for a dictionary key, with the fixes `dicttoxml`
+    applies to invalid names: numeric keys get an `n` prefix, spaces become
+    underscores, anything else becomes `<key name="...">`.
+
+    Cached because checking a name means parsing a small document, and
+    the same keys repeat in every record.
+
+    Args:
+        key (Any): Dictionary key.
+
+    Returns:
+        Tuple[str, str]: e.g. ('<name>', '</name>').
+    """
+    name = escape_text(key) if type(key) is str else key
+
+    def is_valid(candidate: Any) -> bool:
+        try:
+            parseString(f'<?xml version="1.0" encoding="UTF-8" ?><{candidate}>foo</{candidate}>')
+            return True
+        except Exception:
+            return False
+
+    if is_valid(name):
+        return f"<{name}>", f"</{name}>"
+    if str(name).isdigit():
+        return f"<n{name}>", f"</n{name}>"
+    try:
+        number = float(str(name))
+        return f"<n{number}>", f"</n{number}>"
+    except ValueError:
+        pass
+    if is_valid(name.replace(' ', '_')):
+        name = name.replace(' ', '_')
+        return f"<{name}>", f"</{name}>"
+    return f'<key name="{name}">', "</key>"
+
+
+def write_xml(data: Any, out: Union[str, IO[bytes]], custom_root: str = 'root') -> int:
+    """
+    Write `data` as XML without building the document in memory.
+
+    The output is the same as `dicttoxml(data, custom_root=custom_root,
+    attr_type=False)`: list entries become <item> elements, None an empty
+    element, booleans true/false. The walk uses an explicit stack instead of
+    recursion, so nesting depth is not limited by the recursion limit, and
+    text is encoded and written in batches as it is produced. Lists and
+    dictionaries can be replaced by generators to stream the input as well.
+
+    Args:
+        data (Any): Dictionary, list or value to serialize.
+        out (Union[str, IO[bytes]]): Output path or binary stream.
+        custom_root (str): Name of the root element.
+
+    Returns:
+        int: Number of bytes written.
+
+    Raises:
+        TypeError: For a value that is not a number, string, date, None, dictionary or iterable.
+    """
+    if isinstance(out, str):
+        with open(out, 'wb') as file:
+            return write_xml(data, file, custom_root)
+
+    written = 0
+    parts = [XML_DECLARATION, f"<{custom_root}>"]
+    append = parts.append
+
+    def flush():
+        nonlocal written
+        chunk = ''.join(parts).encode('utf-8')
+        out.write(chunk)
+        written += len(chunk)
+        parts.clear()
+
+    # Frames of (iterator, True for dictionary items, closing tag). A
+    # non-container root is converted like a one-item list.
+    if isinstance(data, dict):
+        stack = [(iter(data.items()), True, f"</{custom_root}>")]
+    elif (isinstance(data, Iterable) and type(data) is not str and not isinstance(data, numbers.Number)
+          and not hasattr(data, 'isoformat')):
+        stack = [(iter(data), False, f"</{custom_root}>")]
+    elif type(data) is bool:
+        stack = [(iter(()), False, f"<item>{str(data).lower()}</item></{custom_root}>")]
+    else:
+        stack = [(iter((data,)), False, f"</{custom_root}>")]
+
+    while stack:
+        entries, in_dict, closing = stack[-1]
+        for entry in entries:
+            if in_dict:
+                key, value = entry
+                start, end = element_tags(key)
+            else:
+                value = entry
+                start, end = "<item>", "</item>"
+            cls = type(value)
+
+            if cls is str:
+                append(f"{start}{escape_text(value)}{end}")
+            elif cls is bool and in_dict:
+                append(f"{start}{'true' if value else 'false'}{end}")
+            elif isinstance(value, numbers.Number):
+                append(f"{start}{value}{end}")  # In a list dicttoxml writes True/False
+            elif hasattr(value, 'isoformat'):
+                append(f"{start}{escape_text(value.isoformat())}{end}")
+            elif isinstance(value, dict):
+                append(start)
+                stack.append((iter(value.items()), True, end))
+                break
+            elif isinstance(value, Iterable):
+                append(start if in_dict else "<item >")  # Sic: dicttoxml's tag for a list in a list
+                stack.append((iter(value), False, end))
+                break
+            elif value is None:
+                append(f"{start}{end}")
+            else:
+                raise TypeError(f"Unsupported data type: {value} ({cls.__name__})")
+
+            if len(parts) >= WRITE_BATCH:
+                flush()
+        else:
+            stack.pop()
+            append(closing)
+
+    flush()
+    out.flush()
+    return written
+
 
 def dict_to_xml(data: Dict[str, Any]) -> bytes:
     """
     Step 2: Convert a Python dictionary to XML.
 
-    Uses `dicttoxml` to convert a dictionary into an XML byte string.
+    Serializes the dictionary with `write_xml` into an in-memory buffer.
 
     Args:
         data (Dict[str, Any]): The Python dictionary to convert.
@@ -18,7 +167,9 @@ def dict_to_xml(data: Dict[str, Any]) -> bytes:
     Returns:
         bytes: XML data in bytes.
     """
-    return dicttoxml(data, custom_root='root', attr_type=False)
+    buffer = io.BytesIO()
+    write_xml(data, buffer)
+    return buffer.getvalue()
 
 
 def xml_to_dict(xml_string: str) -> Dict[str, Any]:
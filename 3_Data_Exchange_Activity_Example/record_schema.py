@@ -0,0 +1,200 @@
+import xml.etree.ElementTree as ET
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+# Flat schemas with at most this many fields are compiled to one C-level
+# `findtext` per field; on short records that beats any Python-level loop.
+# Wider or nested schemas get a single pass over the children instead.
+LOOKUP_MAX_FIELDS = 8
+
+
+class Field:
+    """
+    One output value of a record: where it is in the XML, what key it gets,
+    and how its text is converted.
+
+    Paths are relative to the record element: `Fare` is a child,
+    `Price/Total` a grandchild, `@id` an attribute of the record and
+    `Price/@currency` an attribute of a child. When elements repeat, the
+    first match wins, as with `findtext`.
+    """
+
+    __slots__ = ("path", "key", "coerce")
+
+    def __init__(self, path: str, key: Optional[str] = None, coerce: Optional[Callable[[str], Any]] = None):
+        """
+        Args:
+            path (str): Element path relative to the record.
+            key (Optional[str]): Output key. Defaults to the last path step.
+            coerce (Optional[Callable[[str], Any]]): Converts the text, e.g. `float`. Default keeps the string.
+        """
+        self.path = path
+        self.key = key or path.rsplit('/', 1)[-1].lstrip('@')
+        self.coerce = None if coerce is str else coerce
+
+
+def _make_filler(children: Dict[str, Any], attributes: List[tuple]) -> Callable[[ET.Element, list], None]:
+    """
+    Single-pass extractor for one level of the path tree: read the wanted
+    attributes, then walk the children once and dispatch on their tag.
+
+    Args:
+        children (Dict[str, Any]): Child tag -> value slot, or the filler of a deeper level.
+        attributes (List[tuple]): (attribute name, value slot) pairs.
+
+    Returns:
+        Callable[[ET.Element, list], None]: Fills the value slots from an element.
+    """
+    get_target = children.get
+
+    def fill(element: ET.Element, values: list):
+        # A slot that is already set keeps its value, so with repeated
+        # elements the first match wins, as with `findtext`
+        for name, slot in attributes:
+            if values[slot] is None:
+                values[slot] = element.get(name)
+        for child in element:
+            target = get_target(child.tag)
+            if target is None:
+                continue
+            if target.__class__ is int:
+                if values[target] is None:
+                    text = child.text
+                    values[target] = text if text is not None else ''
+            else:
+                target(child, values)
+
+    return fill
+
+
+class RecordSchema:
+    """
+    Declarative mapping from a record-oriented XML element to a dictionary,
+    compiled once into a specialized extractor function.
+
+    Compiling generates the extractor's source for this exact field list
+    (like `collections.namedtuple` does), so each record costs no more
+    than hand-written code:
+
+    - Flat schemas (direct children and record attributes) with up to
+      LOOKUP_MAX_FIELDS fields do one `findtext` / `get` per field.
+    - Anything else walks each record's children exactly once and
+      dispatches on the tag, so the cost grows with the number of
+      children rather than children times fields.
+
+    A missing field comes out as None and its coercer is not called; an
+    element that is present but empty gives ''.
+
+    Example:
+        schema = RecordSchema("Flight", [Field("FlightNumber"), Field("Fare", coerce=float)])
+        schema.extract(flight_element)  # {"FlightNumber": "WN123", "Fare": 150.0}
+    """
+
+    def __init__(self, record_tag: str, fields: Sequence[Field]):
+        """
+        Args:
+            record_tag (str): Tag of the record elements, e.g. "Flight".
+            fields (Sequence[Field]): Values to extract, in output key order.
+
+        Raises:
+            ValueError: If two fields share an output key or a path.
+        """
+        self.record_tag = record_tag
+        self.fields = list(fields)
+        keys = [field.key for field in self.fields]
+        if len(set(keys)) != len(keys):
+            raise ValueError("Every field needs its own output key")
+
+        flat = all('/' not in field.path for field in self.fields)
+        self.strategy = "lookup" if flat and len(self.fields) <= LOOKUP_MAX_FIELDS else "single-pass"
+        self.extract: Callable[[ET.Element], Dict[str, Any]] = self._compile()
+
+    def _compile(self) -> Callable[[ET.Element], Dict[str, Any]]:
+        """
+        Generate and compile the extractor function for this schema.
+
+        Returns:
+            Callable[[ET.Element], Dict[str, Any]]: record element -> dictionary.
+        """
+        namespace = {f"coerce_{i}": field.coerce for i, field in enumerate(self.fields)}
+        names = [f"value_{i}" for i in range(len(self.fields))]
+        lines = ["def extract(record):"]
+
+        if self.strategy == "lookup":
+            lines.append("    findtext = record.findtext")
+            lines.append("    get = record.get")
+            for name, field in zip(names, self.fields):
+                if field.path.startswith('@'):
+                    lines.append(f"    {name} = get({field.path[1:]!r})")
+                else:
+                    lines.append(f"    {name} = findtext({field.path!r})")
+        else:
+            namespace["fill"] = self._compile_paths([(field.path.split('/'), i) for i, field in enumerate(self.fields)])
+            lines.append(f"    values = [None] * {len(self.fields)}")
+            lines.append("    fill(record, values)")
+            lines.append(f"    {', '.join(names)}, = values")
+
+        items = []
+        for i, (name, field) in enumerate(zip(names, self.fields)):
+            value = name if field.coerce is None else f"None if {name} is None else coerce_{i}({name})"
+            items.append(f"{field.key!r}: {value}")
+        lines.append("    return {" + ", ".join(items) + "}")
+
+        exec("\n".join(lines), namespace)
+        return namespace["extract"]
+
+    @classmethod
+    def _compile_paths(cls, specs: List[tuple]) -> Callable[[ET.Element, list], None]:
+        """
+        Build the single-pass filler for one level of the path tree.
+
+        Args:
+            specs (List[tuple]): (remaining path steps, value slot) pairs.
+
+        Returns:
+            Callable[[ET.Element, list], None]: Filler for this level.
+        """
+        children: Dict[str, Any] = {}
+        attributes = []
+        nested: Dict[str, List[tuple]] = {}
+        for steps, slot in specs:
+            head, rest = steps[0], steps[1:]
+            if head.startswith('@'):
+                attributes.append((head[1:], slot))
+            elif rest:
+                nested.setdefault(head, []).append((rest, slot))
+            elif head in children:
+                raise ValueError(f"Path '{head}' is used by more than one field")
+            else:
+                children[head] = slot
+        for head, rest_specs in nested.items():
+            if head in children:
+                raise ValueError(f"Path '{head}' is both a field and the parent of another")
+            children[head] = cls._compile_paths(rest_specs)
+        return _make_filler(children, attributes)
+
+    def iter_records(self, source: Union[str, IO[bytes]]) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the records of an XML document with `iterparse`, extracting
+        each one when its end tag arrives and then removing it from the
+        tree, so memory stays flat whatever the document size.
+
+        Args:
+            source (Union[str, IO[bytes]]): Path or binary file object of the XML document.
+
+        Yields:
+            Dict[str, Any]: One extracted record.
+        """
+        parents = []
+        record_tag = self.record_tag
+        extract = self.extract
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                parents.append(elem)
+                continue
+            parents.pop()
+            if elem.tag != record_tag:
+                continue
+            yield extract(elem)
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)